@@ -0,0 +1,98 @@
+"""Vectorized transaction analytics for /analysis.
+
+A user's transactions arrive as columnar NumPy arrays (amount, type code,
+day, category id), read from the month store by ``columnar.as_columns``.
+Monthly income/expense series, category breakdowns, rolling averages and
+month-over-month deltas are then computed with ``bincount`` / ``cumsum``
+over those arrays instead of per-row Python loops or one SQL aggregate per
+chart.
+
+Results are plain lists and dicts, so they can be cached (and pickled for
+the Redis cache backend) and handed straight to templates or JSON.
+
+NumPy is imported by the functions that need it, so my_app can import
+this module at startup without loading NumPy until the first /analysis.
+"""
+
+from collections import namedtuple
+from datetime import date
+
+EXPENSE, INCOME = 0, 1
+# category_id is NULL for uncategorised rows, as in monthly_category_totals
+UNCATEGORISED = 0
+ROLLING_WINDOW = 3
+
+Columns = namedtuple("Columns", "amount type_code day category_id")
+
+
+def rolling_mean(values, window=ROLLING_WINDOW):
+    """Trailing mean over ``window`` points (fewer at the start of the series)."""
+    import numpy as np
+
+    values = np.asarray(values, dtype=np.float64)
+    totals = np.cumsum(values)
+    totals[window:] = totals[window:] - totals[:-window]
+    counts = np.minimum(np.arange(1, len(values) + 1), window)
+    return totals / counts
+
+
+def month_over_month(values):
+    """``(delta, percent)`` arrays against the previous point; percent is NaN after a zero."""
+    import numpy as np
+
+    values = np.asarray(values, dtype=np.float64)
+    delta = np.diff(values, prepend=values[:1])
+    previous = np.concatenate((values[:1], values[:-1]))
+    percent = np.full(len(values), np.nan)
+    np.divide(delta * 100, previous, out=percent, where=previous != 0)
+    percent[:1] = np.nan
+    return delta, percent
+
+
+def _rounded(values):
+    import numpy as np
+
+    return [None if np.isnan(v) else round(float(v), 2) for v in values]
+
+
+def summarize(columns, today=None, window=ROLLING_WINDOW):
+    """All /analysis figures for one user's ``Columns``.
+
+    Monthly series run from the first transaction's month to the current
+    month (or the latest transaction, if later), with empty months as 0.
+    """
+    import numpy as np
+
+    today = today or date.today()
+    amount, type_code, day, category_id = columns
+    is_income = type_code == INCOME
+    income_total = float(amount[is_income].sum())
+    expense_total = float(amount[~is_income].sum())
+
+    months = day.astype("datetime64[M]")
+    current = np.datetime64(today, "M")
+    first = months.min() if len(months) else current
+    last = max(months.max(), current) if len(months) else current
+    index = (months - first).astype(np.int64)
+    span = int((last - first).astype(np.int64)) + 1
+    income = np.bincount(index, weights=np.where(is_income, amount, 0), minlength=span)
+    expenses = np.bincount(index, weights=np.where(is_income, 0, amount), minlength=span)
+
+    ids, inverse = np.unique(category_id[~is_income], return_inverse=True)
+    by_category = np.bincount(inverse, weights=amount[~is_income], minlength=len(ids))
+    order = np.argsort(-by_category, kind="stable")
+
+    delta, percent = month_over_month(expenses)
+    return {
+        "months": [str(month) for month in np.arange(first, last + 1)],
+        "income": _rounded(income),
+        "expenses": _rounded(expenses),
+        "net": _rounded(income - expenses),
+        "rolling_income": _rounded(rolling_mean(income, window)),
+        "rolling_expenses": _rounded(rolling_mean(expenses, window)),
+        "expense_delta": _rounded(delta),
+        "expense_delta_pct": _rounded(percent),
+        "category_expenses": [(int(ids[i]), round(float(by_category[i]), 2)) for i in order],
+        "total_income": round(income_total, 2),
+        "total_expenses": round(expense_total, 2),
+    }
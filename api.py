@@ -0,0 +1,163 @@
+"""Versioned JSON API (``/api/v1``) for the list endpoints.
+
+Every response carries a strong ETag built from the user's version counters
+for the tables the resource reads (see db/versions.py).  When the client's
+``If-None-Match`` still matches, the view answers ``304 Not Modified`` after a
+single primary-key lookup, without running the resource query.
+"""
+
+import hashlib
+import json
+
+from flask import Blueprint, Response, abort, request, session
+
+import db
+from db import ledger, versions
+from db.batch import rows_as_dicts
+from db.dialect import limit, top
+from db.queries import NEWEST_FIRST, TRANSACTION_COLUMNS, encode_page_cursor, transaction_filters
+from exports import json_default
+from helpers import login_required
+
+api = Blueprint("api_v1", __name__, url_prefix="/api/v1")
+
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def make_etag(resource, user_id, table_versions, query_string=b""):
+    key = json.dumps([resource, user_id, sorted(table_versions.items()), query_string.decode("latin-1")])
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+
+
+def conditional_json(resource, tables, load):
+    """Serve ``load(cursor, user_id)`` as JSON unless the client's copy is current."""
+    user_id = session["user_id"]
+    with db.get_pool().connection() as conn:
+        cursor = conn.cursor()
+        etag = make_etag(resource, user_id, versions.get_versions(cursor, user_id, tables), request.query_string)
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            body = json.dumps(load(cursor, user_id), default=json_default, separators=(",", ":"))
+            response = Response(body, mimetype="application/json")
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def _all(sql):
+    def load(cursor, user_id):
+        cursor.execute(sql, user_id)
+        return rows_as_dicts(cursor)
+    return load
+
+
+@api.route("/transactions")
+@login_required
+def transactions():
+    page_size = max(min(request.args.get("page_size", PAGE_SIZE, type=int) or PAGE_SIZE, MAX_PAGE_SIZE), 1)
+
+    def load(cursor, user_id):
+        try:
+            where, params = transaction_filters(user_id, request.args)
+        except ValueError:
+            abort(400, "Invalid filter or page cursor.")
+        cursor.execute(
+            TRANSACTION_COLUMNS.format(top=top(page_size + 1)) + where + f"{NEWEST_FIRST} {limit(page_size + 1)}",
+            *params,
+        )
+        rows = cursor.fetchmany(page_size + 1)
+        next_cursor = encode_page_cursor(rows[page_size - 1]) if len(rows) > page_size else None
+        columns = [column[0] for column in cursor.description]
+        return {"items": [dict(zip(columns, row)) for row in rows[:page_size]], "next_cursor": next_cursor}
+
+    return conditional_json("transactions", (versions.TRANSACTIONS, versions.ACCOUNTS), load)
+
+
+@api.route("/budgets")
+@login_required
+def budgets():
+    return conditional_json("budgets", (versions.BUDGETS, versions.TRANSACTIONS), _all("""
+        SELECT b.budget_id, b.category_id, c.category_name, b.budget_month, b.budget_amount,
+               b.alert_threshold, COALESCE(m.total_amount, 0) AS total_spent
+        FROM budgets b
+        JOIN categories c ON b.category_id = c.category_id
+        LEFT JOIN monthly_category_totals m
+            ON m.user_id = b.user_id AND m.category_id = b.category_id
+            AND m.month = b.budget_month AND m.transaction_type = 'expense'
+        WHERE b.user_id = ?
+        ORDER BY b.budget_month DESC
+    """))
+
+
+@api.route("/savings")
+@login_required
+def savings():
+    return conditional_json("savings", (versions.SAVINGS,), _all("""
+        SELECT goal_id, goal_name, target_amount, current_amount, target_date
+        FROM savings_goals WHERE user_id = ? ORDER BY target_date
+    """))
+
+
+@api.route("/recurring")
+@login_required
+def recurring():
+    return conditional_json("recurring", (versions.RECURRING, versions.ACCOUNTS), _all("""
+        SELECT rt.recurring_id, rt.amount, rt.transaction_type, rt.frequency, rt.start_date,
+               rt.end_date, rt.last_generated_date, rt.is_active, rt.description,
+               rt.category_id, c.category_name, rt.account_id, a.account_name
+        FROM recurring_transactions rt
+        JOIN categories c ON rt.category_id = c.category_id
+        LEFT JOIN user_accounts a ON rt.account_id = a.account_id
+        WHERE rt.user_id = ?
+        ORDER BY rt.start_date DESC
+    """))
+
+
+@api.route("/bills")
+@login_required
+def bills():
+    return conditional_json("bills", (versions.BILLS,), _all("""
+        SELECT bill_id, bill_name, amount, due_date, status
+        FROM bill_reminders WHERE user_id = ? ORDER BY due_date
+    """))
+
+
+@api.route("/notifications")
+@login_required
+def notifications():
+    notif_type = request.args.get("type")
+
+    def load(cursor, user_id):
+        where, params = ("AND notification_type = ?", [notif_type]) if notif_type else ("", [])
+        cursor.execute(f"""
+            SELECT notification_id, notification_type, message, related_entity_type,
+                   related_entity_id, is_read, created_at
+            FROM notifications WHERE user_id = ? {where}
+            ORDER BY created_at DESC
+        """, user_id, *params)
+        return rows_as_dicts(cursor)
+
+    return conditional_json("notifications", (versions.NOTIFICATIONS,), load)
+
+
+@api.route("/debts")
+@login_required
+def debts():
+    return conditional_json("debts", (versions.DEBTS,), _all("""
+        SELECT debt_id, lender_name, total_amount, paid_amount, interest_rate, due_date
+        FROM debts WHERE user_id = ? ORDER BY due_date
+    """))
+
+
+@api.route("/accounts")
+@login_required
+def accounts():
+    return conditional_json("accounts", (versions.ACCOUNTS,), _all(f"""
+        SELECT a.account_id, a.account_name, a.account_type, b.balance AS current_balance,
+               a.currency, a.is_active
+        FROM user_accounts a
+        JOIN ({ledger.balances_sql()}) b ON b.account_id = a.account_id
+        ORDER BY a.account_id
+    """))
@@ -0,0 +1,230 @@
+"""ASGI entry point: async handlers for the read-heavy pages, my_app for the rest.
+
+  uvicorn asgi:application --host 0.0.0.0 --port 5000
+
+GET /dashboard, /transactions, /budgets, /analysis and /notifications run
+as coroutines on the server's event loop, with the DB work going through
+db/aio.py and independent lookups gathered so they run at the same time.
+They keep my_app's request handling: the Flask request context (session,
+``g``, before/after/teardown hooks) is pushed around each handler and the
+pages are rendered by the same templates.  The parts of it that can block
+(loading and saving the session, the hooks, the page caches) run in
+threads, never on the event loop.  Every other request is passed to
+the WSGI app in a2wsgi's thread pool (``ASGI_WSGI_THREADS``).
+
+Needs ``pip install uvicorn a2wsgi`` plus aiosqlite or aioodbc for the
+configured engine.
+"""
+
+import asyncio
+import contextvars
+import io
+import os
+from datetime import datetime
+from functools import wraps
+
+from a2wsgi import WSGIMiddleware
+from a2wsgi.wsgi import build_environ
+from flask import render_template, request, session
+from werkzeug.exceptions import HTTPException
+
+import db
+from db import aio
+from db.dialect import month_bounds
+from helpers import login_required
+from my_app import app
+from views.analysis import MONTH_BUDGET_SQL, analysis_recent_sql, load_analytics, render_analysis
+from views.budgets import BUDGETS_SQL, budget_months_sql
+from views.dashboard import cached_dashboard_snapshot, dashboard_queries, dashboard_snapshot, render_dashboard
+from views.notifications import notifications_query
+from views.shared import dashboard_cache, get_cursor, get_user_categories, request_filters
+from views.transactions import ranked_page, render_transactions, transactions_page_query, transactions_page_size
+
+ASGI_WSGI_THREADS = int(os.getenv("ASGI_WSGI_THREADS", "32"))
+
+
+def async_login_required(view):
+    # helpers.login_required's check, without calling the view from sync code
+    check = login_required(lambda *args, **kwargs: None)
+
+    @wraps(view)
+    async def wrapper(*args, **kwargs):
+        redirect_response = check(*args, **kwargs)
+        if redirect_response is not None:
+            return redirect_response
+        return await view(*args, **kwargs)
+    return wrapper
+
+
+@async_login_required
+async def dashboard():
+    user_id = session["user_id"]
+    month_start, _ = month_bounds(datetime.today())
+
+    # The version lookup and the cache (maybe Redis) stay off the event loop
+    tag, snapshot = await asyncio.to_thread(cached_dashboard_snapshot, user_id, month_start)
+    if snapshot is None:
+        results = await asyncio.gather(*(
+            aio.fetch_dicts(sql, *params) for sql, params in dashboard_queries(user_id, month_start)
+        ))
+        snapshot = dashboard_snapshot(month_start, results)
+        await asyncio.to_thread(dashboard_cache.set, user_id, (tag, snapshot))
+    return render_dashboard(snapshot)
+
+
+def _ranked(user_id, args, page_size):
+    with get_cursor() as cursor:
+        return ranked_page(cursor, user_id, args, page_size)
+
+
+@async_login_required
+async def transactions():
+    user_id = session["user_id"]
+    page_size = transactions_page_size(request.args)
+
+    if request.args.get("keyword"):
+        # Ranking runs on a sync cursor; keep it off the event loop
+        rows, next_cursor = await asyncio.to_thread(_ranked, user_id, request.args, page_size)
+        return render_transactions(rows, page_size, next_cursor)
+
+    where, params = request_filters(user_id, request.args)
+    rows = await aio.fetchall(transactions_page_query(where, page_size), *params)
+    return render_transactions(rows, page_size)
+
+
+@async_login_required
+async def budgets():
+    user_id = session["user_id"]
+    budgets, months, categories = await asyncio.gather(
+        aio.fetchall(BUDGETS_SQL, user_id),
+        aio.fetchall(budget_months_sql(), user_id),
+        asyncio.to_thread(get_user_categories, user_id, "expense"),
+    )
+    return render_template("budgets.html", budgets=budgets, categories=categories,
+                           available_months=[row.month for row in months])
+
+
+def _load_analytics(user_id):
+    with get_cursor() as cursor:
+        return load_analytics(cursor, user_id)
+
+
+@async_login_required
+async def analysis():
+    user_id = session["user_id"]
+    alert = session.pop("alert", None)
+    month_start, _ = month_bounds(datetime.now())
+
+    # The column store reads and NumPy work run in a thread next to the queries
+    figures, transactions, budget, categories = await asyncio.gather(
+        asyncio.to_thread(_load_analytics, user_id),
+        aio.fetchall(analysis_recent_sql(), user_id),
+        aio.fetchone(MONTH_BUDGET_SQL, user_id, month_start),
+        asyncio.to_thread(get_user_categories, user_id),
+    )
+    return render_analysis(figures, transactions, budget, categories, alert)
+
+
+@async_login_required
+async def notifications():
+    user_id = session["user_id"]
+    notif_type = request.args.get("type")
+    rows = await aio.fetchall(*notifications_query(user_id, notif_type))
+    return render_template("notifications.html", notifications=rows, selected_type=notif_type)
+
+
+# Blueprint endpoint -> async handler for its GET requests (only the ones the
+# app's APP_ROLE mounts are ever matched)
+ASYNC_VIEWS = {
+    "dashboard.dashboard": dashboard,
+    "transactions.transactions": transactions,
+    "budgets.budgets": budgets,
+    "analysis.analysis": analysis,
+    "notifications.notifications": notifications,
+}
+
+
+async def _dispatch(environ):
+    # Flask's wsgi_app/full_dispatch_request, awaiting the view.  The request
+    # context's own steps can block (a DB session is loaded on push and saved
+    # by finalize_request, hooks run SQL), so they run in the default executor.
+    # All of them run inside one contextvars.Context, which holds the pushed
+    # request and the SQL trace: asyncio.to_thread would hand each call a copy,
+    # and the context pushed in one call would be gone in the next.
+    context = contextvars.copy_context()
+    loop = asyncio.get_running_loop()
+
+    def in_thread(func, *args):
+        return loop.run_in_executor(None, context.run, func, *args)
+
+    ctx = app.request_context(environ)
+    error = None
+    try:
+        await in_thread(ctx.push)
+        try:
+            rv = await in_thread(app.preprocess_request)
+            if rv is None:
+                if ctx.request.routing_exception is not None:
+                    raise ctx.request.routing_exception
+                view = ASYNC_VIEWS[ctx.request.endpoint](**ctx.request.view_args)
+                # A task started from the context runs in a copy of it
+                rv = await context.run(asyncio.ensure_future, view)
+        except Exception as e:
+            rv = await in_thread(app.handle_user_exception, e)
+        response = await in_thread(app.finalize_request, rv)
+    except Exception as e:
+        error = e
+        response = await in_thread(app.handle_exception, e)
+    finally:
+        if app.should_ignore_error(error):
+            error = None
+        await in_thread(ctx.pop, error)
+    return response
+
+
+async def _send(response, send, head):
+    await send({
+        "type": "http.response.start",
+        "status": response.status_code,
+        "headers": [(key.lower().encode("latin-1"), value.encode("latin-1"))
+                    for key, value in response.headers.items()],
+    })
+    body = b"" if head else b"".join(response.iter_encoded())
+    await send({"type": "http.response.body", "body": body})
+
+
+class Application:
+    def __init__(self, wsgi_app, threads=ASGI_WSGI_THREADS):
+        self.wsgi = WSGIMiddleware(wsgi_app, workers=threads)
+        self._adapter = app.url_map.bind("localhost")
+
+    def _async_view(self, scope):
+        if scope["method"] not in ("GET", "HEAD"):
+            return False
+        try:
+            endpoint, _ = self._adapter.match(scope["path"], method="GET")
+        except HTTPException:
+            return False
+        return endpoint in ASYNC_VIEWS
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await self.lifespan(receive, send)
+        if scope["type"] == "http" and self._async_view(scope):
+            response = await _dispatch(build_environ(scope, io.BytesIO()))
+            return await _send(response, send, scope["method"] == "HEAD")
+        return await self.wsgi(scope, receive, send)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await asyncio.to_thread(db.get_pool().warm)
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await aio.close_pool()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+application = Application(app)
@@ -0,0 +1,125 @@
+"""Caches for per-user page data.
+
+``TTLCache`` lives in the process.  ``make_cache`` returns a ``RedisCache``
+instead when ``CACHE_URL`` points at Redis, so several workers share one
+cache; both expose the same get/set/delete/get_or_set/stats interface.
+"""
+
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire ``ttl`` seconds after being set."""
+
+    def __init__(self, ttl=60.0, max_entries=10_000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING and entry[0] > now:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not _MISSING:
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value, ttl=None):
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def get_or_set(self, key, compute, ttl=None):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.set(key, value, ttl)
+        return value
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._data), "hits": self.hits, "misses": self.misses}
+
+
+class RedisCache:
+    """``TTLCache`` interface backed by Redis (requires the ``redis`` package).
+
+    Values are pickled, so cache plain data (tuples, namedtuples, dicts)
+    rather than driver row objects.
+    """
+
+    def __init__(self, url, namespace, ttl=60.0):
+        import redis
+
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._prefix = f"expense-tracker:{namespace}:"
+        self._redis = redis.Redis.from_url(url)
+
+    def _key(self, key):
+        return self._prefix + repr(key)
+
+    def get(self, key, default=None):
+        raw = self._redis.get(self._key(key))
+        if raw is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return pickle.loads(raw)
+
+    def set(self, key, value, ttl=None):
+        seconds = max(int(self.ttl if ttl is None else ttl), 1)
+        self._redis.set(self._key(key), pickle.dumps(value), ex=seconds)
+
+    def get_or_set(self, key, compute, ttl=None):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.set(key, value, ttl)
+        return value
+
+    def delete(self, key):
+        self._redis.delete(self._key(key))
+
+    def clear(self):
+        for key in self._redis.scan_iter(match=self._prefix + "*"):
+            self._redis.delete(key)
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
+
+
+def make_cache(namespace, ttl=60.0, max_entries=10_000, url=None):
+    """A cache for ``namespace``: shared if ``CACHE_URL`` is a redis:// URL, else in-process."""
+    url = url if url is not None else os.getenv("CACHE_URL", "")
+    if not url:
+        return TTLCache(ttl=ttl, max_entries=max_entries)
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisCache(url, namespace, ttl=ttl)
+    raise ValueError(f"Unsupported CACHE_URL: {url!r}")
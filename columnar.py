@@ -0,0 +1,244 @@
+"""Per-user, per-month columnar transaction snapshots on local disk.
+
+Each closed month of a user's transactions is written once as a directory of
+``.npy`` column files and read back with ``np.load(mmap_mode="r")``, so
+repeated analytics and exports over a long history page in column data from
+the OS cache instead of re-reading the rows from SQL.  The current month
+(and anything dated after it) is always read live.
+
+A month directory is named after a fingerprint of that month's
+``monthly_category_totals`` rows, revisions included.  Every write to a
+transaction in a closed month advances a revision there (see
+db/aggregates.py), even a new description or a different day in the same
+month, so the fingerprint changes in the database that every node reads,
+and the next reader builds a fresh directory next to the old one.
+Published directories are never modified.  Only the readers and writers
+import NumPy; ``drop_user`` and ``export_supported`` don't need it.
+
+Layout::
+
+    <root>/<user_id>/<YYYY-MM>-<fingerprint>/<column>.npy
+"""
+
+import hashlib
+import os
+import shutil
+from collections import namedtuple
+from datetime import date
+
+from analytics import EXPENSE, INCOME, UNCATEGORISED, Columns
+from db.dialect import month_bounds
+
+COLUMNAR_DIR = os.getenv("COLUMNAR_DIR", "columnar")
+
+# Rows are stored in (day, transaction_id) order
+Month = namedtuple("Month", "transaction_id amount type_code day category_id description")
+
+_DTYPES = {
+    "transaction_id": "int64",
+    "amount": "float64",
+    "type_code": "int8",
+    "day": "datetime64[D]",
+    "category_id": "int64",
+    "description": str,
+}
+
+
+def _empty_month():
+    import numpy as np
+
+    return Month(*(np.empty(0, dtype) for dtype in _DTYPES.values()))
+
+
+def concat(months):
+    """Join ``Month``s into one (copies; a single month is returned as is)."""
+    import numpy as np
+
+    months = list(months)
+    if not months:
+        return _empty_month()
+    if len(months) == 1:
+        return months[0]
+    return Month(*(np.concatenate(column) for column in zip(*months)))
+
+
+def as_columns(month):
+    """The ``analytics.Columns`` view of a ``Month`` (no copy)."""
+    return Columns(month.amount, month.type_code, month.day, month.category_id)
+
+
+def read_range(cursor, user_id, start, end=None):
+    """Transactions of ``user_id`` dated ``start`` <= date < ``end`` as one ``Month``."""
+    import numpy as np
+
+    where, params = ("AND transaction_date < ?", [end]) if end else ("", [])
+    cursor.execute(
+        f"""
+        SELECT transaction_id, amount,
+               CASE WHEN transaction_type = 'income' THEN {INCOME} ELSE {EXPENSE} END AS type_code,
+               transaction_date,
+               COALESCE(category_id, {UNCATEGORISED}) AS category_id,
+               COALESCE(description, '') AS description
+        FROM transactions
+        WHERE user_id = ? AND transaction_date >= ? {where}
+        ORDER BY transaction_date, transaction_id
+        """,
+        user_id, start, *params,
+    )
+    rows = cursor.fetchall()
+    if not rows:
+        return _empty_month()
+    return Month(*(np.array(column, dtype=dtype) for column, dtype in zip(zip(*rows), _DTYPES.values())))
+
+
+def _split_by_month(month):
+    """``{month_start: Month}`` views of a ``Month`` sorted by day."""
+    import numpy as np
+
+    months = month.day.astype("datetime64[M]")
+    starts = np.flatnonzero(np.diff(months.astype(np.int64), prepend=-1))
+    bounds = list(starts) + [len(months)]
+    return {
+        months[lo].astype(date): Month(*(column[lo:hi] for column in month))
+        for lo, hi in zip(bounds, bounds[1:])
+    }
+
+
+class MonthStore:
+    def __init__(self, root=COLUMNAR_DIR):
+        self.root = root
+
+    def _user_dir(self, user_id):
+        return os.path.join(self.root, str(int(user_id)))
+
+    def _month_dir(self, user_id, month, fingerprint):
+        return os.path.join(self._user_dir(user_id), f"{month:%Y-%m}-{fingerprint}")
+
+    @staticmethod
+    def fingerprints(cursor, user_id, before):
+        """``{month_start: fingerprint}`` for the user's months before ``before``."""
+        cursor.execute(
+            """
+            SELECT month, category_id, transaction_type, total_amount, txn_count, revision
+            FROM monthly_category_totals
+            WHERE user_id = ? AND month < ? AND txn_count <> 0
+            ORDER BY month, category_id, transaction_type
+            """,
+            user_id, before,
+        )
+        digests = {}
+        for row in cursor.fetchall():
+            month = month_bounds(row.month)[0]
+            digest = digests.setdefault(month, hashlib.sha1())
+            digest.update(
+                f"{row.category_id}|{row.transaction_type}|{float(row.total_amount):.2f}|{row.txn_count}"
+                f"|{row.revision};".encode()
+            )
+        return {month: digest.hexdigest()[:16] for month, digest in digests.items()}
+
+    def _load(self, path):
+        import numpy as np
+
+        try:
+            return Month(*(np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r") for name in Month._fields))
+        except FileNotFoundError:
+            return None
+
+    def _write(self, user_id, month, fingerprint, data):
+        import numpy as np
+
+        path = self._month_dir(user_id, month, fingerprint)
+        partial = f"{path}.{os.getpid()}.part"
+        os.makedirs(partial, exist_ok=True)
+        for name, column in zip(Month._fields, data):
+            np.save(os.path.join(partial, f"{name}.npy"), np.ascontiguousarray(column))
+        try:
+            os.rename(partial, path)
+        except OSError:
+            # Another worker published the same month first
+            shutil.rmtree(partial, ignore_errors=True)
+        # Older fingerprints of this month are stale now
+        user_dir, prefix = self._user_dir(user_id), f"{month:%Y-%m}-"
+        for name in os.listdir(user_dir):
+            stale = os.path.join(user_dir, name)
+            if name.startswith(prefix) and not name.endswith(".part") and stale != path:
+                shutil.rmtree(stale, ignore_errors=True)
+        return path
+
+    def months(self, cursor, user_id, today=None):
+        """The user's transactions as ``[(month_start, Month), ...]``, oldest first.
+
+        Closed months are memory-mapped from disk (built from SQL on first
+        use); the current month onwards is read live.
+        """
+        current, _ = month_bounds(today or date.today())
+        closed = self.fingerprints(cursor, user_id, current)
+        loaded = {}
+        for month, fingerprint in closed.items():
+            data = self._load(self._month_dir(user_id, month, fingerprint))
+            if data is not None:
+                loaded[month] = data
+        missing = sorted(set(closed) - set(loaded))
+        if missing:
+            # One range read covers every month that needs (re)building
+            built = _split_by_month(read_range(cursor, user_id, missing[0], current))
+            for month in missing:
+                data = built.get(month, _empty_month())
+                loaded[month] = self._load(self._write(user_id, month, closed[month], data)) or data
+        live = read_range(cursor, user_id, current)
+        return sorted(loaded.items()) + sorted(_split_by_month(live).items())
+
+    def drop_user(self, user_id):
+        shutil.rmtree(self._user_dir(user_id), ignore_errors=True)
+
+
+def export_supported(args):
+    """Whether an export's filters can be served from the store."""
+    if any(args.get(field) for field in ("keyword", "after")):
+        return False
+    try:
+        if args.get("from") and args.get("to"):
+            date.fromisoformat(args["from"]), date.fromisoformat(args["to"])
+        if args.get("category_id"):
+            int(args["category_id"])
+    except ValueError:
+        return False
+    return True
+
+
+def iter_export_rows(months, category_names, args, batch_size):
+    """Yield batches of ``(date, type, category, amount, description)``, newest first.
+
+    ``months`` comes from ``MonthStore.months``; rows without a known
+    category are left out, as the SQL export's inner join does.  The date
+    range is a zero-copy slice of each month's sorted ``day`` column.
+    """
+    import numpy as np
+
+    kind = args.get("type")
+    category_id = int(args["category_id"]) if args.get("category_id") else None
+    low = np.datetime64(args["from"], "D") if args.get("from") and args.get("to") else None
+    high = np.datetime64(args["to"], "D") if low is not None else None
+    known = np.array(sorted(category_names), dtype=np.int64)
+
+    for _, month in reversed(months):
+        lo = np.searchsorted(month.day, low, "left") if low is not None else 0
+        hi = np.searchsorted(month.day, high, "right") if high is not None else len(month.day)
+        if lo >= hi:
+            continue
+        view = Month(*(column[lo:hi] for column in month))
+        keep = np.isin(view.category_id, known)
+        if kind:
+            keep &= view.type_code == (INCOME if kind == "income" else EXPENSE)
+        if category_id is not None:
+            keep &= view.category_id == category_id
+        index = np.flatnonzero(keep)[::-1]
+        for start in range(0, len(index), batch_size):
+            chunk = index[start:start + batch_size]
+            yield list(zip(
+                view.day[chunk].tolist(),
+                np.where(view.type_code[chunk] == INCOME, "income", "expense").tolist(),
+                [category_names[c] for c in view.category_id[chunk].tolist()],
+                view.amount[chunk].tolist(),
+                view.description[chunk].tolist(),
+            ))
@@ -3,14 +3,18 @@ import pytest
 import pytest
 import os
 import sys
-import sqlite3
 from dotenv import load_dotenv
 load_dotenv()
+# The cookie session backend won't start without a secret
+os.environ.setdefault("APP_SECRET", "test-secret")
 
 # Add parent directory to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from my_app import app as flask_app, get_connection
+import db
+from db.config import DBConfig
+from my_app import app as flask_app
+from scripts.init_db import apply_baseline, migrate
 from werkzeug.security import generate_password_hash
 
 
@@ -27,73 +31,30 @@ def client(app):
     return app.test_client()
 
 
-def _init_sqlite_schema(conn):
-    c = conn.cursor()
-    # Minimal tables required for tests
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            user_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            full_name TEXT,
-            email TEXT UNIQUE,
-            password_hash TEXT,
-            recovery_hint TEXT
-        )
-    ''')
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS user_accounts (
-            account_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER,
-            account_name TEXT,
-            account_type TEXT,
-            current_balance REAL DEFAULT 0
-        )
-    ''')
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS categories (
-            category_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            category_name TEXT,
-            category_type TEXT,
-            user_id INTEGER
-        )
-    ''')
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS transactions (
-            transaction_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER,
-            category_id INTEGER,
-            amount REAL,
-            transaction_type TEXT,
-            transaction_date TEXT,
-            description TEXT,
-            receipt_url TEXT,
-            account_id INTEGER
-        )
-    ''')
-    conn.commit()
+@pytest.fixture
+def migrated_db(tmp_path):
+    """Point the db package at a fresh SQLite file with every migration applied.
+
+    Yields the DBConfig; the previous configuration is restored afterwards.
+    """
+    previous = db.get_config()
+    config = db.configure(DBConfig("sqlite", str(tmp_path / "test.db"), None, 1, 4, 1, 300, 3600))
+    conn = db.connect()
+    try:
+        apply_baseline(conn, "sqlite")
+        migrate(conn, "sqlite", log=lambda msg: None)
+    finally:
+        conn.close()
+    yield config
+    db.configure(previous)
 
 
 @pytest.fixture
-def db_cursor():
-    # Provide a DB cursor for tests. If using sqlite (DB_ENGINE=sqlite),
-    # create an in-memory DB and initialize schema for isolation.
-    engine = os.getenv('DB_ENGINE', 'mssql').lower()
-
-    if engine == 'sqlite':
-        db_path = os.getenv('DB_PATH', ':memory:')
-        conn = sqlite3.connect(db_path, detect_types=sqlite3.PARSE_DECLTYPES)
-        conn.row_factory = sqlite3.Row
-        _init_sqlite_schema(conn)
-        cursor = conn.cursor()
-        yield cursor
-        conn.close()
-    else:
-        conn = get_connection()
-        cursor = conn.cursor()
-        yield cursor
-        try:
-            conn.rollback()
-        finally:
-            conn.close()
+def db_cursor(migrated_db):
+    # A pooled cursor on the migrated test database
+    conn = db.connect()
+    yield conn.cursor()
+    conn.close()
 
 
 @pytest.fixture
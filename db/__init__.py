@@ -0,0 +1,93 @@
+"""Database access: configuration, per-engine connectors and the connection pool."""
+
+import os
+import threading
+from functools import wraps
+
+from db.config import DBConfig, load_config
+from db.engines import connector_for
+from db.pool import ConnectionPool, PooledConnection, PoolTimeout
+
+_config = None
+_pool = None
+_pool_pid = None
+_lock = threading.Lock()
+
+
+def get_config():
+    global _config
+    if _config is None:
+        _config = load_config()
+    return _config
+
+
+def configure(config=None):
+    """Resolve DB config once at startup and drop any existing pool."""
+    global _config
+    with _lock:
+        _config = config or load_config()
+        _reset_pool()
+    return _config
+
+
+def _reset_pool():
+    global _pool, _pool_pid
+    if _pool is not None and _pool_pid == os.getpid():
+        _pool.close()
+    _pool = None
+    _pool_pid = None
+
+
+def get_pool():
+    """Return this process's pool, creating it lazily (and again after fork)."""
+    global _pool, _pool_pid
+    pid = os.getpid()
+    if _pool is None or _pool_pid != pid:
+        with _lock:
+            if _pool is None or _pool_pid != pid:
+                config = get_config()
+                _pool = ConnectionPool(
+                    connector_for(config),
+                    min_size=config.pool_min_size,
+                    max_size=config.pool_max_size,
+                    timeout=config.pool_timeout,
+                    max_idle=config.pool_max_idle,
+                    max_lifetime=config.pool_max_lifetime,
+                )
+                _pool_pid = pid
+    return _pool
+
+
+def connect():
+    """Check out a pooled connection; ``close()`` returns it to the pool."""
+    pool = get_pool()
+    return PooledConnection(pool, pool.acquire())
+
+
+def with_connection(func):
+    """Decorator that passes a pooled connection as the first argument.
+
+    The transaction is committed when ``func`` returns and rolled back if it
+    raises; either way the connection goes back to the pool.
+    """
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with get_pool().connection() as conn:
+            result = func(conn, *args, **kwargs)
+            conn.commit()
+            return result
+
+    return wrapper
+
+
+__all__ = [
+    "ConnectionPool",
+    "DBConfig",
+    "PoolTimeout",
+    "configure",
+    "connect",
+    "get_config",
+    "get_pool",
+    "with_connection",
+]
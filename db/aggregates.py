@@ -0,0 +1,140 @@
+"""Incrementally maintained ``monthly_category_totals``.
+
+Write routes call ``record_transaction`` with the same cursor they used to
+change ``transactions``, so the aggregate moves in the same DB transaction.
+Read routes then scan O(budgets) aggregate rows instead of re-summing a
+user's history.  ``rebuild`` / ``find_drift`` recompute from raw data.
+
+Every write also advances the row's ``revision``, including edits that
+leave the totals as they were, so readers that cache a month's rows (see
+columnar.py) can tell that it changed.
+"""
+
+import time
+from collections import defaultdict
+
+from db.dialect import engine_name, month_bounds, month_start
+
+# category_id is part of the primary key, so uncategorised rows use 0
+UNCATEGORISED = 0
+
+_UPSERT = {
+    "mssql": """
+        MERGE monthly_category_totals WITH (HOLDLOCK) AS m
+        USING (SELECT ? AS user_id, ? AS category_id, ? AS month, ? AS transaction_type,
+                      ? AS amount, ? AS txn_count) AS d
+        ON m.user_id = d.user_id AND m.category_id = d.category_id
+           AND m.month = d.month AND m.transaction_type = d.transaction_type
+        WHEN MATCHED THEN
+            UPDATE SET total_amount = m.total_amount + d.amount,
+                       txn_count = m.txn_count + d.txn_count,
+                       revision = m.revision + 1
+        WHEN NOT MATCHED THEN
+            INSERT (user_id, category_id, month, transaction_type, total_amount, txn_count, revision)
+            VALUES (d.user_id, d.category_id, d.month, d.transaction_type, d.amount, d.txn_count, 1);
+    """,
+    "sqlite": """
+        INSERT INTO monthly_category_totals
+            (user_id, category_id, month, transaction_type, total_amount, txn_count, revision)
+        VALUES (?, ?, ?, ?, ?, ?, 1)
+        ON CONFLICT (user_id, category_id, month, transaction_type) DO UPDATE SET
+            total_amount = total_amount + excluded.total_amount,
+            txn_count = txn_count + excluded.txn_count,
+            revision = revision + 1
+    """,
+}
+
+
+def _key(user_id, category_id, transaction_type, transaction_date):
+    return (
+        user_id,
+        category_id if category_id is not None else UNCATEGORISED,
+        month_bounds(transaction_date)[0],
+        transaction_type,
+    )
+
+
+def record_transaction(cursor, user_id, category_id, transaction_type, transaction_date, amount, sign=1):
+    """Add (``sign=1``) or remove (``sign=-1``) one transaction from the totals."""
+    record_many(cursor, [(user_id, category_id, transaction_type, transaction_date, amount, sign)])
+
+
+def record_many(cursor, rows):
+    """Apply many ``(user_id, category_id, type, date, amount, sign)`` deltas.
+
+    Deltas that hit the same aggregate row are folded together first so each
+    row is written once.  A row whose deltas cancel out is still written, to
+    advance its revision.
+    """
+    deltas = defaultdict(lambda: [0.0, 0])
+    for user_id, category_id, transaction_type, transaction_date, amount, sign in rows:
+        delta = deltas[_key(user_id, category_id, transaction_type, transaction_date)]
+        delta[0] += sign * float(amount)
+        delta[1] += sign
+    params = [key + (amount, count) for key, (amount, count) in deltas.items()]
+    if params:
+        cursor.executemany(_UPSERT[engine_name()], params)
+
+
+def _raw_totals_sql(user_filter):
+    month = month_start("transaction_date")
+    return f"""
+        SELECT user_id, COALESCE(category_id, {UNCATEGORISED}) AS category_id, {month} AS month,
+               transaction_type, SUM(amount) AS total_amount, COUNT(*) AS txn_count
+        FROM transactions
+        {user_filter}
+        GROUP BY user_id, COALESCE(category_id, {UNCATEGORISED}), {month}, transaction_type
+    """
+
+
+def rebuild(cursor, user_id=None):
+    """Recompute the aggregate from ``transactions`` (for one user or everyone).
+
+    The rebuilt rows' revision starts at the current Unix time, well past
+    the revisions of the rows they replace, so month snapshots cached
+    before the rebuild are not reused.
+    """
+    where, params = ("WHERE user_id = ?", [user_id]) if user_id is not None else ("", [])
+    cursor.execute(f"DELETE FROM monthly_category_totals {where}", *params)
+    cursor.execute(
+        f"""
+        INSERT INTO monthly_category_totals
+            (user_id, category_id, month, transaction_type, total_amount, txn_count, revision)
+        SELECT r.*, ? FROM ({_raw_totals_sql(where)}) r
+        """,
+        int(time.time()), *params,
+    )
+
+
+def _normalise(rows):
+    totals = {}
+    for row in rows:
+        key = (row.user_id, row.category_id, month_bounds(row.month)[0], row.transaction_type)
+        totals[key] = (round(float(row.total_amount), 2), int(row.txn_count))
+    return totals
+
+
+def find_drift(cursor, user_id=None):
+    """Compare stored totals with a fresh recomputation.
+
+    Returns a list of ``(key, stored, expected)`` tuples where ``key`` is
+    ``(user_id, category_id, month, transaction_type)`` and the values are
+    ``(total_amount, txn_count)`` or None when the row is missing.
+    """
+    where, params = ("WHERE user_id = ?", [user_id]) if user_id is not None else ("", [])
+    cursor.execute(_raw_totals_sql(where), *params)
+    expected = _normalise(cursor.fetchall())
+    cursor.execute(
+        f"""
+        SELECT user_id, category_id, month, transaction_type, total_amount, txn_count
+        FROM monthly_category_totals {where}
+        """,
+        *params,
+    )
+    stored = {key: value for key, value in _normalise(cursor.fetchall()).items() if value != (0.0, 0)}
+
+    drift = []
+    for key in sorted(set(expected) | set(stored), key=str):
+        if expected.get(key) != stored.get(key):
+            drift.append((key, stored.get(key), expected.get(key)))
+    return drift
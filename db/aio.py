@@ -0,0 +1,124 @@
+"""Async database access for the ASGI entry point (asgi.py).
+
+The counterpart of ``get_pool()`` for coroutines: aiosqlite for
+``DB_ENGINE=sqlite`` and aioodbc for mssql (optional packages, imported
+on first use).  Rows keep pyodbc-style attribute access.
+
+Each ``fetchall`` / ``fetchone`` / ``fetch_dicts`` call checks out its own
+connection, so independent queries passed to ``asyncio.gather`` run at the
+same time on separate connections.  Connections are only used for reads
+and are opened in autocommit mode.  Statements are recorded in the
+request's SQL trace like the sync cursors' (see db/tracing.py).
+"""
+
+import asyncio
+import sqlite3
+import time
+from contextlib import asynccontextmanager
+
+from db import get_config, tracing
+from db.engines import SQLiteRow
+
+_pool = None
+
+
+async def connect_sqlite(config):
+    import aiosqlite
+
+    conn = await aiosqlite.connect(config.sqlite_path, detect_types=sqlite3.PARSE_DECLTYPES)
+    conn.row_factory = SQLiteRow
+    return conn
+
+
+async def connect_mssql(config):
+    import aioodbc
+
+    return await aioodbc.connect(dsn=config.conn_str, autocommit=True)
+
+
+CONNECTORS = {
+    "sqlite": connect_sqlite,
+    "mssql": connect_mssql,
+}
+
+
+class AsyncPool:
+    """Up to ``max_size`` connections for the event loop that created the pool."""
+
+    def __init__(self, config):
+        try:
+            self._connect = CONNECTORS[config.engine]
+        except KeyError:
+            raise ValueError(f"Unsupported DB_ENGINE: {config.engine!r}") from None
+        self.config = config
+        self.max_size = config.pool_max_size
+        self.loop = asyncio.get_running_loop()
+        self._slots = asyncio.Semaphore(self.max_size)
+        self._idle = []
+
+    @asynccontextmanager
+    async def connection(self):
+        async with self._slots:
+            conn = self._idle.pop() if self._idle else await self._connect(self.config)
+            try:
+                yield conn
+            except BaseException:
+                # Possibly mid-statement; don't hand it out again
+                await conn.close()
+                raise
+            self._idle.append(conn)
+
+    async def close(self):
+        idle, self._idle = self._idle, []
+        for conn in idle:
+            await conn.close()
+
+
+def get_pool():
+    """This event loop's pool, creating it on first use."""
+    global _pool
+    if _pool is None or _pool.loop is not asyncio.get_running_loop():
+        _pool = AsyncPool(get_config())
+    return _pool
+
+
+async def close_pool():
+    global _pool
+    if _pool is not None:
+        pool, _pool = _pool, None
+        await pool.close()
+
+
+async def _run(sql, params, size=None):
+    # Returns (column names, rows); size=1 reads a single row
+    async with get_pool().connection() as conn:
+        started = time.perf_counter()
+        if get_config().engine == "sqlite":
+            cursor = await conn.execute(sql, params)
+        else:
+            cursor = await conn.cursor()
+            await cursor.execute(sql, *params)
+        try:
+            rows = await (cursor.fetchmany(size) if size else cursor.fetchall())
+            columns = [column[0] for column in cursor.description or ()]
+        finally:
+            await cursor.close()
+        trace = tracing.current()
+        if trace is not None:
+            trace.record(sql, time.perf_counter() - started, len(rows))
+        return columns, rows
+
+
+async def fetchall(sql, *params):
+    return (await _run(sql, params))[1]
+
+
+async def fetchone(sql, *params):
+    rows = (await _run(sql, params, size=1))[1]
+    return rows[0] if rows else None
+
+
+async def fetch_dicts(sql, *params):
+    """Rows as plain dicts, like db.batch.rows_as_dicts (cacheable)."""
+    columns, rows = await _run(sql, params)
+    return [dict(zip(columns, row)) for row in rows]
@@ -0,0 +1,34 @@
+"""Run several independent SELECTs in one round trip."""
+
+from db.dialect import engine_name
+
+
+def rows_as_dicts(cursor):
+    """Fetch the current result set as plain dicts (cacheable, picklable)."""
+    columns = [column[0] for column in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def fetch_batch(cursor, statements):
+    """Execute ``[(sql, params), ...]`` and return one list of dict rows per statement.
+
+    On mssql the statements are sent as a single batch and the result sets are
+    read back with ``nextset()``; sqlite runs in-process, so there is no round
+    trip to save and the statements simply run one after another.
+    """
+    if engine_name() == "sqlite":
+        results = []
+        for sql, params in statements:
+            cursor.execute(sql, *params)
+            results.append(rows_as_dicts(cursor))
+        return results
+
+    batch = "SET NOCOUNT ON;\n" + ";\n".join(sql.strip().rstrip(";") for sql, _ in statements)
+    params = [param for _, stmt_params in statements for param in stmt_params]
+    cursor.execute(batch, *params)
+    results = [rows_as_dicts(cursor)]
+    while cursor.nextset():
+        results.append(rows_as_dicts(cursor))
+    if len(results) != len(statements):
+        raise RuntimeError(f"expected {len(statements)} result sets, got {len(results)}")
+    return results
@@ -0,0 +1,67 @@
+"""Database configuration, resolved once from the environment at startup."""
+
+import math
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+from dotenv import load_dotenv
+
+
+@dataclass(frozen=True)
+class DBConfig:
+    engine: str
+    sqlite_path: str
+    conn_str: Optional[str]
+    pool_min_size: int
+    pool_max_size: int
+    pool_timeout: float
+    pool_max_idle: float
+    pool_max_lifetime: float
+
+
+def _mssql_conn_str():
+    # Allow providing a full connection string via DB_CONNECTION env var
+    conn_str = os.getenv("DB_CONNECTION")
+    if conn_str:
+        return conn_str
+
+    driver = os.getenv("DB_DRIVER", "{ODBC Driver 17 for SQL Server}")
+    server = os.getenv("DB_SERVER", "LOHITH_REDDY\\DLRSQL")
+    database = os.getenv("DB_DATABASE", "Expense_Tracker")
+    trusted = os.getenv("DB_TRUSTED", "yes").lower() in ("yes", "true", "1")
+
+    if trusted:
+        return f"DRIVER={driver};SERVER={server};DATABASE={database};Trusted_Connection=yes;"
+    user = os.getenv("DB_USER")
+    password = os.getenv("DB_PASSWORD")
+    return f"DRIVER={driver};SERVER={server};DATABASE={database};UID={user};PWD={password}"
+
+
+def load_config():
+    """Read DB_* variables (and `.env`, if present) into a DBConfig."""
+    load_dotenv()
+
+    engine = os.getenv("DB_ENGINE", "mssql").lower()
+    sqlite_path = os.getenv("DB_PATH", "expense_tracker.db")
+    max_size = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+    max_idle = float(os.getenv("DB_POOL_MAX_IDLE", "300"))
+    max_lifetime = float(os.getenv("DB_POOL_MAX_LIFETIME", "3600"))
+
+    # Every connection to ":memory:" is a separate database, so the pool
+    # must hand out the same single connection to keep data visible, and
+    # never recycle it (a replacement would start out empty).
+    if engine == "sqlite" and sqlite_path == ":memory:":
+        max_size = 1
+        max_idle = max_lifetime = math.inf
+
+    return DBConfig(
+        engine=engine,
+        sqlite_path=sqlite_path,
+        conn_str=_mssql_conn_str() if engine == "mssql" else None,
+        pool_min_size=min(int(os.getenv("DB_POOL_MIN_SIZE", "1")), max_size),
+        pool_max_size=max_size,
+        pool_timeout=float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        pool_max_idle=max_idle,
+        pool_max_lifetime=max_lifetime,
+    )
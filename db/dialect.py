@@ -0,0 +1,97 @@
+"""SQL fragments that differ between the mssql and sqlite engines.
+
+Month filters are expressed as half-open ``[month_start, next_month_start)``
+ranges on the raw date column, so they stay sargable and can use the
+``(user_id, ..., transaction_date)`` indexes instead of running
+``FORMAT(transaction_date, 'yyyy-MM')`` on every row.
+"""
+
+from datetime import date, datetime
+
+
+def engine_name(engine=None):
+    """The configured DB engine, unless one is given explicitly."""
+    if engine is not None:
+        return engine
+    from db import get_config
+
+    return get_config().engine
+
+
+def month_bounds(month):
+    """Return ``(first_day, first_day_of_next_month)`` as dates.
+
+    ``month`` may be a ``'YYYY-MM'`` / ``'YYYY-MM-DD'`` string, a date or a
+    datetime.
+    """
+    if isinstance(month, str):
+        month = datetime.strptime(month[:7], "%Y-%m").date()
+    elif isinstance(month, datetime):
+        month = month.date()
+    start = date(month.year, month.month, 1)
+    if start.month == 12:
+        return start, date(start.year + 1, 1, 1)
+    return start, date(start.year, start.month + 1, 1)
+
+
+def next_month(column, engine=None):
+    """SQL expression for the first day of the month after a month-start column."""
+    if engine_name(engine) == "sqlite":
+        return f"date({column}, '+1 month')"
+    return f"DATEADD(month, 1, {column})"
+
+
+def in_month(date_column, month_column, engine=None):
+    """Predicate: ``date_column`` falls inside the month starting at ``month_column``."""
+    return (
+        f"{date_column} >= {month_column} "
+        f"AND {date_column} < {next_month(month_column, engine)}"
+    )
+
+
+def month_label(column, engine=None):
+    """SQL expression rendering a date column as ``'YYYY-MM'`` (for display only)."""
+    if engine_name(engine) == "sqlite":
+        return f"strftime('%Y-%m', {column})"
+    return f"CONVERT(char(7), {column}, 126)"
+
+
+def month_start(column, engine=None):
+    """SQL expression truncating a date column to the first day of its month."""
+    if engine_name(engine) == "sqlite":
+        return f"date({column}, 'start of month')"
+    return f"DATEFROMPARTS(YEAR({column}), MONTH({column}), 1)"
+
+
+def top(n, engine=None):
+    """``TOP n`` prefix for SELECT on mssql; pair it with ``limit(n)``."""
+    return "" if engine_name(engine) == "sqlite" else f"TOP {int(n)} "
+
+
+def limit(n, engine=None):
+    """``LIMIT n`` suffix on sqlite; pair it with ``top(n)``."""
+    return f"LIMIT {int(n)}" if engine_name(engine) == "sqlite" else ""
+
+
+def concat(*parts, engine=None):
+    """SQL string concatenation of expressions (NULLs become '' on mssql)."""
+    if engine_name(engine) == "sqlite":
+        return " || ".join(parts)
+    return f"CONCAT({', '.join(parts)})"
+
+
+def iso_date(column, engine=None):
+    """SQL expression rendering a date column as ``'YYYY-MM-DD'`` text."""
+    if engine_name(engine) == "sqlite":
+        return f"date({column})"
+    return f"CONVERT(char(10), {column}, 23)"
+
+
+def returning(column, engine=None):
+    """``(output, returning)`` clauses that hand back a column of inserted rows.
+
+    Put ``output`` after the INSERT column list and ``returning`` at the end.
+    """
+    if engine_name(engine) == "sqlite":
+        return "", f"RETURNING {column}"
+    return f"OUTPUT inserted.{column}", ""
@@ -0,0 +1,104 @@
+"""Per-engine connection factories.
+
+Routes are written against the pyodbc API: ``cursor.execute(sql, *params)``
+and attribute access on rows (``row.user_id``).  The sqlite engine wraps
+sqlite3 so the same route code runs unchanged against it.
+"""
+
+import sqlite3
+
+
+class SQLiteRow(sqlite3.Row):
+    """sqlite3.Row that also supports pyodbc-style ``row.column`` access."""
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except IndexError:
+            raise AttributeError(name) from None
+
+
+def _params(args):
+    # pyodbc accepts either execute(sql, a, b) or execute(sql, (a, b))
+    if len(args) == 1 and isinstance(args[0], (list, tuple)):
+        return tuple(args[0])
+    return args
+
+
+class SQLiteCursor:
+    """Adapts a sqlite3 cursor to the subset of the pyodbc cursor API we use."""
+
+    fast_executemany = False
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, sql, *params):
+        self._cursor.execute(sql, _params(params))
+        return self
+
+    def executemany(self, sql, seq_of_params):
+        self._cursor.executemany(sql, seq_of_params)
+        return self
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchmany(self, size=None):
+        if size is None:
+            return self._cursor.fetchmany()
+        return self._cursor.fetchmany(size)
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def nextset(self):
+        return False
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class SQLiteConnection:
+    def __init__(self, conn):
+        self._conn = conn
+
+    def cursor(self):
+        return SQLiteCursor(self._conn.cursor())
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+def connect_sqlite(config):
+    conn = sqlite3.connect(
+        config.sqlite_path,
+        detect_types=sqlite3.PARSE_DECLTYPES,
+        # Pooled connections are handed to whichever thread checks them out.
+        check_same_thread=False,
+    )
+    conn.row_factory = SQLiteRow
+    return SQLiteConnection(conn)
+
+
+def connect_mssql(config):
+    import pyodbc
+
+    return pyodbc.connect(config.conn_str)
+
+
+CONNECTORS = {
+    "sqlite": connect_sqlite,
+    "mssql": connect_mssql,
+}
+
+
+def connector_for(config):
+    try:
+        connect = CONNECTORS[config.engine]
+    except KeyError:
+        raise ValueError(f"Unsupported DB_ENGINE: {config.engine!r}") from None
+    return lambda: connect(config)
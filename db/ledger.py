@@ -0,0 +1,240 @@
+"""Append-only account balance ledger with per-account snapshots.
+
+Every balance change is an INSERT into ``account_ledger`` (a signed amount),
+made with the same cursor as the write it describes.  Nothing on the request
+path updates ``user_accounts``, so concurrent writes to one account no longer
+queue behind a row lock.
+
+A balance is the account's latest ``account_balance_snapshots`` row plus the
+entries posted after it.  ``checkpoint`` (run by the scheduler) writes a new
+snapshot once an account has ``SNAPSHOT_EVERY`` unsnapshotted entries, which
+keeps that delta scan short, and moves ``user_accounts.current_balance`` by
+the same amount.  ``current_balance`` therefore always equals the latest
+snapshot, and ``find_drift`` reports accounts where it does not.
+
+A snapshot must not skip an entry whose transaction is still open, so the
+two sides lock the ``user_accounts`` rows: on SQL Server writers hold a
+shared lock until they commit (writers to one account do not block each
+other) and ``checkpoint`` takes an exclusive one; on SQLite there is only
+one writer at a time and ``checkpoint`` takes the write lock first.
+
+Entries are stamped by the database (the ``created_at`` default), in UTC on
+both engines, so every entry and snapshot time is on the same clock.
+"""
+
+import os
+
+from db.dialect import engine_name, limit, top
+
+OPENING = "opening"
+TRANSACTION = "transaction"
+ADJUSTMENT = "adjustment"
+
+SNAPSHOT_EVERY = int(os.getenv("LEDGER_SNAPSHOT_EVERY", "50"))
+
+_LATEST_SNAPSHOT = """
+    LEFT JOIN account_balance_snapshots s
+        ON s.account_id = a.account_id
+        AND s.entry_id = (SELECT MAX(entry_id) FROM account_balance_snapshots
+                          WHERE account_id = a.account_id)
+"""
+
+
+def signed(transaction_type, amount):
+    """The ledger amount for a transaction: income adds, anything else subtracts."""
+    return amount if transaction_type == "income" else -amount
+
+
+def post(cursor, user_id, account_id, amount, entry_type=TRANSACTION, transaction_id=None):
+    """Append one entry; zero amounts and missing accounts are skipped."""
+    post_many(cursor, [(user_id, account_id, amount, entry_type, transaction_id)])
+
+
+def post_many(cursor, entries):
+    """Append ``(user_id, account_id, amount, entry_type, transaction_id)`` entries."""
+    params = [entry for entry in entries if entry[1] is not None and entry[2]]
+    if params:
+        if engine_name() == "mssql":
+            # Held until commit, so checkpoint() waits for these entries
+            account_ids = sorted({entry[1] for entry in params})
+            cursor.execute(
+                f"""
+                SELECT account_id FROM user_accounts WITH (HOLDLOCK, ROWLOCK)
+                WHERE account_id IN ({", ".join("?" * len(account_ids))})
+                """,
+                *account_ids,
+            )
+            cursor.fetchall()
+        cursor.executemany(
+            """
+            INSERT INTO account_ledger (user_id, account_id, amount, entry_type, transaction_id)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            params,
+        )
+
+
+def open_account(cursor, user_id, account_id, balance):
+    """Record a new account's starting balance, with a snapshot at that entry.
+
+    The INSERT into ``user_accounts`` is expected to have stored the same
+    ``balance`` as ``current_balance``.
+    """
+    if not balance:
+        return
+    post(cursor, user_id, account_id, balance, OPENING)
+    cursor.execute(
+        """
+        INSERT INTO account_balance_snapshots (account_id, entry_id, balance, posted_at)
+        SELECT account_id, entry_id, amount, created_at FROM account_ledger
+        WHERE account_id = ? AND entry_type = ?
+        """,
+        account_id, OPENING,
+    )
+
+
+def balances_sql(where="a.user_id = ?"):
+    """``SELECT account_id, user_id, balance`` for the accounts matching ``where``."""
+    return f"""
+        SELECT a.account_id, a.user_id,
+               COALESCE(s.balance, 0) + COALESCE((
+                   SELECT SUM(l.amount) FROM account_ledger l
+                   WHERE l.account_id = a.account_id AND l.entry_id > COALESCE(s.entry_id, 0)
+               ), 0) AS balance
+        FROM user_accounts a
+        {_LATEST_SNAPSHOT}
+        WHERE {where}
+    """
+
+
+def balances(cursor, user_id):
+    """``{account_id: balance}`` for every account of ``user_id``."""
+    cursor.execute(balances_sql(), user_id)
+    return {row.account_id: row.balance for row in cursor.fetchall()}
+
+
+def total_balance(cursor, user_id):
+    cursor.execute(f"SELECT SUM(b.balance) AS total FROM ({balances_sql()}) b", user_id)
+    return cursor.fetchone().total or 0
+
+
+def balance(cursor, account_id, as_of=None):
+    """An account's balance now, or as it stood at the datetime ``as_of``.
+
+    ``as_of`` is a naive UTC datetime, the clock the entries are stamped with.
+    """
+    if as_of is None:
+        cursor.execute(balances_sql("a.account_id = ?"), account_id)
+        row = cursor.fetchone()
+        return row.balance if row else 0
+
+    cursor.execute(
+        f"""
+        SELECT {top(1)}entry_id, balance FROM account_balance_snapshots
+        WHERE account_id = ? AND posted_at <= ?
+        ORDER BY entry_id DESC {limit(1)}
+        """,
+        account_id, as_of,
+    )
+    snapshot = cursor.fetchone()
+    base_entry, base = (snapshot.entry_id, snapshot.balance) if snapshot else (0, 0)
+    cursor.execute(
+        """
+        SELECT COALESCE(SUM(amount), 0) AS delta FROM account_ledger
+        WHERE account_id = ? AND entry_id > ? AND created_at <= ?
+        """,
+        account_id, base_entry, as_of,
+    )
+    return base + cursor.fetchone().delta
+
+
+def _lock_accounts(cursor, where, params):
+    # Waits for open transactions that posted to these accounts, and holds
+    # new ones off until the caller commits
+    if engine_name() == "sqlite":
+        if not cursor.connection.in_transaction:
+            cursor.execute("BEGIN IMMEDIATE")
+        return
+    cursor.execute(f"SELECT a.account_id FROM user_accounts a WITH (XLOCK, HOLDLOCK, ROWLOCK) {where}", *params)
+    cursor.fetchall()
+
+
+def checkpoint(cursor, min_entries=None, users=None):
+    """Snapshot accounts with at least ``min_entries`` new entries; returns how many.
+
+    ``users`` limits the run to an inclusive ``(first_user_id, last_user_id)``
+    range.  Each new snapshot's delta is also applied to
+    ``user_accounts.current_balance``.  The accounts stay locked against
+    ledger writes until the caller commits.
+    """
+    min_entries = SNAPSHOT_EVERY if min_entries is None else max(min_entries, 1)
+    where, params = ("WHERE a.user_id BETWEEN ? AND ?", list(users)) if users else ("", [])
+    _lock_accounts(cursor, where, params)
+    cursor.execute(
+        f"""
+        SELECT a.account_id, COALESCE(s.balance, 0) + SUM(l.amount) AS balance,
+               SUM(l.amount) AS delta, MAX(l.entry_id) AS entry_id, MAX(l.created_at) AS posted_at
+        FROM user_accounts a
+        {_LATEST_SNAPSHOT}
+        JOIN account_ledger l
+            ON l.account_id = a.account_id AND l.entry_id > COALESCE(s.entry_id, 0)
+        {where}
+        GROUP BY a.account_id, s.balance
+        HAVING COUNT(*) >= ?
+        """,
+        *params, min_entries,
+    )
+    rows = cursor.fetchall()
+    if rows:
+        cursor.executemany(
+            "INSERT INTO account_balance_snapshots (account_id, entry_id, balance, posted_at) VALUES (?, ?, ?, ?)",
+            [(row.account_id, row.entry_id, row.balance, row.posted_at) for row in rows],
+        )
+        cursor.executemany(
+            "UPDATE user_accounts SET current_balance = current_balance + ? WHERE account_id = ?",
+            [(row.delta, row.account_id) for row in rows if row.delta],
+        )
+    return len(rows)
+
+
+def _recomputed_sql(where):
+    # Each account's full ledger sum up to its latest snapshot
+    return f"""
+        SELECT a.account_id, a.user_id, a.current_balance, COALESCE(s.entry_id, 0) AS entry_id,
+               COALESCE((SELECT SUM(l.amount) FROM account_ledger l
+                         WHERE l.account_id = a.account_id
+                           AND l.entry_id <= COALESCE(s.entry_id, 0)), 0) AS expected
+        FROM user_accounts a
+        {_LATEST_SNAPSHOT}
+        {where}
+    """
+
+
+def find_drift(cursor, user_id=None):
+    """Accounts whose ``current_balance`` disagrees with the ledger.
+
+    ``current_balance`` is compared with the sum of every entry up to the
+    latest snapshot, so a wrong snapshot shows up as well as a balance
+    changed outside the ledger.  Returns ``(account_id, stored, expected)``.
+    """
+    where, params = ("WHERE a.user_id = ?", [user_id]) if user_id is not None else ("", [])
+    cursor.execute(_recomputed_sql(where), *params)
+    drift = []
+    for row in cursor.fetchall():
+        stored, expected = round(float(row.current_balance), 2), round(float(row.expected), 2)
+        if stored != expected:
+            drift.append((row.account_id, stored, expected))
+    return drift
+
+
+def rebuild(cursor, user_id=None):
+    """Recompute snapshots from the ledger and reset ``current_balance`` to match.
+
+    Each account ends up with a single snapshot at its newest entry.
+    """
+    where, params = ("WHERE user_id = ?", [user_id]) if user_id is not None else ("", [])
+    account_filter = "WHERE account_id IN (SELECT account_id FROM user_accounts WHERE user_id = ?)" if params else ""
+    cursor.execute(f"DELETE FROM account_balance_snapshots {account_filter}", *params)
+    cursor.execute(f"UPDATE user_accounts SET current_balance = 0 {where}", *params)
+    users = (user_id, user_id) if user_id is not None else None
+    checkpoint(cursor, min_entries=1, users=users)
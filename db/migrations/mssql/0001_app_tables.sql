@@ -0,0 +1,50 @@
+-- Tables and columns used by my_app.py that the starter schema never created.
+
+IF COL_LENGTH('users', 'currency') IS NULL
+    ALTER TABLE users ADD currency NVARCHAR(10) NOT NULL DEFAULT 'CAD';
+IF COL_LENGTH('users', 'created_at') IS NULL
+    ALTER TABLE users ADD created_at DATETIME NOT NULL DEFAULT GETDATE();
+IF COL_LENGTH('user_accounts', 'currency') IS NULL
+    ALTER TABLE user_accounts ADD currency NVARCHAR(10) NOT NULL DEFAULT 'CAD';
+IF COL_LENGTH('user_accounts', 'is_active') IS NULL
+    ALTER TABLE user_accounts ADD is_active BIT NOT NULL DEFAULT 1;
+
+IF OBJECT_ID(N'[dbo].[bill_reminders]', N'U') IS NULL
+    CREATE TABLE bill_reminders (
+        bill_id INT IDENTITY(1,1) PRIMARY KEY,
+        user_id INT NOT NULL,
+        bill_name NVARCHAR(255) NOT NULL,
+        amount DECIMAL(18,2) NOT NULL,
+        due_date DATE NOT NULL,
+        status NVARCHAR(20) NOT NULL DEFAULT 'pending'
+    );
+
+IF OBJECT_ID(N'[dbo].[notifications]', N'U') IS NULL
+    CREATE TABLE notifications (
+        notification_id INT IDENTITY(1,1) PRIMARY KEY,
+        user_id INT NOT NULL,
+        notification_type NVARCHAR(50) NOT NULL,
+        message NVARCHAR(1024) NOT NULL,
+        related_entity_type NVARCHAR(50) NULL,
+        related_entity_id INT NULL,
+        is_read BIT NOT NULL DEFAULT 0,
+        created_at DATETIME NOT NULL DEFAULT GETDATE()
+    );
+
+IF OBJECT_ID(N'[dbo].[debts]', N'U') IS NULL
+    CREATE TABLE debts (
+        debt_id INT IDENTITY(1,1) PRIMARY KEY,
+        user_id INT NOT NULL,
+        lender_name NVARCHAR(255) NOT NULL,
+        total_amount DECIMAL(18,2) NOT NULL,
+        paid_amount DECIMAL(18,2) NOT NULL DEFAULT 0,
+        interest_rate DECIMAL(5,2) NULL,
+        due_date DATE NULL
+    );
+
+IF OBJECT_ID(N'[dbo].[user_sessions]', N'U') IS NULL
+    CREATE TABLE user_sessions (
+        session_id INT IDENTITY(1,1) PRIMARY KEY,
+        user_id INT NOT NULL,
+        created_at DATETIME NOT NULL DEFAULT GETDATE()
+    );
@@ -0,0 +1,75 @@
+-- Covering indexes for the per-user access paths in my_app.py.
+-- Every hot query filters on user_id first, then on date, category or type.
+
+-- transactions(), export, analysis: newest-first history for one user
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_transactions_user_date')
+    CREATE NONCLUSTERED INDEX IX_transactions_user_date
+        ON transactions (user_id, transaction_date DESC, transaction_id DESC)
+        INCLUDE (amount, transaction_type, category_id, account_id, description, receipt_url);
+
+-- dashboard()/analysis(): monthly income and expense totals
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_transactions_user_type_date')
+    CREATE NONCLUSTERED INDEX IX_transactions_user_type_date
+        ON transactions (user_id, transaction_type, transaction_date)
+        INCLUDE (amount, category_id);
+
+-- budgets(), budget_trends(), add_transaction budget check: spend per category/month
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_transactions_user_category_date')
+    CREATE NONCLUSTERED INDEX IX_transactions_user_category_date
+        ON transactions (user_id, category_id, transaction_type, transaction_date)
+        INCLUDE (amount);
+
+-- delete_linked_account(): "does this account have transactions?"
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_transactions_account')
+    CREATE NONCLUSTERED INDEX IX_transactions_account
+        ON transactions (account_id, user_id);
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_budgets_user_category_month')
+    CREATE NONCLUSTERED INDEX IX_budgets_user_category_month
+        ON budgets (user_id, category_id, budget_month)
+        INCLUDE (budget_amount, alert_threshold);
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_budgets_user_month')
+    CREATE NONCLUSTERED INDEX IX_budgets_user_month
+        ON budgets (user_id, budget_month DESC)
+        INCLUDE (category_id, budget_amount, alert_threshold);
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_recurring_user_active')
+    CREATE NONCLUSTERED INDEX IX_recurring_user_active
+        ON recurring_transactions (user_id, is_active, start_date)
+        INCLUDE (category_id, account_id, amount, transaction_type, frequency,
+                 end_date, last_generated_date);
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_bill_reminders_user_status_due')
+    CREATE NONCLUSTERED INDEX IX_bill_reminders_user_status_due
+        ON bill_reminders (user_id, status, due_date)
+        INCLUDE (bill_name, amount);
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_notifications_user_created')
+    CREATE NONCLUSTERED INDEX IX_notifications_user_created
+        ON notifications (user_id, created_at DESC)
+        INCLUDE (notification_type, is_read);
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_savings_goals_user')
+    CREATE NONCLUSTERED INDEX IX_savings_goals_user
+        ON savings_goals (user_id, target_date)
+        INCLUDE (goal_name, target_amount, current_amount);
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_savings_history_goal')
+    CREATE NONCLUSTERED INDEX IX_savings_history_goal
+        ON savings_history (goal_id, contribution_date DESC)
+        INCLUDE (amount);
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_user_accounts_user')
+    CREATE NONCLUSTERED INDEX IX_user_accounts_user
+        ON user_accounts (user_id)
+        INCLUDE (account_name, account_type, current_balance);
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_categories_user')
+    CREATE NONCLUSTERED INDEX IX_categories_user
+        ON categories (user_id)
+        INCLUDE (category_name, category_type);
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_debts_user_due')
+    CREATE NONCLUSTERED INDEX IX_debts_user_due
+        ON debts (user_id, due_date);
@@ -0,0 +1,31 @@
+-- Per (user, category, month, type) spend totals, kept current by the
+-- transaction write routes (see db/aggregates.py). category_id 0 stands in
+-- for uncategorised transactions so it can be part of the key.
+
+IF OBJECT_ID(N'[dbo].[monthly_category_totals]', N'U') IS NULL
+BEGIN
+    CREATE TABLE monthly_category_totals (
+        user_id INT NOT NULL,
+        category_id INT NOT NULL,
+        month DATE NOT NULL,
+        transaction_type NVARCHAR(20) NOT NULL,
+        total_amount DECIMAL(18,2) NOT NULL DEFAULT 0,
+        txn_count INT NOT NULL DEFAULT 0,
+        CONSTRAINT PK_monthly_category_totals
+            PRIMARY KEY (user_id, category_id, month, transaction_type)
+    );
+
+    INSERT INTO monthly_category_totals (user_id, category_id, month, transaction_type, total_amount, txn_count)
+    SELECT user_id, COALESCE(category_id, 0),
+           DATEFROMPARTS(YEAR(transaction_date), MONTH(transaction_date), 1),
+           transaction_type, SUM(amount), COUNT(*)
+    FROM transactions
+    GROUP BY user_id, COALESCE(category_id, 0),
+             DATEFROMPARTS(YEAR(transaction_date), MONTH(transaction_date), 1),
+             transaction_type;
+END
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_monthly_category_totals_user_month')
+    CREATE NONCLUSTERED INDEX IX_monthly_category_totals_user_month
+        ON monthly_category_totals (user_id, month, transaction_type)
+        INCLUDE (category_id, total_amount);
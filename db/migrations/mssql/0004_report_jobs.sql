@@ -0,0 +1,22 @@
+-- Queue for PDF reports rendered by the background workers in reports.py.
+
+IF OBJECT_ID(N'[dbo].[report_jobs]', N'U') IS NULL
+    CREATE TABLE report_jobs (
+        job_id INT IDENTITY(1,1) PRIMARY KEY,
+        user_id INT NOT NULL,
+        fingerprint CHAR(64) NOT NULL,
+        filters NVARCHAR(1024) NOT NULL,
+        status NVARCHAR(20) NOT NULL DEFAULT 'queued',
+        file_path NVARCHAR(1024) NULL,
+        error NVARCHAR(1024) NULL,
+        created_at DATETIME NOT NULL DEFAULT GETDATE(),
+        started_at DATETIME NULL,
+        finished_at DATETIME NULL
+    );
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_report_jobs_status')
+    CREATE NONCLUSTERED INDEX IX_report_jobs_status ON report_jobs (status, job_id);
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_report_jobs_user_fingerprint')
+    CREATE NONCLUSTERED INDEX IX_report_jobs_user_fingerprint
+        ON report_jobs (user_id, fingerprint) INCLUDE (status, file_path);
@@ -0,0 +1,11 @@
+-- Link generated transactions to their recurring rule. The unique index makes
+-- each (rule, occurrence date) insert at most once, so catch-up runs that
+-- overlap or repeat cannot double-post (see db/recurrence.py).
+
+IF COL_LENGTH('transactions', 'recurring_id') IS NULL
+    ALTER TABLE transactions ADD recurring_id INT NULL;
+
+-- Dynamic SQL so the batch compiles before the new column exists
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'UX_transactions_recurring_occurrence')
+    EXEC(N'CREATE UNIQUE NONCLUSTERED INDEX UX_transactions_recurring_occurrence
+           ON transactions (recurring_id, transaction_date) WHERE recurring_id IS NOT NULL');
@@ -0,0 +1,15 @@
+-- Progress of scheduler.py runs, one row per shard. Each batch of users is
+-- committed together with its checkpoint, so a crashed run resumes after
+-- the last finished batch.
+
+IF OBJECT_ID(N'[dbo].[scheduler_checkpoints]', N'U') IS NULL
+    CREATE TABLE scheduler_checkpoints (
+        shard NVARCHAR(20) NOT NULL PRIMARY KEY,
+        run_date DATE NOT NULL,
+        first_user_id INT NOT NULL,
+        last_user_id INT NOT NULL,
+        next_user_id INT NOT NULL,
+        started_at DATETIME NOT NULL DEFAULT GETDATE(),
+        updated_at DATETIME NULL,
+        finished_at DATETIME NULL
+    );
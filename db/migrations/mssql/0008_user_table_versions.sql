@@ -0,0 +1,10 @@
+-- Version counters per (user, table), bumped by every write path in the same
+-- transaction as the write (see db/versions.py). /api/v1 builds ETags from them.
+
+IF OBJECT_ID(N'[dbo].[user_table_versions]', N'U') IS NULL
+    CREATE TABLE user_table_versions (
+        user_id INT NOT NULL,
+        table_name NVARCHAR(64) NOT NULL,
+        version BIGINT NOT NULL DEFAULT 0,
+        CONSTRAINT PK_user_table_versions PRIMARY KEY (user_id, table_name)
+    );
@@ -0,0 +1,42 @@
+-- Append-only balance ledger (see db/ledger.py). Write paths insert signed
+-- entries; balances are the latest per-account snapshot plus the entries
+-- posted after it. Every existing balance becomes an opening entry with a
+-- snapshot at that entry, so user_accounts.current_balance keeps matching
+-- the latest snapshot.
+
+IF OBJECT_ID(N'[dbo].[account_ledger]', N'U') IS NULL
+    CREATE TABLE account_ledger (
+        entry_id BIGINT IDENTITY(1,1) PRIMARY KEY,
+        account_id INT NOT NULL,
+        user_id INT NOT NULL,
+        amount DECIMAL(18,2) NOT NULL,
+        entry_type NVARCHAR(20) NOT NULL,
+        transaction_id INT NULL,
+        created_at DATETIME NOT NULL DEFAULT GETDATE()
+    );
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_account_ledger_account_entry')
+    CREATE NONCLUSTERED INDEX IX_account_ledger_account_entry
+        ON account_ledger (account_id, entry_id)
+        INCLUDE (amount, created_at);
+
+IF OBJECT_ID(N'[dbo].[account_balance_snapshots]', N'U') IS NULL
+    CREATE TABLE account_balance_snapshots (
+        account_id INT NOT NULL,
+        entry_id BIGINT NOT NULL,
+        balance DECIMAL(18,2) NOT NULL,
+        posted_at DATETIME NOT NULL,
+        CONSTRAINT PK_account_balance_snapshots PRIMARY KEY (account_id, entry_id)
+    );
+
+INSERT INTO account_ledger (account_id, user_id, amount, entry_type)
+SELECT a.account_id, a.user_id, a.current_balance, 'opening'
+FROM user_accounts a
+WHERE a.current_balance <> 0
+  AND NOT EXISTS (SELECT 1 FROM account_ledger l WHERE l.account_id = a.account_id);
+
+INSERT INTO account_balance_snapshots (account_id, entry_id, balance, posted_at)
+SELECT l.account_id, l.entry_id, l.amount, l.created_at
+FROM account_ledger l
+WHERE l.entry_type = 'opening'
+  AND NOT EXISTS (SELECT 1 FROM account_balance_snapshots s WHERE s.account_id = l.account_id);
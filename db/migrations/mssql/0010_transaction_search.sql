@@ -0,0 +1,20 @@
+-- migrate: no-transaction
+-- Full-text index over transaction descriptions (see db/search.py). SQL
+-- Server keeps it in step with writes itself (CHANGE_TRACKING AUTO).
+-- Full-text DDL cannot run inside a user transaction, hence the marker above.
+-- Skipped when the Full-Text Search feature is not installed (the stock
+-- mssql/server container image); searches then fall back to LIKE.
+
+IF FULLTEXTSERVICEPROPERTY('IsFullTextInstalled') = 1
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'UX_transactions_transaction_id')
+        CREATE UNIQUE NONCLUSTERED INDEX UX_transactions_transaction_id ON transactions (transaction_id);
+
+    IF NOT EXISTS (SELECT 1 FROM sys.fulltext_catalogs WHERE name = 'ft_expense_tracker')
+        EXEC('CREATE FULLTEXT CATALOG ft_expense_tracker');
+
+    IF NOT EXISTS (SELECT 1 FROM sys.fulltext_indexes WHERE object_id = OBJECT_ID(N'[dbo].[transactions]'))
+        EXEC('CREATE FULLTEXT INDEX ON transactions (description)
+              KEY INDEX UX_transactions_transaction_id ON ft_expense_tracker
+              WITH CHANGE_TRACKING AUTO');
+END;
@@ -0,0 +1,13 @@
+-- Server-side sessions for SESSION_BACKEND=db (see sessions.py and
+-- db/session_store.py). expires_at is a Unix timestamp; expired rows are
+-- deleted in batches by the app and the scheduler.
+
+IF OBJECT_ID(N'[dbo].[app_sessions]', N'U') IS NULL
+    CREATE TABLE app_sessions (
+        session_id VARCHAR(64) NOT NULL PRIMARY KEY,
+        data NVARCHAR(MAX) NOT NULL,
+        expires_at BIGINT NOT NULL
+    );
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_app_sessions_expires_at')
+    CREATE NONCLUSTERED INDEX IX_app_sessions_expires_at ON app_sessions (expires_at);
@@ -0,0 +1,7 @@
+-- A counter on each monthly_category_totals row that every write to the row
+-- advances, even one that leaves the totals unchanged (a new description,
+-- another day in the same month). The columnar month store hashes it into
+-- its snapshot names, so such edits reach every node (see columnar.py).
+
+IF COL_LENGTH('monthly_category_totals', 'revision') IS NULL
+    ALTER TABLE monthly_category_totals ADD revision INT NOT NULL DEFAULT 0;
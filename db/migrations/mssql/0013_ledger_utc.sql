@@ -0,0 +1,20 @@
+-- Ledger entries are stamped in UTC (see db/ledger.py), as SQLite's
+-- CURRENT_TIMESTAMP already does. Switch the created_at default from
+-- GETDATE() to GETUTCDATE() and move the entries and snapshots stamped with
+-- the server's local time onto UTC.
+
+DECLARE @default sysname = (
+    SELECT dc.name FROM sys.default_constraints dc
+    JOIN sys.columns c ON c.object_id = dc.parent_object_id AND c.column_id = dc.parent_column_id
+    WHERE dc.parent_object_id = OBJECT_ID(N'[dbo].[account_ledger]') AND c.name = 'created_at'
+      AND dc.definition = '(getdate())'
+);
+
+IF @default IS NOT NULL
+BEGIN
+    DECLARE @offset INT = DATEDIFF(minute, GETDATE(), GETUTCDATE());
+    EXEC (N'ALTER TABLE account_ledger DROP CONSTRAINT ' + @default);
+    ALTER TABLE account_ledger ADD CONSTRAINT DF_account_ledger_created_at DEFAULT GETUTCDATE() FOR created_at;
+    UPDATE account_ledger SET created_at = DATEADD(minute, @offset, created_at);
+    UPDATE account_balance_snapshots SET posted_at = DATEADD(minute, @offset, posted_at);
+END
@@ -0,0 +1,42 @@
+-- Tables and columns used by my_app.py that the starter schema never created.
+
+ALTER TABLE users ADD COLUMN currency TEXT NOT NULL DEFAULT 'CAD';
+ALTER TABLE users ADD COLUMN created_at TIMESTAMP NULL;
+ALTER TABLE user_accounts ADD COLUMN currency TEXT NOT NULL DEFAULT 'CAD';
+ALTER TABLE user_accounts ADD COLUMN is_active INTEGER NOT NULL DEFAULT 1;
+
+CREATE TABLE IF NOT EXISTS bill_reminders (
+    bill_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    bill_name TEXT NOT NULL,
+    amount REAL NOT NULL,
+    due_date DATE NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending'
+);
+
+CREATE TABLE IF NOT EXISTS notifications (
+    notification_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    notification_type TEXT NOT NULL,
+    message TEXT NOT NULL,
+    related_entity_type TEXT NULL,
+    related_entity_id INTEGER NULL,
+    is_read INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS debts (
+    debt_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    lender_name TEXT NOT NULL,
+    total_amount REAL NOT NULL,
+    paid_amount REAL NOT NULL DEFAULT 0,
+    interest_rate REAL NULL,
+    due_date DATE NULL
+);
+
+CREATE TABLE IF NOT EXISTS user_sessions (
+    session_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,49 @@
+-- Covering indexes for the per-user access paths in my_app.py.
+-- SQLite has no INCLUDE clause, so where an index covers a query its
+-- projected columns are trailing key columns.
+
+-- History pages read most of the row (description, receipt_url, ...), so this
+-- one only orders it: rows are fetched by rowid from the table.
+CREATE INDEX IF NOT EXISTS ix_transactions_user_date
+    ON transactions (user_id, transaction_date DESC, transaction_id DESC);
+
+CREATE INDEX IF NOT EXISTS ix_transactions_user_type_date
+    ON transactions (user_id, transaction_type, transaction_date, amount, category_id);
+
+CREATE INDEX IF NOT EXISTS ix_transactions_user_category_date
+    ON transactions (user_id, category_id, transaction_type, transaction_date, amount);
+
+CREATE INDEX IF NOT EXISTS ix_transactions_account
+    ON transactions (account_id, user_id);
+
+CREATE INDEX IF NOT EXISTS ix_budgets_user_category_month
+    ON budgets (user_id, category_id, budget_month, budget_amount, alert_threshold);
+
+CREATE INDEX IF NOT EXISTS ix_budgets_user_month
+    ON budgets (user_id, budget_month DESC);
+
+CREATE INDEX IF NOT EXISTS ix_recurring_user_active
+    ON recurring_transactions (user_id, is_active, start_date);
+
+CREATE INDEX IF NOT EXISTS ix_bill_reminders_user_status_due
+    ON bill_reminders (user_id, status, due_date);
+
+CREATE INDEX IF NOT EXISTS ix_notifications_user_created
+    ON notifications (user_id, created_at DESC);
+
+CREATE INDEX IF NOT EXISTS ix_savings_goals_user
+    ON savings_goals (user_id, target_date);
+
+CREATE INDEX IF NOT EXISTS ix_savings_history_goal
+    ON savings_history (goal_id, contribution_date DESC);
+
+CREATE INDEX IF NOT EXISTS ix_user_accounts_user
+    ON user_accounts (user_id, account_name, current_balance);
+
+CREATE INDEX IF NOT EXISTS ix_categories_user
+    ON categories (user_id, category_name, category_type);
+
+CREATE INDEX IF NOT EXISTS ix_debts_user_due
+    ON debts (user_id, due_date);
+
+ANALYZE;
@@ -0,0 +1,22 @@
+-- Per (user, category, month, type) spend totals, kept current by the
+-- transaction write routes (see db/aggregates.py). category_id 0 stands in
+-- for uncategorised transactions so it can be part of the key.
+
+CREATE TABLE IF NOT EXISTS monthly_category_totals (
+    user_id INTEGER NOT NULL,
+    category_id INTEGER NOT NULL,
+    month DATE NOT NULL,
+    transaction_type TEXT NOT NULL,
+    total_amount REAL NOT NULL DEFAULT 0,
+    txn_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, category_id, month, transaction_type)
+);
+
+INSERT INTO monthly_category_totals (user_id, category_id, month, transaction_type, total_amount, txn_count)
+SELECT user_id, COALESCE(category_id, 0), date(transaction_date, 'start of month'),
+       transaction_type, SUM(amount), COUNT(*)
+FROM transactions
+GROUP BY user_id, COALESCE(category_id, 0), date(transaction_date, 'start of month'), transaction_type;
+
+CREATE INDEX IF NOT EXISTS ix_monthly_category_totals_user_month
+    ON monthly_category_totals (user_id, month, transaction_type, category_id, total_amount);
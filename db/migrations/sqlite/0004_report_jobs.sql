@@ -0,0 +1,18 @@
+-- Queue for PDF reports rendered by the background workers in reports.py.
+
+CREATE TABLE IF NOT EXISTS report_jobs (
+    job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    fingerprint TEXT NOT NULL,
+    filters TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    file_path TEXT NULL,
+    error TEXT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP NULL,
+    finished_at TIMESTAMP NULL
+);
+
+CREATE INDEX IF NOT EXISTS ix_report_jobs_status ON report_jobs (status, job_id);
+
+CREATE INDEX IF NOT EXISTS ix_report_jobs_user_fingerprint ON report_jobs (user_id, fingerprint, status);
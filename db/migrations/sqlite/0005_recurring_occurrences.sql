@@ -0,0 +1,8 @@
+-- Link generated transactions to their recurring rule. The unique index makes
+-- each (rule, occurrence date) insert at most once, so catch-up runs that
+-- overlap or repeat cannot double-post (see db/recurrence.py).
+
+ALTER TABLE transactions ADD COLUMN recurring_id INTEGER NULL;
+
+CREATE UNIQUE INDEX IF NOT EXISTS ux_transactions_recurring_occurrence
+    ON transactions (recurring_id, transaction_date) WHERE recurring_id IS NOT NULL;
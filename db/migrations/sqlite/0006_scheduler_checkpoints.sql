@@ -0,0 +1,14 @@
+-- Progress of scheduler.py runs, one row per shard. Each batch of users is
+-- committed together with its checkpoint, so a crashed run resumes after
+-- the last finished batch.
+
+CREATE TABLE IF NOT EXISTS scheduler_checkpoints (
+    shard TEXT PRIMARY KEY,
+    run_date DATE NOT NULL,
+    first_user_id INTEGER NOT NULL,
+    last_user_id INTEGER NOT NULL,
+    next_user_id INTEGER NOT NULL,
+    started_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP NULL,
+    finished_at TIMESTAMP NULL
+);
@@ -0,0 +1,19 @@
+-- At most one notification per related entity, so reminder inserts can use a
+-- single INSERT ... SELECT ... WHERE NOT EXISTS (see db/reminders.py).
+-- Duplicates left by the old check-then-insert loop keep their oldest row.
+
+DELETE FROM notifications
+WHERE related_entity_id IS NOT NULL
+  AND notification_id NOT IN (
+      SELECT MIN(notification_id) FROM notifications
+      WHERE related_entity_id IS NOT NULL
+      GROUP BY user_id, related_entity_type, related_entity_id
+  );
+
+CREATE UNIQUE INDEX IF NOT EXISTS ux_notifications_user_entity
+    ON notifications (user_id, related_entity_type, related_entity_id)
+    WHERE related_entity_id IS NOT NULL;
+
+-- Reminder runs across many users scan by due date, not by user
+CREATE INDEX IF NOT EXISTS ix_bill_reminders_status_due
+    ON bill_reminders (status, due_date, user_id);
@@ -0,0 +1,9 @@
+-- Version counters per (user, table), bumped by every write path in the same
+-- transaction as the write (see db/versions.py). /api/v1 builds ETags from them.
+
+CREATE TABLE IF NOT EXISTS user_table_versions (
+    user_id INTEGER NOT NULL,
+    table_name TEXT NOT NULL,
+    version INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, table_name)
+);
@@ -0,0 +1,38 @@
+-- Append-only balance ledger (see db/ledger.py). Write paths insert signed
+-- entries; balances are the latest per-account snapshot plus the entries
+-- posted after it. Every existing balance becomes an opening entry with a
+-- snapshot at that entry, so user_accounts.current_balance keeps matching
+-- the latest snapshot.
+
+CREATE TABLE IF NOT EXISTS account_ledger (
+    entry_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    account_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    amount REAL NOT NULL,
+    entry_type TEXT NOT NULL,
+    transaction_id INTEGER NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS ix_account_ledger_account_entry
+    ON account_ledger (account_id, entry_id, amount, created_at);
+
+CREATE TABLE IF NOT EXISTS account_balance_snapshots (
+    account_id INTEGER NOT NULL,
+    entry_id INTEGER NOT NULL,
+    balance REAL NOT NULL,
+    posted_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (account_id, entry_id)
+);
+
+INSERT INTO account_ledger (account_id, user_id, amount, entry_type)
+SELECT a.account_id, a.user_id, a.current_balance, 'opening'
+FROM user_accounts a
+WHERE a.current_balance <> 0
+  AND NOT EXISTS (SELECT 1 FROM account_ledger l WHERE l.account_id = a.account_id);
+
+INSERT INTO account_balance_snapshots (account_id, entry_id, balance, posted_at)
+SELECT l.account_id, l.entry_id, l.amount, l.created_at
+FROM account_ledger l
+WHERE l.entry_type = 'opening'
+  AND NOT EXISTS (SELECT 1 FROM account_balance_snapshots s WHERE s.account_id = l.account_id);
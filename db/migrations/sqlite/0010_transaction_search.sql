@@ -0,0 +1,15 @@
+-- Full-text index over transaction descriptions (see db/search.py). The FTS5
+-- table is external-content over a view that adds an "owner" token
+-- (u<user_id>), so a search only walks the posting lists of one user. The
+-- transaction write paths add and remove index rows in the same DB
+-- transaction as the write (FTS5 triggers made bulk imports ~6x slower).
+
+CREATE VIEW IF NOT EXISTS transactions_search_content AS
+SELECT transaction_id, description, 'u' || user_id AS owner FROM transactions;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS transactions_fts USING fts5(
+    description, owner,
+    content='transactions_search_content', content_rowid='transaction_id'
+);
+
+INSERT INTO transactions_fts (transactions_fts) VALUES ('rebuild');
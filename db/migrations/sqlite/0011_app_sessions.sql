@@ -0,0 +1,11 @@
+-- Server-side sessions for SESSION_BACKEND=db (see sessions.py and
+-- db/session_store.py). expires_at is a Unix timestamp; expired rows are
+-- deleted in batches by the app and the scheduler.
+
+CREATE TABLE IF NOT EXISTS app_sessions (
+    session_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    expires_at INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS ix_app_sessions_expires_at ON app_sessions (expires_at);
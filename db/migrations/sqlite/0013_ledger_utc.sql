@@ -0,0 +1,2 @@
+-- Ledger entries are stamped in UTC (see db/ledger.py). SQLite's
+-- CURRENT_TIMESTAMP default already is, so only SQL Server's changes.
@@ -0,0 +1,261 @@
+"""A small thread-safe connection pool.
+
+Connections are created up to ``max_size``, health-checked on checkout and
+recycled once they have been idle for ``max_idle`` seconds or alive for
+``max_lifetime`` seconds.  Wait and hold times are tracked in PoolMetrics.
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from db import tracing
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection becomes available within the pool timeout."""
+
+
+class PoolMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.created = 0
+        self.recycled = 0
+        self.failed_health_checks = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        self.checkout_time_total = 0.0
+        self.checkout_time_max = 0.0
+
+    def record_checkout(self, waited):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_time_total += waited
+            self.wait_time_max = max(self.wait_time_max, waited)
+
+    def record_release(self, held):
+        with self._lock:
+            self.checkout_time_total += held
+            self.checkout_time_max = max(self.checkout_time_max, held)
+
+    def incr(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def snapshot(self):
+        with self._lock:
+            checkouts = self.checkouts or 1
+            return {
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "timeouts": self.timeouts,
+                "created": self.created,
+                "recycled": self.recycled,
+                "failed_health_checks": self.failed_health_checks,
+                "wait_ms_avg": self.wait_time_total / checkouts * 1000,
+                "wait_ms_max": self.wait_time_max * 1000,
+                "checkout_ms_avg": self.checkout_time_total / checkouts * 1000,
+                "checkout_ms_max": self.checkout_time_max * 1000,
+            }
+
+
+class _Entry:
+    __slots__ = ("conn", "created_at", "last_used", "checked_out_at")
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.created_at = self.last_used = time.monotonic()
+        self.checked_out_at = None
+
+
+class PooledConnection:
+    """Proxy returned to callers; ``close()`` hands the connection back."""
+
+    def __init__(self, pool, entry):
+        self._pool = pool
+        self._entry = entry
+
+    def close(self):
+        if self._entry is not None:
+            entry, self._entry = self._entry, None
+            self._pool.release(entry)
+
+    def cursor(self):
+        # Timed into the request's SQL trace, if one is running
+        return tracing.wrap(self.__getattr__("cursor")())
+
+    def __getattr__(self, name):
+        if self._entry is None:
+            raise RuntimeError("connection has been returned to the pool")
+        return getattr(self._entry.conn, name)
+
+
+class ConnectionPool:
+    def __init__(
+        self,
+        connect,
+        min_size=1,
+        max_size=10,
+        timeout=30.0,
+        max_idle=300.0,
+        max_lifetime=3600.0,
+        ping_sql="SELECT 1",
+    ):
+        if max_size < 1 or min_size > max_size:
+            raise ValueError("pool requires 0 <= min_size <= max_size and max_size >= 1")
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.ping_sql = ping_sql
+        self.metrics = PoolMetrics()
+
+        self._idle = deque()
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def warm(self):
+        """Open connections until ``min_size`` are idle in the pool."""
+        while True:
+            with self._cond:
+                if self._closed or self._size >= self.min_size:
+                    return
+                self._size += 1
+            entry = self._create_reserved()
+            with self._cond:
+                self._idle.append(entry)
+                self._cond.notify()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle, self._idle = list(self._idle), deque()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for entry in idle:
+            self._close_quietly(entry.conn)
+
+    def acquire(self):
+        start = time.monotonic()
+        deadline = start + self.timeout
+        while True:
+            entry = self._take(deadline)
+            if entry is None:
+                entry = self._create_reserved()
+            elif not self._usable(entry):
+                self._discard(entry)
+                continue
+            now = time.monotonic()
+            entry.checked_out_at = now
+            self.metrics.record_checkout(now - start)
+            return entry
+
+    def release(self, entry):
+        now = time.monotonic()
+        if entry.checked_out_at is not None:
+            self.metrics.record_release(now - entry.checked_out_at)
+            entry.checked_out_at = None
+
+        try:
+            # Never hand the next caller an open transaction.
+            entry.conn.rollback()
+        except Exception:
+            self._discard(entry)
+            return
+
+        with self._cond:
+            if self._closed:
+                self._size -= 1
+                closing = True
+            else:
+                entry.last_used = now
+                self._idle.append(entry)
+                self._cond.notify()
+                closing = False
+        if closing:
+            self._close_quietly(entry.conn)
+
+    @contextmanager
+    def connection(self):
+        conn = PooledConnection(self, self.acquire())
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def stats(self):
+        with self._cond:
+            state = {"size": self._size, "idle": len(self._idle), "max_size": self.max_size}
+        state.update(self.metrics.snapshot())
+        return state
+
+    def _take(self, deadline):
+        """Pop an idle entry, or reserve a slot for a new one (returns None)."""
+        with self._cond:
+            waited = False
+            while True:
+                if self._closed:
+                    raise RuntimeError("connection pool is closed")
+                if self._idle:
+                    # LIFO keeps a hot working set and lets the rest go idle.
+                    return self._idle.pop()
+                if self._size < self.max_size:
+                    self._size += 1
+                    return None
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.metrics.incr("timeouts")
+                    raise PoolTimeout(f"no connection available after {self.timeout:.1f}s")
+                if not waited:
+                    waited = True
+                    self.metrics.incr("waits")
+                self._cond.wait(remaining)
+
+    def _create_reserved(self):
+        try:
+            return self._create()
+        except Exception:
+            self._discard(None)
+            raise
+
+    def _create(self):
+        entry = _Entry(self._connect())
+        self.metrics.incr("created")
+        return entry
+
+    def _usable(self, entry):
+        now = time.monotonic()
+        if now - entry.created_at > self.max_lifetime or now - entry.last_used > self.max_idle:
+            self.metrics.incr("recycled")
+            return False
+        try:
+            cursor = entry.conn.cursor()
+            cursor.execute(self.ping_sql)
+            cursor.fetchone()
+            cursor.close()
+        except Exception:
+            self.metrics.incr("failed_health_checks")
+            return False
+        return True
+
+    def _discard(self, entry):
+        """Drop a connection (or a reserved slot when ``entry`` is None)."""
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+        if entry is not None:
+            self._close_quietly(entry.conn)
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
@@ -0,0 +1,76 @@
+"""Transaction list/export queries shared by the routes and background workers."""
+
+from datetime import datetime
+
+from db import search
+
+TRANSACTION_FIELDS = """
+    t.transaction_id, t.amount, t.transaction_type, t.transaction_date,
+    t.description, t.receipt_url, c.category_name, a.account_name
+"""
+
+TRANSACTION_JOINS = """
+    LEFT JOIN categories c ON t.category_id = c.category_id
+    LEFT JOIN user_accounts a ON t.account_id = a.account_id
+"""
+
+TRANSACTION_COLUMNS = "SELECT {top}" + TRANSACTION_FIELDS + "FROM transactions t" + TRANSACTION_JOINS
+
+EXPORT_COLUMNS = """
+    SELECT t.transaction_date, t.transaction_type, c.category_name, t.amount, t.description
+    FROM transactions t
+    JOIN categories c ON t.category_id = c.category_id
+"""
+
+NEWEST_FIRST = " ORDER BY t.transaction_date DESC, t.transaction_id DESC"
+
+# Request fields understood by transaction_filters()
+FILTER_FIELDS = ("type", "category_id", "from", "to", "keyword", "after")
+
+
+def encode_page_cursor(row):
+    # Keyset position: the (transaction_date, transaction_id) of the last row shown
+    return f"{row.transaction_date.isoformat()}~{row.transaction_id}"
+
+
+def decode_page_cursor(token):
+    """Inverse of encode_page_cursor(); raises ValueError on a malformed token."""
+    when, transaction_id = token.rsplit("~", 1)
+    # Keep the value's type (date vs datetime) so SQLite text compares match
+    when = datetime.fromisoformat(when) if len(when) > 10 else datetime.strptime(when, "%Y-%m-%d").date()
+    return when, int(transaction_id)
+
+
+def transaction_filters(user_id, args):
+    """WHERE clause and params for the type/category_id/from/to/keyword/after filters.
+
+    ``args`` is any mapping (request.args, request.form or a plain dict);
+    raises ValueError for malformed values.
+    """
+    where = "WHERE t.user_id = ?"
+    params = [user_id]
+
+    if args.get("type"):
+        where += " AND t.transaction_type = ?"
+        params.append(args.get("type"))
+
+    if args.get("category_id"):
+        where += " AND t.category_id = ?"
+        params.append(int(args.get("category_id")))
+
+    if args.get("from") and args.get("to"):
+        where += " AND t.transaction_date BETWEEN ? AND ?"
+        params.extend([args.get("from"), args.get("to")])
+
+    if args.get("keyword"):
+        clause, keyword_params = search.keyword_filter(user_id, args.get("keyword"))
+        where += f" AND {clause}"
+        params.extend(keyword_params)
+
+    # Keyset pagination: rows strictly after the cursor in (date DESC, id DESC) order
+    if args.get("after"):
+        when, transaction_id = decode_page_cursor(args.get("after"))
+        where += " AND (t.transaction_date < ? OR (t.transaction_date = ? AND t.transaction_id < ?))"
+        params.extend([when, when, transaction_id])
+
+    return where, params
@@ -0,0 +1,175 @@
+"""Set-based generation of recurring transactions.
+
+Every due occurrence between a rule's ``last_generated_date`` and today is
+computed in Python, then written in bulk: one ``executemany`` INSERT for the
+transactions, one for the rules' new ``last_generated_date``, folded
+``monthly_category_totals`` deltas and one ledger entry per account.
+
+Occurrences are anchored on ``start_date`` (a monthly rule starting on the
+31st lands on the last day of shorter months) and the first one is the start
+date itself.  Generated rows carry ``recurring_id`` and the unique index on
+``(recurring_id, transaction_date)`` guarantees a date is never posted twice,
+even if two runs overlap.
+"""
+
+from calendar import monthrange
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+from db import aggregates, ledger, search, versions
+from db.dialect import engine_name, limit, top
+
+RULES_BATCH_SIZE = 5000
+
+_STEP_DAYS = {"daily": 1, "weekly": 7}
+_STEP_MONTHS = {"monthly": 1, "yearly": 12}
+FREQUENCIES = tuple(_STEP_DAYS) + tuple(_STEP_MONTHS)
+
+
+def nth_occurrence(start_date, frequency, n):
+    """The ``n``-th occurrence (0 = ``start_date``) of a rule."""
+    if frequency in _STEP_DAYS:
+        return start_date + timedelta(days=_STEP_DAYS[frequency] * n)
+    months = start_date.month - 1 + _STEP_MONTHS[frequency] * n
+    year, month = start_date.year + months // 12, months % 12 + 1
+    return date(year, month, min(start_date.day, monthrange(year, month)[1]))
+
+
+def occurrences(frequency, start_date, last_generated, until):
+    """Dates after ``last_generated`` (or from ``start_date``) up to ``until``, inclusive."""
+    if frequency not in FREQUENCIES:
+        return []
+    n = 0
+    if last_generated is not None and last_generated >= start_date:
+        # Jump straight to the period containing last_generated
+        if frequency in _STEP_DAYS:
+            n = (last_generated - start_date).days // _STEP_DAYS[frequency]
+        else:
+            months = (last_generated.year - start_date.year) * 12 + last_generated.month - start_date.month
+            n = months // _STEP_MONTHS[frequency]
+        while nth_occurrence(start_date, frequency, n) <= last_generated:
+            n += 1
+    dates = []
+    while True:
+        when = nth_occurrence(start_date, frequency, n)
+        if when > until:
+            return dates
+        dates.append(when)
+        n += 1
+
+
+def _user_filter(user_id, users):
+    if user_id is not None:
+        return "AND user_id = ?", [user_id]
+    if users is not None:
+        return "AND user_id BETWEEN ? AND ?", list(users)
+    return "", []
+
+
+def _due_rules(cursor, today, after_id, batch_size, user_id, users):
+    where, user_params = _user_filter(user_id, users)
+    params = [after_id, today, today] + user_params
+    cursor.execute(
+        f"""
+        SELECT {top(batch_size)}recurring_id, user_id, category_id, account_id, amount,
+               transaction_type, frequency, start_date, end_date, description, last_generated_date
+        FROM recurring_transactions
+        WHERE recurring_id > ? AND is_active = 1 AND start_date <= ?
+          AND (last_generated_date IS NULL OR last_generated_date < ?)
+          AND (end_date IS NULL OR last_generated_date IS NULL OR last_generated_date < end_date)
+          {where}
+        ORDER BY recurring_id {limit(batch_size)}
+        """,
+        *params,
+    )
+    return cursor.fetchall()
+
+
+def _already_posted(cursor, first_id, last_id):
+    # Occurrences a previous (possibly interrupted) run inserted without
+    # advancing last_generated_date
+    cursor.execute(
+        """
+        SELECT t.recurring_id, t.transaction_date
+        FROM transactions t
+        JOIN recurring_transactions r ON r.recurring_id = t.recurring_id
+        WHERE t.recurring_id BETWEEN ? AND ?
+          AND (r.last_generated_date IS NULL OR t.transaction_date > r.last_generated_date)
+        """,
+        first_id, last_id,
+    )
+    posted = set()
+    for row in cursor.fetchall():
+        # transaction_date is DATETIME on SQL Server, which pyodbc returns as a
+        # datetime; occurrences() yields dates
+        when = row.transaction_date
+        posted.add((row.recurring_id, when.date() if isinstance(when, datetime) else when))
+    return posted
+
+
+def generate_due(cursor, today=None, user_id=None, users=None, batch_size=RULES_BATCH_SIZE):
+    """Post every missed occurrence of active rules; returns how many were inserted.
+
+    Rules are processed in ``recurring_id`` order, ``batch_size`` at a time.
+    ``user_id`` limits the run to one user and ``users`` to an inclusive
+    ``(first_user_id, last_user_id)`` range.  The caller commits.
+    """
+    today = today or date.today()
+    inserted = 0
+    after_id = 0
+    while True:
+        rules = _due_rules(cursor, today, after_id, batch_size, user_id, users)
+        if not rules:
+            return inserted
+        after_id = rules[-1].recurring_id
+        posted = _already_posted(cursor, rules[0].recurring_id, after_id)
+
+        transactions, advanced, totals = [], [], []
+        touched_users = set()
+        balances = defaultdict(int)  # (user_id, account_id) -> net change
+        for rule in rules:
+            until = min(today, rule.end_date) if rule.end_date else today
+            dates = occurrences(rule.frequency, rule.start_date, rule.last_generated_date, until)
+            if not dates:
+                continue
+            recurring_id, rule_user, category_id, account_id, amount, transaction_type = (
+                rule.recurring_id, rule.user_id, rule.category_id, rule.account_id, rule.amount,
+                rule.transaction_type,
+            )
+            advanced.append((dates[-1], recurring_id))
+            touched_users.add(rule_user)
+            if posted:
+                dates = [when for when in dates if (recurring_id, when) not in posted]
+            transactions.extend(
+                (rule_user, category_id, amount, transaction_type, when, rule.description, account_id, recurring_id)
+                for when in dates
+            )
+            totals.extend((rule_user, category_id, transaction_type, when, amount, 1) for when in dates)
+            if account_id is not None:
+                balances[rule_user, account_id] += (1 if transaction_type == "income" else -1) * amount * len(dates)
+
+        if transactions:
+            if engine_name() == "mssql":
+                cursor.fast_executemany = True
+            cursor.executemany(
+                """
+                INSERT INTO transactions (user_id, category_id, amount, transaction_type,
+                                          transaction_date, description, account_id,
+                                          recurring_id, is_recurring_generated)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, 1)
+                """,
+                transactions,
+            )
+            search.index_inserted(cursor, len(transactions))
+            aggregates.record_many(cursor, totals)
+            inserted += len(transactions)
+        ledger.post_many(cursor, [
+            (account_user, account_id, delta, ledger.TRANSACTION, None)
+            for (account_user, account_id), delta in balances.items()
+        ])
+        if advanced:
+            cursor.executemany(
+                "UPDATE recurring_transactions SET last_generated_date = ? WHERE recurring_id = ?",
+                advanced,
+            )
+            versions.bump_many(cursor, touched_users, versions.TRANSACTIONS, versions.ACCOUNTS, versions.RECURRING)
@@ -0,0 +1,56 @@
+"""Bill reminder notifications.
+
+Creates one ``bill_reminder`` notification per pending bill that falls due
+within the lookahead window, for a single user, an inclusive user_id range
+or everyone.  It is one INSERT ... SELECT ... WHERE NOT EXISTS, so the
+work stays in the database whatever the number of bills.  The unique index
+on ``notifications (user_id, related_entity_type, related_entity_id)`` makes
+sure a bill is never reminded twice.
+"""
+
+import os
+from datetime import date, timedelta
+
+from db import versions
+from db.dialect import concat, iso_date, returning
+
+LOOKAHEAD_DAYS = int(os.getenv("BILL_REMINDER_DAYS", "3"))
+
+
+def notify_upcoming_bills(cursor, today=None, user_id=None, users=None, lookahead_days=None):
+    """Insert missing reminders for bills due in ``[today, today + lookahead_days]``.
+
+    Returns the user_ids that received a new notification.  The caller commits.
+    """
+    today = today or date.today()
+    lookahead = LOOKAHEAD_DAYS if lookahead_days is None else lookahead_days
+    deadline = today + timedelta(days=lookahead)
+    if user_id is not None:
+        where, params = "AND b.user_id = ?", [user_id]
+    elif users is not None:
+        where, params = "AND b.user_id BETWEEN ? AND ?", list(users)
+    else:
+        where, params = "", []
+
+    message = concat("'Bill '''", "b.bill_name", "''' is due on '", iso_date("b.due_date"))
+    output, returning_clause = returning("user_id")
+    cursor.execute(
+        f"""
+        INSERT INTO notifications
+            (user_id, notification_type, message, related_entity_type, related_entity_id)
+        {output}
+        SELECT b.user_id, 'bill_reminder', {message}, 'bill', b.bill_id
+        FROM bill_reminders b
+        WHERE b.status = 'pending' AND b.due_date BETWEEN ? AND ? {where}
+          AND NOT EXISTS (
+              SELECT 1 FROM notifications n
+              WHERE n.user_id = b.user_id AND n.related_entity_type = 'bill'
+                AND n.related_entity_id = b.bill_id
+          )
+        {returning_clause}
+        """,
+        today, deadline, *params,
+    )
+    notified = {row.user_id for row in cursor.fetchall()}
+    versions.bump_many(cursor, notified, versions.NOTIFICATIONS)
+    return notified
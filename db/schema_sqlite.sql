@@ -0,0 +1,77 @@
+-- SQLite schema for Expense Tracker (mirrors db/schema.sql)
+
+CREATE TABLE IF NOT EXISTS users (
+    user_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    full_name TEXT NOT NULL,
+    email TEXT NOT NULL UNIQUE,
+    password_hash TEXT NOT NULL,
+    recovery_hint TEXT NULL
+);
+
+CREATE TABLE IF NOT EXISTS user_accounts (
+    account_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL REFERENCES users(user_id),
+    account_name TEXT NOT NULL,
+    account_type TEXT NULL,
+    current_balance REAL NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS categories (
+    category_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    category_name TEXT NOT NULL,
+    category_type TEXT NOT NULL,
+    user_id INTEGER NULL -- NULL for global categories
+);
+
+CREATE TABLE IF NOT EXISTS transactions (
+    transaction_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL REFERENCES users(user_id),
+    category_id INTEGER NULL,
+    amount REAL NOT NULL,
+    transaction_type TEXT NOT NULL,
+    transaction_date DATE NOT NULL,
+    description TEXT NULL,
+    receipt_url TEXT NULL,
+    account_id INTEGER NULL,
+    is_recurring_generated INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS budgets (
+    budget_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    category_id INTEGER NOT NULL,
+    budget_amount REAL NOT NULL,
+    budget_month DATE NOT NULL,
+    alert_threshold INTEGER NOT NULL DEFAULT 90
+);
+
+CREATE TABLE IF NOT EXISTS savings_goals (
+    goal_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    goal_name TEXT NOT NULL,
+    target_amount REAL NOT NULL,
+    current_amount REAL NOT NULL DEFAULT 0,
+    target_date DATE NULL
+);
+
+CREATE TABLE IF NOT EXISTS savings_history (
+    history_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    goal_id INTEGER NOT NULL REFERENCES savings_goals(goal_id),
+    amount REAL NOT NULL,
+    contribution_date TIMESTAMP NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS recurring_transactions (
+    recurring_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    category_id INTEGER NOT NULL,
+    account_id INTEGER NULL,
+    amount REAL NOT NULL,
+    transaction_type TEXT NOT NULL,
+    frequency TEXT NOT NULL,
+    start_date DATE NOT NULL,
+    end_date DATE NULL,
+    description TEXT NULL,
+    last_generated_date DATE NULL,
+    is_active INTEGER NOT NULL DEFAULT 1
+);
@@ -0,0 +1,290 @@
+"""Keyword search over transaction descriptions.
+
+Keywords are split into words and every word must match as a prefix
+(``coff sho`` finds "Coffee shop").  SQLite searches the FTS5 table from
+migration 0010, scoped to one user through its ``owner`` token; SQL Server
+uses the full-text index on ``transactions.description``.  Both indexes are
+kept current by the transaction write paths: on SQLite they call
+``index_rows`` / ``index_inserted`` / ``unindex_rows`` with the cursor of the
+write, and on SQL Server those are no-ops because full-text change tracking
+does the work.  Without a full-text index (or with ``SEARCH_BACKEND=like``)
+searches fall back to ``description LIKE '%keyword%'``.
+
+``keyword_filter`` is the WHERE fragment used by every filtered listing and
+export; ``ranked`` pages through the matches in relevance order.
+"""
+
+import os
+import re
+
+from db.dialect import engine_name, limit, top
+
+# auto: use the full-text index when the database has one
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "auto")
+# SQLite ranks the newest this-many matches, then lists older ones by date (see ranked())
+SEARCH_RANK_WINDOW = int(os.getenv("SEARCH_RANK_WINDOW", "500"))
+MAX_TERMS = 8
+
+_WORD = re.compile(r"\w+")
+_PROBE = {
+    "sqlite": "SELECT 1 FROM sqlite_master WHERE name = 'transactions_fts'",
+    "mssql": "SELECT 1 FROM sys.fulltext_indexes WHERE object_id = OBJECT_ID(N'[dbo].[transactions]')",
+}
+_available = {}
+
+
+def terms(keyword):
+    return _WORD.findall(keyword.lower())[:MAX_TERMS]
+
+
+def _has_index(cursor=None):
+    # Probed once per process, on the caller's cursor when there is one
+    engine = engine_name()
+    if engine not in _available:
+        if cursor is None:
+            from db import get_pool
+
+            with get_pool().connection() as conn:
+                return _has_index(conn.cursor())
+        cursor.execute(_PROBE[engine])
+        _available[engine] = cursor.fetchone() is not None
+    return _available[engine]
+
+
+def fulltext_enabled(cursor=None):
+    """Whether keyword searches use the full-text index."""
+    if SEARCH_BACKEND != "auto":
+        return SEARCH_BACKEND == "fulltext"
+    return _has_index(cursor)
+
+
+def _maintained(cursor):
+    return engine_name() == "sqlite" and _has_index(cursor)
+
+
+def index_rows(cursor, rows):
+    """Add ``(transaction_id, user_id, description)`` rows to the index."""
+    if rows and _maintained(cursor):
+        cursor.executemany(
+            "INSERT INTO transactions_fts (rowid, description, owner) VALUES (?, ?, 'u' || ?)",
+            [(transaction_id, description, user_id) for transaction_id, user_id, description in rows],
+        )
+
+
+def index_inserted(cursor, count):
+    """Index the ``count`` rows the cursor's last ``executemany`` INSERT added.
+
+    Call it straight after the INSERT: SQLite holds the write lock, so those
+    rows have consecutive ids ending at ``last_insert_rowid()``.
+    """
+    if count and _maintained(cursor):
+        cursor.execute("SELECT last_insert_rowid() AS last_id")
+        last_id = cursor.fetchone().last_id
+        cursor.execute(
+            """
+            INSERT INTO transactions_fts (rowid, description, owner)
+            SELECT transaction_id, description, 'u' || user_id FROM transactions
+            WHERE transaction_id > ? AND transaction_id <= ?
+            """,
+            last_id - count, last_id,
+        )
+
+
+def unindex_rows(cursor, rows):
+    """Remove ``(transaction_id, user_id, description)`` rows, with their indexed values."""
+    if rows and _maintained(cursor):
+        cursor.executemany(
+            """
+            INSERT INTO transactions_fts (transactions_fts, rowid, description, owner)
+            VALUES ('delete', ?, ?, 'u' || ?)
+            """,
+            [(transaction_id, description, user_id) for transaction_id, user_id, description in rows],
+        )
+
+
+def unindex_user(cursor, user_id):
+    """Remove all of a user's rows; call before deleting their transactions."""
+    if _maintained(cursor):
+        cursor.execute(
+            """
+            INSERT INTO transactions_fts (transactions_fts, rowid, description, owner)
+            SELECT 'delete', transaction_id, description, 'u' || user_id FROM transactions
+            WHERE user_id = ?
+            """,
+            user_id,
+        )
+
+
+def match_expression(user_id, words, engine=None):
+    """Full-text query requiring every word as a prefix."""
+    if engine_name(engine) == "sqlite":
+        phrase = " AND ".join(f'"{word}"*' for word in words)
+        return f"owner : u{int(user_id)} AND description : ({phrase})"
+    return " AND ".join(f'"{word}*"' for word in words)
+
+
+def relevance(words, description):
+    """Sort key, best first: more words matching a whole token, then fewer tokens."""
+    tokens = _WORD.findall((description or "").lower())
+    exact = sum(word in tokens for word in words)
+    return -exact, len(tokens)
+
+
+def keyword_filter(user_id, keyword):
+    """``(clause, params)`` restricting ``t`` to rows matching ``keyword``."""
+    words = terms(keyword)
+    if not words or not fulltext_enabled():
+        return "t.description LIKE ?", [f"%{keyword}%"]
+    match = match_expression(user_id, words)
+    if engine_name() == "sqlite":
+        return "t.transaction_id IN (SELECT rowid FROM transactions_fts WHERE transactions_fts MATCH ?)", [match]
+    return "CONTAINS(t.description, ?)", [match]
+
+
+def encode_rank_cursor(kind, numbers, row):
+    # "r": inside the ranked results, "d": past them, in date order
+    from db.queries import encode_page_cursor
+
+    return "~".join([kind, *map(str, numbers), encode_page_cursor(row)])
+
+
+def decode_rank_cursor(token):
+    """``(kind, numbers, (date, id))``; raises ValueError on a malformed token."""
+    from db.queries import decode_page_cursor
+
+    kind, *numbers, when, transaction_id = token.split("~")
+    if kind not in ("r", "d"):
+        raise ValueError(f"not a search cursor: {token!r}")
+    return kind, [int(number) for number in numbers], decode_page_cursor(f"{when}~{transaction_id}")
+
+
+def _page(rows, n, encode):
+    # rows holds up to n + 1 rows; the extra one means there is a next page
+    return rows[:n], (encode(rows[n - 1]) if len(rows) > n else None)
+
+
+def _follows(key, row, after_key, when, transaction_id):
+    # Whether row comes after the cursor in (relevance, date DESC, id DESC) order
+    if key != after_key:
+        return key > after_key
+    return (row.transaction_date, row.transaction_id) < (when, transaction_id)
+
+
+def ranked(cursor, user_id, args, n):
+    """One page of the rows matching ``args["keyword"]``, most relevant first.
+
+    Returns ``(rows, next_cursor)``.  The type/category/date filters in
+    ``args`` still apply, and ``args["after"]`` is a cursor from an earlier
+    page; it raises ValueError when malformed.  Without the full-text index
+    rows come in date order with an ordinary page cursor.
+
+    On SQLite the newest ``SEARCH_RANK_WINDOW`` matching rows are read in
+    index order and sorted by ``relevance`` here.  FTS5's ``bm25()`` would
+    count every user's hits for each term on every query, which costs more
+    than the whole search on a large table, and its IDF part cannot reorder
+    rows that all contain every term anyway.  The cursor remembers the
+    oldest row of that window, and the pages after the ranked rows list the
+    older matches in date order.
+    """
+    from db.queries import NEWEST_FIRST, TRANSACTION_FIELDS, TRANSACTION_JOINS, encode_page_cursor, transaction_filters
+
+    keyword = args.get("keyword") or ""
+    words = terms(keyword)
+    filters = {field: args.get(field) for field in ("type", "category_id", "from", "to")}
+    if not words or not fulltext_enabled(cursor):
+        where, params = transaction_filters(user_id, dict(filters, keyword=keyword, after=args.get("after")))
+        cursor.execute(
+            f"SELECT {top(n + 1)}{TRANSACTION_FIELDS} FROM transactions t {TRANSACTION_JOINS} "
+            f"{where} {NEWEST_FIRST} {limit(n + 1)}",
+            *params,
+        )
+        return _page(cursor.fetchall(), n, encode_page_cursor)
+
+    where, params = transaction_filters(user_id, filters)
+    kind, numbers, position = decode_rank_cursor(args["after"]) if args.get("after") else ("r", [], None)
+    if engine_name() != "sqlite":
+        keyset, keyset_params = "", []
+        if position:
+            if kind != "r" or len(numbers) != 1:
+                raise ValueError("not a full-text search cursor")
+            keyset = """
+                AND (ft.RANK < ? OR (ft.RANK = ? AND (t.transaction_date < ?
+                     OR (t.transaction_date = ? AND t.transaction_id < ?))))
+            """
+            keyset_params = [numbers[0], numbers[0], position[0], position[0], position[1]]
+        cursor.execute(
+            f"""
+            SELECT {top(n + 1)}{TRANSACTION_FIELDS}, ft.RANK AS search_rank
+            FROM CONTAINSTABLE(transactions, description, ?) ft
+            JOIN transactions t ON t.transaction_id = ft.[KEY]
+            {TRANSACTION_JOINS}
+            {where} {keyset}
+            ORDER BY ft.RANK DESC, t.transaction_date DESC, t.transaction_id DESC
+            """,
+            match_expression(user_id, words), *params, *keyset_params,
+        )
+        return _page(cursor.fetchall(), n, lambda row: encode_rank_cursor("r", [row.search_rank], row))
+
+    if position and len(numbers) != (3 if kind == "r" else 1):
+        raise ValueError("not a full-text search cursor")
+    floor = numbers[0] if position else None
+    rows = []
+    if kind == "r":
+        bounds, bound_params = "", []
+        if args.get("from") and args.get("to"):
+            # Lets FTS5 skip matches whose ids fall outside the date range
+            bounds = """
+                AND f.rowid BETWEEN
+                    (SELECT MIN(transaction_id) FROM transactions WHERE user_id = ? AND transaction_date BETWEEN ? AND ?)
+                AND (SELECT MAX(transaction_id) FROM transactions WHERE user_id = ? AND transaction_date BETWEEN ? AND ?)
+            """
+            bound_params = [user_id, args.get("from"), args.get("to")] * 2
+        if floor is None:
+            window, window_params, window_limit = "", [], limit(SEARCH_RANK_WINDOW)
+        else:
+            window, window_params, window_limit = "AND f.rowid >= ?", [floor], ""
+        cursor.execute(
+            f"""
+            SELECT {TRANSACTION_FIELDS}
+            FROM transactions_fts f
+            JOIN transactions t ON t.transaction_id = f.rowid
+            {TRANSACTION_JOINS}
+            {where} AND transactions_fts MATCH ? {bounds} {window}
+            ORDER BY f.rowid DESC
+            {window_limit}
+            """,
+            *params, match_expression(user_id, words), *bound_params, *window_params,
+        )
+        rows = cursor.fetchall()
+        if floor is None:
+            # 0: the window holds every match, nothing older to list
+            floor = rows[-1].transaction_id if len(rows) == SEARCH_RANK_WINDOW else 0
+        rows.sort(key=lambda row: (row.transaction_date, row.transaction_id), reverse=True)
+        rows.sort(key=lambda row: relevance(words, row.description))
+        if position:
+            rows = [row for row in rows if _follows(relevance(words, row.description), row, tuple(numbers[1:]), *position)]
+        rows = rows[:n + 1]
+    ranked_count = len(rows)
+
+    if len(rows) <= n and floor:
+        # Past the ranked window: the older matches, newest first
+        clause, keyword_params = keyword_filter(user_id, keyword)
+        older = f"{where} AND {clause} AND t.transaction_id < ?"
+        older_params = [*params, *keyword_params, floor]
+        if kind == "d":
+            older += " AND (t.transaction_date < ? OR (t.transaction_date = ? AND t.transaction_id < ?))"
+            older_params.extend([position[0], position[0], position[1]])
+        cursor.execute(
+            f"SELECT {TRANSACTION_FIELDS} FROM transactions t {TRANSACTION_JOINS} "
+            f"{older} {NEWEST_FIRST} {limit(n + 1 - len(rows))}",
+            *older_params,
+        )
+        rows += cursor.fetchall()
+
+    def encode(row):
+        # row is the page's last one, rows[n - 1]
+        if n - 1 < ranked_count:
+            return encode_rank_cursor("r", [floor, *relevance(words, row.description)], row)
+        return encode_rank_cursor("d", [floor], row)
+
+    return _page(rows, n, encode)
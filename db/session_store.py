@@ -0,0 +1,67 @@
+"""Rows of the ``app_sessions`` table (migration 0011) behind SESSION_BACKEND=db.
+
+Session data is stored as JSON with an absolute ``expires_at`` (Unix
+seconds).  Loading ignores expired rows; ``sweep`` deletes them
+``SESSION_SWEEP_BATCH`` at a time so a large backlog never holds the table
+for long.  The web app sweeps one batch every few minutes (see sessions.py)
+and the scheduler clears the rest after each pass.
+"""
+
+import json
+import os
+
+from db.dialect import engine_name
+
+SESSION_SWEEP_BATCH = int(os.getenv("SESSION_SWEEP_BATCH", "1000"))
+
+_SWEEP = {
+    "sqlite": """
+        DELETE FROM app_sessions WHERE session_id IN (
+            SELECT session_id FROM app_sessions WHERE expires_at <= ? LIMIT ?
+        )
+    """,
+    "mssql": "DELETE TOP (?) FROM app_sessions WHERE expires_at <= ?",
+}
+
+
+def load(cursor, session_id, now):
+    """``(data, expires_at)`` for a live session, or None."""
+    cursor.execute(
+        "SELECT data, expires_at FROM app_sessions WHERE session_id = ? AND expires_at > ?",
+        session_id, int(now),
+    )
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    return json.loads(row.data), row.expires_at
+
+
+def save(cursor, session_id, data, expires_at):
+    payload = json.dumps(data, separators=(",", ":"))
+    cursor.execute(
+        "UPDATE app_sessions SET data = ?, expires_at = ? WHERE session_id = ?",
+        payload, int(expires_at), session_id,
+    )
+    if cursor.rowcount == 0:
+        cursor.execute(
+            "INSERT INTO app_sessions (session_id, data, expires_at) VALUES (?, ?, ?)",
+            session_id, payload, int(expires_at),
+        )
+
+
+def touch(cursor, session_id, expires_at):
+    """Extend a session without rewriting its data."""
+    cursor.execute("UPDATE app_sessions SET expires_at = ? WHERE session_id = ?", int(expires_at), session_id)
+
+
+def delete(cursor, session_id):
+    cursor.execute("DELETE FROM app_sessions WHERE session_id = ?", session_id)
+
+
+def sweep(cursor, now, batch=SESSION_SWEEP_BATCH):
+    """Delete up to ``batch`` expired sessions; returns how many went."""
+    if engine_name() == "sqlite":
+        cursor.execute(_SWEEP["sqlite"], int(now), batch)
+    else:
+        cursor.execute(_SWEEP["mssql"], batch, int(now))
+    return max(cursor.rowcount, 0)
@@ -0,0 +1,259 @@
+"""Per-request SQL tracing and the slow-query log.
+
+Between ``start`` and ``finish`` (the app calls them around every request),
+cursors handed out by the pool are wrapped in ``TracingCursor``, which
+records each statement's text, elapsed time (execute plus fetches) and row
+count.  Outside a traced request -- the scheduler, report workers, scripts --
+cursors are returned unwrapped.
+
+Statement text is normalised before it is kept: parameters are never
+recorded and string/number literals become ``?``, so repeats of a query
+group together and no user data reaches the logs.
+
+``finish`` returns the request's summary (query count, DB time, statements
+run ``N_PLUS_ONE_THRESHOLD`` or more times -- usually a query in a loop),
+logs it, and adds it to the per-(route, statement) totals behind
+``top_statements``.  Statements slower than ``SLOW_QUERY_MS`` are logged to
+the ``sql.slow`` logger, and to the ``SLOW_QUERY_LOG`` file when set.
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from functools import lru_cache
+
+SQL_TRACE = os.getenv("SQL_TRACE", "1").lower() in ("1", "true", "yes")
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+N_PLUS_ONE_THRESHOLD = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", "5"))
+# Distinct (route, statement) pairs kept for top_statements
+MAX_TRACKED_STATEMENTS = 1000
+
+log = logging.getLogger("sql")
+slow_log = logging.getLogger("sql.slow")
+if os.getenv("SLOW_QUERY_LOG"):
+    _handler = logging.FileHandler(os.environ["SLOW_QUERY_LOG"])
+    _handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+    slow_log.addHandler(_handler)
+
+_STRING = re.compile(r"N?'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_SPACE = re.compile(r"\s+")
+
+_current = ContextVar("sql_trace", default=None)
+
+
+@lru_cache(maxsize=2048)
+def normalize(sql):
+    """``sql`` on one line with its string and number literals replaced by ``?``."""
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    return _SPACE.sub(" ", sql).strip()
+
+
+class Statement:
+    __slots__ = ("sql", "elapsed", "rows")
+
+    def __init__(self, sql, elapsed, rows):
+        self.sql = sql
+        self.elapsed = elapsed
+        self.rows = rows
+
+
+class RequestTrace:
+    def __init__(self, route):
+        self.route = route
+        self.statements = []
+
+    def record(self, sql, elapsed, rows):
+        statement = Statement(normalize(sql), elapsed, rows)
+        self.statements.append(statement)
+        return statement
+
+    @property
+    def db_ms(self):
+        return sum(statement.elapsed for statement in self.statements) * 1000
+
+    def summary(self):
+        repeats = Counter(statement.sql for statement in self.statements)
+        return {
+            "route": self.route,
+            "queries": len(self.statements),
+            "db_ms": round(self.db_ms, 2),
+            "n_plus_one": [
+                {"sql": sql, "count": count}
+                for sql, count in repeats.most_common() if count >= N_PLUS_ONE_THRESHOLD
+            ],
+        }
+
+
+class TracingCursor:
+    """Times a cursor's statements into a ``RequestTrace``; everything else passes through."""
+
+    def __init__(self, cursor, trace):
+        object.__setattr__(self, "_cursor", cursor)
+        object.__setattr__(self, "_trace", trace)
+        object.__setattr__(self, "_last", None)
+
+    def _timed(self, method, *args):
+        started = time.perf_counter()
+        try:
+            return getattr(self._cursor, method)(*args)
+        finally:
+            if self._last is not None:
+                self._last.elapsed += time.perf_counter() - started
+
+    def execute(self, sql, *params):
+        started = time.perf_counter()
+        try:
+            self._cursor.execute(sql, *params)
+        finally:
+            rowcount = getattr(self._cursor, "rowcount", -1)
+            object.__setattr__(self, "_last", self._trace.record(
+                sql, time.perf_counter() - started, rowcount if rowcount and rowcount > 0 else 0))
+        return self
+
+    def executemany(self, sql, seq_of_params):
+        seq_of_params = list(seq_of_params)
+        started = time.perf_counter()
+        try:
+            self._cursor.executemany(sql, seq_of_params)
+        finally:
+            object.__setattr__(self, "_last", self._trace.record(
+                sql, time.perf_counter() - started, len(seq_of_params)))
+        return self
+
+    def fetchone(self):
+        row = self._timed("fetchone")
+        if row is not None and self._last is not None:
+            self._last.rows += 1
+        return row
+
+    def fetchmany(self, *size):
+        rows = self._timed("fetchmany", *size)
+        if self._last is not None:
+            self._last.rows += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._timed("fetchall")
+        if self._last is not None:
+            self._last.rows += len(rows)
+        return rows
+
+    def __iter__(self):
+        while True:
+            row = self.fetchone()
+            if row is None:
+                return
+            yield row
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name, value):
+        # e.g. cursor.fast_executemany = True
+        setattr(self._cursor, name, value)
+
+
+def wrap(cursor):
+    """``cursor`` wrapped for the current request's trace, or as is outside one."""
+    trace = _current.get()
+    return TracingCursor(cursor, trace) if trace is not None else cursor
+
+
+def start(route):
+    """Begin tracing the current request; pass the returned token to ``finish``."""
+    return _current.set(RequestTrace(route))
+
+
+def current():
+    return _current.get()
+
+
+def finish(token):
+    """Stop tracing; logs and records the request, and returns its summary."""
+    trace = _current.get()
+    _current.reset(token)
+    if trace is None:
+        return None
+    summary = trace.summary()
+    for statement in trace.statements:
+        elapsed_ms = statement.elapsed * 1000
+        if elapsed_ms >= SLOW_QUERY_MS:
+            slow_log.warning("%.1fms rows=%d route=%s %s", elapsed_ms, statement.rows, trace.route, statement.sql)
+    if summary["n_plus_one"]:
+        log.warning("route=%s queries=%d db_ms=%.1f repeated: %s", trace.route, summary["queries"],
+                    summary["db_ms"], "; ".join(f"{item['count']}x {item['sql']}" for item in summary["n_plus_one"]))
+    else:
+        log.debug("route=%s queries=%d db_ms=%.1f", trace.route, summary["queries"], summary["db_ms"])
+    stats.add(trace)
+    return summary
+
+
+class StatementStats:
+    """Process-wide totals per (route, statement) for the debug endpoint."""
+
+    def __init__(self, max_entries=MAX_TRACKED_STATEMENTS):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = {}
+        self.requests = Counter()
+        self.dropped = 0
+
+    def add(self, trace):
+        repeats = Counter(statement.sql for statement in trace.statements)
+        with self._lock:
+            self.requests[trace.route] += 1
+            for statement in trace.statements:
+                key = (trace.route, statement.sql)
+                entry = self._entries.get(key)
+                if entry is None:
+                    if len(self._entries) >= self.max_entries:
+                        self.dropped += 1
+                        continue
+                    entry = self._entries[key] = {"count": 0, "total": 0.0, "max": 0.0, "rows": 0, "n_plus_one": 0}
+                entry["count"] += 1
+                entry["total"] += statement.elapsed
+                entry["max"] = max(entry["max"], statement.elapsed)
+                entry["rows"] += statement.rows
+            for sql, count in repeats.items():
+                if count >= N_PLUS_ONE_THRESHOLD and (trace.route, sql) in self._entries:
+                    self._entries[trace.route, sql]["n_plus_one"] += 1
+
+    def top(self, n=20, order="total_ms", route=None):
+        """The ``n`` heaviest statements by ``order`` (total_ms, mean_ms, max_ms or count)."""
+        with self._lock:
+            items = [
+                {
+                    "route": key[0],
+                    "sql": key[1],
+                    "count": entry["count"],
+                    "per_request": round(entry["count"] / self.requests[key[0]], 2),
+                    "total_ms": round(entry["total"] * 1000, 2),
+                    "mean_ms": round(entry["total"] / entry["count"] * 1000, 2),
+                    "max_ms": round(entry["max"] * 1000, 2),
+                    "rows": entry["rows"],
+                    "n_plus_one_requests": entry["n_plus_one"],
+                }
+                for key, entry in self._entries.items()
+                if route is None or key[0] == route
+            ]
+        items.sort(key=lambda item: item[order], reverse=True)
+        return items[:n]
+
+    def reset(self):
+        with self._lock:
+            self._entries.clear()
+            self.requests.clear()
+            self.dropped = 0
+
+
+stats = StatementStats()
+
+
+def top_statements(n=20, order="total_ms", route=None):
+    return stats.top(n, order, route)
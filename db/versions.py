@@ -0,0 +1,59 @@
+"""Per-user, per-table version counters.
+
+Write paths call ``bump`` with the same cursor as the write, so a counter
+moves in the same DB transaction as the rows it describes.  Readers derive
+HTTP ETags from the counters and can answer ``If-None-Match`` with a primary
+key lookup instead of re-running the resource query.
+"""
+
+from db.dialect import engine_name
+
+# Tables whose counters are tracked; resources name the ones they read
+TRANSACTIONS = "transactions"
+BUDGETS = "budgets"
+SAVINGS = "savings_goals"
+RECURRING = "recurring_transactions"
+BILLS = "bill_reminders"
+NOTIFICATIONS = "notifications"
+DEBTS = "debts"
+ACCOUNTS = "user_accounts"
+
+ALL_TABLES = (TRANSACTIONS, BUDGETS, SAVINGS, RECURRING, BILLS, NOTIFICATIONS, DEBTS, ACCOUNTS)
+
+_BUMP = {
+    "mssql": """
+        MERGE user_table_versions WITH (HOLDLOCK) AS v
+        USING (SELECT ? AS user_id, ? AS table_name) AS d
+        ON v.user_id = d.user_id AND v.table_name = d.table_name
+        WHEN MATCHED THEN UPDATE SET version = v.version + 1
+        WHEN NOT MATCHED THEN INSERT (user_id, table_name, version) VALUES (d.user_id, d.table_name, 1);
+    """,
+    "sqlite": """
+        INSERT INTO user_table_versions (user_id, table_name, version) VALUES (?, ?, 1)
+        ON CONFLICT (user_id, table_name) DO UPDATE SET version = version + 1
+    """,
+}
+
+
+def bump(cursor, user_id, *tables):
+    """Advance ``user_id``'s counters for ``tables``."""
+    bump_many(cursor, [user_id], *tables)
+
+
+def bump_many(cursor, user_ids, *tables):
+    """Advance the counters for every user in ``user_ids``."""
+    params = [(user_id, table) for user_id in set(user_ids) for table in tables]
+    if params:
+        cursor.executemany(_BUMP[engine_name()], params)
+
+
+def get_versions(cursor, user_id, tables):
+    """``{table: version}`` for ``tables``; tables never written are version 0."""
+    placeholders = ", ".join("?" for _ in tables)
+    cursor.execute(
+        f"SELECT table_name, version FROM user_table_versions WHERE user_id = ? AND table_name IN ({placeholders})",
+        user_id, *tables,
+    )
+    versions = dict.fromkeys(tables, 0)
+    versions.update({row.table_name: row.version for row in cursor.fetchall()})
+    return versions
@@ -0,0 +1,62 @@
+"""Streaming export helpers.
+
+Rows are pulled from an executed cursor with ``fetchmany`` and encoded one
+batch at a time, so an export never holds more than ``batch_size`` rows (or
+their encoded bytes) in memory.
+"""
+
+import csv
+import io
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+
+EXPORT_BATCH_SIZE = 5000
+
+
+def iter_rows(cursor, batch_size=EXPORT_BATCH_SIZE):
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            return
+        yield from rows
+
+
+def iter_csv(cursor, header, batch_size=EXPORT_BATCH_SIZE):
+    """Yield UTF-8 CSV chunks for every row left on ``cursor``."""
+    return csv_chunks(iter(lambda: cursor.fetchmany(batch_size), []), header)
+
+
+def csv_chunks(batches, header):
+    """Yield one UTF-8 CSV chunk per batch of rows (the first also has the header)."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    for rows in batches:
+        writer.writerows(rows)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    chunk = buffer.getvalue()
+    if chunk:
+        yield chunk.encode("utf-8")
+
+
+def json_default(value):
+    """``json.dumps(default=...)`` hook for DB values (dates, Decimals)."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def gzip_chunks(chunks, level=6):
+    """Gzip a stream of byte chunks on the fly."""
+    # wbits=31 selects the gzip container rather than a raw zlib stream
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
@@ -0,0 +1,58 @@
+"""gunicorn settings for the production server (``gunicorn -c gunicorn.conf.py wsgi:app``).
+
+Preforked workers (``WEB_CONCURRENCY``), each serving ``WEB_THREADS``
+requests at a time.  The app is loaded once in the master before forking
+(``WEB_PRELOAD``), and every worker opens its DB pool's ``DB_POOL_MIN_SIZE``
+connections before it accepts requests.  Keep ``DB_POOL_MAX_SIZE`` at least
+``WEB_THREADS`` so a busy worker never waits on its own pool.  A reporting
+node runs the same command with ``APP_ROLE=reporting`` and its own
+``WEB_*``/``DB_POOL_*`` sizing (see my_app.py).
+
+Reloading: ``kill -HUP <master pid>`` re-reads this file, starts a new set of
+workers and stops the old ones gracefully -- they stop accepting, finish their
+in-flight requests (up to ``WEB_GRACEFUL_TIMEOUT`` seconds) and exit.  With
+``WEB_PRELOAD=1`` the new workers are forked from the already-loaded app, so a
+HUP picks up configuration but not new code; deploy code with ``USR2``
+(a new master) followed by ``QUIT`` to the old one, or set ``WEB_PRELOAD=0``
+to have HUP re-import the app in each new worker.
+"""
+
+import logging
+import multiprocessing
+import os
+
+bind = os.getenv("WEB_BIND", "0.0.0.0:5000")
+workers = int(os.getenv("WEB_CONCURRENCY", str(multiprocessing.cpu_count())))
+worker_class = "gthread"
+threads = int(os.getenv("WEB_THREADS", "8"))
+preload_app = os.getenv("WEB_PRELOAD", "1").lower() in ("1", "true", "yes")
+timeout = int(os.getenv("WEB_TIMEOUT", "60"))
+graceful_timeout = int(os.getenv("WEB_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("WEB_KEEPALIVE", "5"))
+# Recycle workers after this many requests (0: never); jitter staggers them
+max_requests = int(os.getenv("WEB_MAX_REQUESTS", "0"))
+max_requests_jitter = max_requests // 10
+accesslog = os.getenv("WEB_ACCESS_LOG") or None
+errorlog = "-"
+
+log = logging.getLogger("gunicorn.error")
+
+
+def post_worker_init(worker):
+    # The pool is per process (db.get_pool() checks the pid), so this opens
+    # the worker's own connections rather than reusing the master's.
+    import db
+
+    try:
+        db.get_pool().warm()
+    except Exception:
+        # Serve anyway; requests will connect on demand once the DB is back
+        log.exception("worker %s: DB pool warm-up failed", worker.pid)
+    else:
+        log.info("worker %s: %d DB connections ready", worker.pid, db.get_pool().stats()["idle"])
+
+
+def worker_exit(server, worker):
+    import db
+
+    db.get_pool().close()
@@ -0,0 +1,181 @@
+"""Bulk transaction import from CSV or OFX files.
+
+Uploaded files are read as a stream and parsed one record at a time.
+Categories and accounts are resolved against in-memory name maps, and valid
+rows are inserted ``batch_size`` at a time with ``executemany``
+(``fast_executemany`` on SQL Server).  Balance changes are summed per
+account and posted once at the end, one ledger entry per account, so a large
+import costs a few round trips per batch instead of several per row.
+
+CSV files use the same columns as the CSV export (``Date, Type, Category,
+Amount, Description``) plus an optional ``Account`` column.  Header names are
+case-insensitive.
+"""
+
+import csv
+import io
+import re
+from collections import defaultdict
+from datetime import date, datetime
+
+from db import aggregates, ledger, search, versions
+from db.dialect import engine_name
+
+IMPORT_BATCH_SIZE = 5000
+MAX_REPORTED_ERRORS = 100
+
+TYPES = ("income", "expense")
+
+_OFX_BLOCK = re.compile(r"<STMTTRN>(.*?)</STMTTRN>", re.IGNORECASE | re.DOTALL)
+_OFX_FIELD = re.compile(r"<(\w+)>([^<\r\n]*)")
+
+
+class RecordError(ValueError):
+    """A record that cannot be imported; ``str()`` is the user-facing reason."""
+
+
+def read_csv(stream):
+    """Yield ``(line_number, record)`` for each data row of a binary CSV stream."""
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    reader = csv.reader(text)
+    header = [name.strip().lower() for name in next(reader, [])]
+    for row in reader:
+        if row:
+            yield reader.line_num, dict(zip(header, row))
+
+
+def read_ofx(stream, chunk_size=1 << 16):
+    """Yield ``(n, record)`` for each ``<STMTTRN>`` in a binary OFX (SGML or XML) stream."""
+    buffer = ""
+    count = 0
+    while True:
+        chunk = stream.read(chunk_size)
+        if chunk:
+            buffer += chunk.decode("utf-8", errors="replace")
+        last_end = 0
+        for match in _OFX_BLOCK.finditer(buffer):
+            fields = {name.upper(): value.strip() for name, value in _OFX_FIELD.findall(match.group(1))}
+            amount = fields.get("TRNAMT", "")
+            count += 1
+            yield count, {
+                "date": fields.get("DTPOSTED", "")[:8],
+                "type": "expense" if amount.startswith("-") else "income",
+                "amount": amount.lstrip("+-"),
+                "description": fields.get("MEMO") or fields.get("NAME", ""),
+            }
+            last_end = match.end()
+        buffer = buffer[last_end:]
+        if not chunk:
+            return
+
+
+def read_records(stream, filename):
+    """Pick the parser from the file extension."""
+    if filename.lower().endswith((".ofx", ".qfx")):
+        return read_ofx(stream)
+    return read_csv(stream)
+
+
+def _parse_date(value):
+    value = value.strip()
+    if len(value) == 8 and value.isdigit():
+        return datetime.strptime(value, "%Y%m%d").date()
+    return date.fromisoformat(value[:10])
+
+
+class RowMapper:
+    """Validates records and maps category/account names to ids in memory."""
+
+    def __init__(self, categories, accounts, default_account_id=None):
+        self.categories = {c.category_name.strip().lower(): c.category_id for c in categories}
+        self.accounts = {a.account_name.strip().lower(): a.account_id for a in accounts}
+        self.account_ids = set(self.accounts.values())
+        if default_account_id is not None and default_account_id not in self.account_ids:
+            raise RecordError("Unknown default account.")
+        self.default_account_id = default_account_id
+
+    def map(self, record):
+        """Return ``(category_id, amount, type, date, description, account_id)``."""
+        try:
+            when = _parse_date(record.get("date") or "")
+        except ValueError:
+            raise RecordError(f"invalid date {record.get('date')!r}") from None
+        try:
+            amount = float((record.get("amount") or "").replace(",", ""))
+        except ValueError:
+            raise RecordError(f"invalid amount {record.get('amount')!r}") from None
+
+        kind = (record.get("type") or "").strip().lower()
+        if not kind:
+            kind = "expense" if amount < 0 else "income"
+        if kind not in TYPES:
+            raise RecordError(f"invalid type {kind!r}")
+
+        category_name = (record.get("category") or "").strip().lower()
+        category_id = self.categories.get(category_name) if category_name else None
+        if category_name and category_id is None:
+            raise RecordError(f"unknown category {record.get('category')!r}")
+
+        account_name = (record.get("account") or "").strip().lower()
+        account_id = self.accounts.get(account_name) if account_name else self.default_account_id
+        if account_name and account_id is None:
+            raise RecordError(f"unknown account {record.get('account')!r}")
+
+        description = (record.get("description") or "").strip() or None
+        return category_id, abs(amount), kind, when, description, account_id
+
+
+def import_transactions(cursor, user_id, records, mapper, batch_size=IMPORT_BATCH_SIZE):
+    """Insert ``(line, record)`` pairs for ``user_id``; yields a progress dict per batch.
+
+    The last dict has ``"done": True`` and is sent after the per-account
+    ledger entries.  Invalid records are skipped and listed (up to
+    ``MAX_REPORTED_ERRORS``) under ``"errors"``.  The caller commits, and
+    should only pass the last dict on once it has.
+    """
+    if engine_name() == "mssql":
+        cursor.fast_executemany = True
+    insert = """
+        INSERT INTO transactions (user_id, category_id, amount, transaction_type,
+                                  transaction_date, description, account_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """
+    balances = defaultdict(float)
+    errors = []
+    progress = {"processed": 0, "imported": 0, "failed": 0}
+    batch = []
+
+    def flush():
+        cursor.executemany(insert, batch)
+        search.index_inserted(cursor, len(batch))
+        aggregates.record_many(
+            cursor, [(user_id, row[1], row[3], row[4], row[2], 1) for row in batch]
+        )
+        progress["imported"] += len(batch)
+        batch.clear()
+
+    for line, record in records:
+        progress["processed"] += 1
+        try:
+            category_id, amount, kind, when, description, account_id = mapper.map(record)
+        except RecordError as exc:
+            progress["failed"] += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append({"line": line, "error": str(exc)})
+            continue
+        batch.append((user_id, category_id, amount, kind, when, description, account_id))
+        if account_id is not None:
+            balances[account_id] += amount if kind == "income" else -amount
+        if len(batch) >= batch_size:
+            flush()
+            yield dict(progress)
+
+    if batch:
+        flush()
+    ledger.post_many(cursor, [
+        (user_id, account_id, round(delta, 2), ledger.TRANSACTION, None)
+        for account_id, delta in balances.items()
+    ])
+    if progress["imported"]:
+        versions.bump(cursor, user_id, versions.TRANSACTIONS, versions.ACCOUNTS)
+    yield dict(progress, done=True, errors=errors)
@@ -0,0 +1,226 @@
+"""Background PDF reports.
+
+``/export_transactions`` with ``format=pdf`` only enqueues a row in
+``report_jobs``; worker processes started with ``python reports.py`` claim
+queued jobs, render the PDF to ``REPORTS_DIR`` and mark the job done.  The
+browser polls ``/reports/<job_id>`` and downloads the file once it is ready.
+
+A job is keyed by a fingerprint of the filters plus the user's
+transactions version counter (db/versions.py), so asking again for the same
+report over unchanged data reuses the finished (or still running) job
+instead of rendering twice.  A job left ``running`` for longer than
+``REPORT_JOB_TIMEOUT`` seconds (its worker died) is claimed again.
+
+Usage:
+  python reports.py                   # one worker per CPU
+  python reports.py --workers 4 --poll 2
+  python reports.py --once            # drain the queue and exit
+"""
+import argparse
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import time
+from datetime import datetime, timedelta
+
+import db
+from db import versions
+from db.dialect import engine_name
+from db.queries import EXPORT_COLUMNS, FILTER_FIELDS, NEWEST_FIRST, transaction_filters
+from exports import iter_rows
+
+REPORTS_DIR = os.getenv("REPORTS_DIR", "reports")
+REPORT_JOB_TIMEOUT = int(os.getenv("REPORT_JOB_TIMEOUT", "900"))
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+log = logging.getLogger("reports")
+
+# Params: the new started_at, then the cutoff before which running jobs are stale
+_CLAIM = {
+    # READPAST lets concurrent workers skip rows another worker has locked
+    "mssql": """
+        UPDATE report_jobs SET status = 'running', started_at = ?
+        OUTPUT inserted.job_id, inserted.user_id, inserted.fingerprint, inserted.filters
+        WHERE job_id = (SELECT TOP (1) job_id FROM report_jobs WITH (READPAST, UPDLOCK, ROWLOCK)
+                        WHERE status = 'queued' OR (status = 'running' AND started_at < ?)
+                        ORDER BY job_id)
+    """,
+    # SQLite serialises writers, so the subquery + UPDATE is already atomic
+    "sqlite": """
+        UPDATE report_jobs SET status = 'running', started_at = ?
+        WHERE job_id = (SELECT job_id FROM report_jobs
+                        WHERE status = 'queued' OR (status = 'running' AND started_at < ?)
+                        ORDER BY job_id LIMIT 1)
+        RETURNING job_id, user_id, fingerprint, filters
+    """,
+}
+
+
+def normalise_filters(args):
+    """The export filters that affect a report, as a plain dict.
+
+    Keyset cursors are a paging concern, so ``after`` is dropped.
+    """
+    return {key: str(args.get(key)) for key in FILTER_FIELDS if key != "after" and args.get(key)}
+
+
+def data_fingerprint(cursor, user_id, filters):
+    """Hash of the filters and the user's transactions version counter.
+
+    Every write to the user's transactions bumps the counter, which yields
+    a new fingerprint.
+    """
+    payload = json.dumps(
+        {"user": user_id, "filters": filters,
+         "versions": versions.get_versions(cursor, user_id, (versions.TRANSACTIONS,))},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _stale_before(now=None):
+    return (now or datetime.now()) - timedelta(seconds=REPORT_JOB_TIMEOUT)
+
+
+def enqueue(cursor, user_id, filters, now=None):
+    """Return the job_id of a report for these filters, queueing one if needed."""
+    filters = normalise_filters(filters)
+    fingerprint = data_fingerprint(cursor, user_id, filters)
+
+    # A job running past REPORT_JOB_TIMEOUT lost its worker; queue a fresh one
+    cursor.execute(
+        """
+        SELECT job_id, status, file_path FROM report_jobs
+        WHERE user_id = ? AND fingerprint = ?
+          AND (status IN ('queued', 'done') OR (status = 'running' AND started_at >= ?))
+        ORDER BY job_id DESC
+        """,
+        user_id, fingerprint, _stale_before(now),
+    )
+    for job in cursor.fetchall():
+        if job.status != DONE or (job.file_path and os.path.exists(job.file_path)):
+            return job.job_id
+
+    cursor.execute(
+        "INSERT INTO report_jobs (user_id, fingerprint, filters, status) VALUES (?, ?, ?, ?)",
+        user_id, fingerprint, json.dumps(filters, sort_keys=True), QUEUED,
+    )
+    cursor.execute(
+        "SELECT MAX(job_id) AS job_id FROM report_jobs WHERE user_id = ? AND fingerprint = ?",
+        user_id, fingerprint,
+    )
+    return cursor.fetchone().job_id
+
+
+def get_job(cursor, user_id, job_id):
+    """A user's job row, or None (also for other users' jobs)."""
+    cursor.execute(
+        """
+        SELECT job_id, status, file_path, error, created_at, started_at, finished_at
+        FROM report_jobs WHERE job_id = ? AND user_id = ?
+        """,
+        job_id, user_id,
+    )
+    return cursor.fetchone()
+
+
+def claim_next(cursor, now=None):
+    """Atomically move the oldest queued or stale running job to running and return it (or None)."""
+    now = now or datetime.now()
+    cursor.execute(_CLAIM[engine_name()], now, _stale_before(now))
+    return cursor.fetchone()
+
+
+def render_pdf(cursor, user_id, filters, path):
+    # fpdf is only needed by the workers
+    from fpdf import FPDF
+
+    where, params = transaction_filters(user_id, filters)
+    cursor.execute(EXPORT_COLUMNS + where + NEWEST_FIRST, *params)
+
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Arial", size=12)
+    pdf.cell(200, 10, "Transaction Report", ln=True, align="C")
+    pdf.ln(10)
+    for row in iter_rows(cursor):
+        line = f"{row[0]} | {row[1]} | {row[2]} | ${row[3]:.2f} | {row[4]}"
+        pdf.cell(200, 10, line, ln=True)
+
+    # Write beside the target and rename, so a download never sees half a file
+    partial = f"{path}.{os.getpid()}.part"
+    pdf.output(partial, "F")
+    os.replace(partial, path)
+
+
+def run_job(conn, job, reports_dir=REPORTS_DIR):
+    cursor = conn.cursor()
+    path = os.path.join(reports_dir, f"{job.user_id}-{job.fingerprint}.pdf")
+    try:
+        render_pdf(cursor, job.user_id, json.loads(job.filters), path)
+    except Exception as exc:
+        conn.rollback()
+        log.exception("report job %s failed", job.job_id)
+        cursor.execute(
+            "UPDATE report_jobs SET status = ?, error = ?, finished_at = ? WHERE job_id = ?",
+            FAILED, str(exc)[:1000], datetime.now(), job.job_id,
+        )
+    else:
+        cursor.execute(
+            "UPDATE report_jobs SET status = ?, file_path = ?, finished_at = ? WHERE job_id = ?",
+            DONE, path, datetime.now(), job.job_id,
+        )
+    conn.commit()
+
+
+def work(reports_dir=REPORTS_DIR, poll=1.0, once=False):
+    """Claim and render jobs until stopped (or, with ``once``, until the queue is empty)."""
+    os.makedirs(reports_dir, exist_ok=True)
+    while True:
+        with db.get_pool().connection() as conn:
+            job = claim_next(conn.cursor())
+            conn.commit()
+            if job is not None:
+                run_job(conn, job, reports_dir)
+                continue
+        if once:
+            return
+        time.sleep(poll)
+
+
+def _worker(reports_dir, poll, once):
+    logging.basicConfig(level=logging.INFO, format="%(processName)s %(message)s")
+    try:
+        work(reports_dir, poll, once)
+    except KeyboardInterrupt:
+        pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render queued PDF reports.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--poll", type=float, default=1.0, help="seconds between polls of an empty queue")
+    parser.add_argument("--dir", default=REPORTS_DIR)
+    parser.add_argument("--once", action="store_true", help="exit once the queue is empty")
+    args = parser.parse_args(argv)
+
+    db.configure()
+    workers = [
+        multiprocessing.Process(target=_worker, args=(args.dir, args.poll, args.once), name=f"report-worker-{n}")
+        for n in range(max(args.workers, 1))
+    ]
+    for process in workers:
+        process.start()
+    try:
+        for process in workers:
+            process.join()
+    except KeyboardInterrupt:
+        for process in workers:
+            process.terminate()
+
+
+if __name__ == "__main__":
+    main()
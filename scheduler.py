@@ -0,0 +1,178 @@
+"""Scheduled jobs: recurring transactions, bill reminders and balance
+snapshots for every user.
+
+Each worker process owns one shard, a contiguous user_id range, and works
+through it ``--batch-users`` ids at a time.  A batch's writes and its
+``scheduler_checkpoints`` row commit together, so if a worker dies the next
+run of that shard resumes after the last finished batch (with the original
+run date) instead of starting over.
+
+Shard 0 also deletes expired ``app_sessions`` rows (SESSION_BACKEND=db)
+after each pass.
+
+Usage:
+  python scheduler.py                          # every hour, one shard per CPU
+  python scheduler.py --shards 4 --interval 900
+  python scheduler.py --once                   # a single pass, then exit
+"""
+import argparse
+import logging
+import multiprocessing
+import os
+import time
+from datetime import date, datetime
+
+import db
+from db import ledger, recurrence, reminders, session_store
+
+BATCH_USERS = 500
+
+log = logging.getLogger("scheduler")
+
+
+def shard_range(cursor, shard, shards):
+    """Inclusive ``(first, last)`` user_id range for a shard, or None if it is empty."""
+    cursor.execute("SELECT MIN(user_id) AS low, MAX(user_id) AS high FROM users")
+    bounds = cursor.fetchone()
+    if bounds.low is None:
+        return None
+    span = (bounds.high - bounds.low) // shards + 1
+    first = bounds.low + shard * span
+    last = bounds.high if shard == shards - 1 else min(first + span - 1, bounds.high)
+    return (first, last) if first <= last else None
+
+
+def start_or_resume(cursor, name, shard, shards, today):
+    """Return ``(run_date, next_user_id, last_user_id)`` for this pass, or None."""
+    cursor.execute(
+        """
+        SELECT run_date, next_user_id, last_user_id FROM scheduler_checkpoints
+        WHERE shard = ? AND finished_at IS NULL
+        """,
+        name,
+    )
+    unfinished = cursor.fetchone()
+    if unfinished is not None:
+        log.info("shard %s resuming run of %s at user %s", name, unfinished.run_date, unfinished.next_user_id)
+        return unfinished.run_date, unfinished.next_user_id, unfinished.last_user_id
+
+    users = shard_range(cursor, shard, shards)
+    if users is None:
+        return None
+    cursor.execute("DELETE FROM scheduler_checkpoints WHERE shard = ?", name)
+    cursor.execute(
+        """
+        INSERT INTO scheduler_checkpoints (shard, run_date, first_user_id, last_user_id, next_user_id)
+        VALUES (?, ?, ?, ?, ?)
+        """,
+        name, today, users[0], users[1], users[0],
+    )
+    return today, users[0], users[1]
+
+
+def run_batch(cursor, run_date, first, last):
+    generated = recurrence.generate_due(cursor, today=run_date, users=(first, last))
+    notified = reminders.notify_upcoming_bills(cursor, today=run_date, users=(first, last))
+    ledger.checkpoint(cursor, users=(first, last))
+    return generated, len(notified)
+
+
+def run_shard(shard, shards, today=None, batch_users=BATCH_USERS):
+    """One pass over a shard's users; returns ``(transactions, users_notified)``."""
+    name = f"{shard}/{shards}"
+    totals = [0, 0]
+    with db.get_pool().connection() as conn:
+        cursor = conn.cursor()
+        run = start_or_resume(cursor, name, shard, shards, today or date.today())
+        conn.commit()
+        if run is None:
+            return tuple(totals)
+        run_date, next_user, last_user = run
+
+        while next_user <= last_user:
+            batch_last = min(next_user + batch_users - 1, last_user)
+            generated, notified = run_batch(cursor, run_date, next_user, batch_last)
+            totals[0] += generated
+            totals[1] += notified
+            cursor.execute(
+                "UPDATE scheduler_checkpoints SET next_user_id = ?, updated_at = ? WHERE shard = ?",
+                batch_last + 1, datetime.now(), name,
+            )
+            conn.commit()
+            next_user = batch_last + 1
+
+        cursor.execute("UPDATE scheduler_checkpoints SET finished_at = ? WHERE shard = ?", datetime.now(), name)
+        conn.commit()
+    log.info("shard %s: %s transaction(s) generated, %s user(s) notified", name, *totals)
+    return tuple(totals)
+
+
+def sweep_sessions(now=None, batch=session_store.SESSION_SWEEP_BATCH):
+    """Delete every expired app_sessions row, one committed batch at a time."""
+    now = time.time() if now is None else now
+    deleted = 0
+    with db.get_pool().connection() as conn:
+        cursor = conn.cursor()
+        while True:
+            swept = session_store.sweep(cursor, now, batch)
+            conn.commit()
+            deleted += swept
+            if swept < batch:
+                break
+    if deleted:
+        log.info("swept %s expired session(s)", deleted)
+    return deleted
+
+
+def _worker(shard, shards, interval, batch_users, once):
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(processName)s %(message)s")
+    try:
+        while True:
+            started = time.monotonic()
+            try:
+                run_shard(shard, shards, batch_users=batch_users)
+            except Exception:
+                # The checkpoint keeps the progress; the next tick resumes it
+                log.exception("shard %s/%s failed", shard, shards)
+            if shard == 0:
+                try:
+                    sweep_sessions()
+                except Exception:
+                    log.exception("session sweep failed")
+            if once:
+                return
+            time.sleep(max(interval - (time.monotonic() - started), 0))
+    except KeyboardInterrupt:
+        pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run recurring transactions and bill reminders for all users.")
+    parser.add_argument("--shards", type=int, default=os.cpu_count() or 1, help="worker processes / user_id ranges")
+    parser.add_argument("--interval", type=float, default=3600, help="seconds between passes")
+    parser.add_argument("--batch-users", type=int, default=BATCH_USERS, help="user_ids per committed batch")
+    parser.add_argument("--once", action="store_true", help="make one pass and exit")
+    args = parser.parse_args(argv)
+
+    db.configure()
+    shards = max(args.shards, 1)
+    workers = [
+        multiprocessing.Process(
+            target=_worker,
+            args=(shard, shards, args.interval, args.batch_users, args.once),
+            name=f"scheduler-{shard}",
+        )
+        for shard in range(shards)
+    ]
+    for process in workers:
+        process.start()
+    try:
+        for process in workers:
+            process.join()
+    except KeyboardInterrupt:
+        for process in workers:
+            process.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,4 @@
+"""Maintenance and benchmark scripts, run as ``python scripts/<name>.py``.
+
+A package so tests can import them (``from scripts.init_db import migrate``).
+"""
@@ -0,0 +1,76 @@
+"""Compare the sync (WSGI) and async (ASGI) serving modes under the same load.
+
+Usage:
+  python scripts/bench_asgi.py                                  # 500 clients, 60s per mode
+  python scripts/bench_asgi.py --clients 200 --duration 30 --out-dir results/
+
+Runs scripts/bench_routes.py twice with the same seed, users and client
+count: ``my_app:app`` on a threaded Werkzeug server, then ``asgi:application``
+on uvicorn.  Both JSON results are kept (``sync.json``, ``async.json``) and
+the summary shows, for the pages asgi.py serves asynchronously and for the
+whole mix, throughput and p50/p95/p99 in each mode.  Exits 1 if either run
+had errors.  ``bench_routes.py --compare sync.json async.json`` gives the
+per-route p95 change for every route.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import bench_routes  # noqa: E402
+
+MODES = [("sync", "werkzeug"), ("async", "uvicorn")]
+# Routes handled by asgi.py's async handlers
+ASYNC_ROUTES = [
+    "GET /dashboard", "GET /transactions", "GET /transactions?keyword", "GET /budgets",
+    "GET /analysis", "GET /notifications",
+]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--duration", type=float, default=60, help="seconds of mixed traffic per mode")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--transactions", type=int, default=2000, help="per user")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--sync-app", default="my_app:app")
+    parser.add_argument("--async-app", default="asgi:application")
+    parser.add_argument("--out-dir", help="keep sync.json/async.json here (default: a temp dir)")
+    args = parser.parse_args(argv)
+
+    out_dir = args.out_dir or tempfile.mkdtemp(prefix="bench_asgi_")
+    os.makedirs(out_dir, exist_ok=True)
+    results, failed = {}, False
+    apps = {"sync": args.sync_app, "async": args.async_app}
+    for mode, server in MODES:
+        path = os.path.join(out_dir, f"{mode}.json")
+        print(f"{mode}: {args.clients} clients for {args.duration:g}s ...", file=sys.stderr)
+        with contextlib.redirect_stdout(io.StringIO()):
+            failed |= bool(bench_routes.main([
+                "--clients", str(args.clients), "--duration", str(args.duration), "--users", str(args.users),
+                "--transactions", str(args.transactions), "--seed", str(args.seed), "--out", path,
+                "--app", apps[mode], "--server", server,
+            ]))
+        with open(path) as f:
+            results[mode] = json.load(f)
+
+    columns = [("requests", "requests"), ("errors", "errors"), ("req/s", "requests_per_second"),
+               ("p50_ms", "p50_ms"), ("p95_ms", "p95_ms"), ("p99_ms", "p99_ms")]
+    print(f"{'route':28} {'mode':6} " + " ".join(f"{label:>9}" for label, _ in columns))
+    for name in ASYNC_ROUTES + ["all routes"]:
+        for mode, _ in MODES:
+            stats = results[mode]["totals"] if name == "all routes" else results[mode]["routes"].get(name)
+            if stats is not None:
+                print(f"{name:28} {mode:6} " + " ".join(f"{stats.get(key, '-'):>9}" for _, key in columns))
+    print(f"results: {out_dir}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,317 @@
+"""Seed a database with synthetic users for the route benchmarks.
+
+Usage:
+  python scripts/bench_data.py --users 100 --transactions 2000            # DB from env vars
+  python scripts/bench_data.py --db /tmp/bench.db --users 20 --seed 7     # SQLite file
+
+Every user gets accounts, two years of transactions, monthly budgets,
+recurring rules, bills, savings goals with history, debts and
+notifications.  Transactions go through the same aggregate, ledger and
+search-index helpers as the write routes, so derived tables match.
+
+Each user also gets one extra "Disposable" row per table; the benchmark's
+delete routes remove those, so repeated runs see the same data shape.  All
+users share the password ``PASSWORD``.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from init_db import apply_baseline, migrate  # noqa: E402
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from werkzeug.security import generate_password_hash  # noqa: E402
+
+import db  # noqa: E402
+from db import aggregates, ledger, search  # noqa: E402
+from db.config import DBConfig  # noqa: E402
+from db.dialect import engine_name, month_bounds  # noqa: E402
+
+PASSWORD = "bench-password"
+RECOVERY_HINT = "bench"
+HISTORY_DAYS = 730
+
+EXPENSE_CATEGORIES = ["Groceries", "Rent", "Dining", "Transport", "Utilities", "Entertainment", "Health"]
+INCOME_CATEGORIES = ["Salary", "Freelance"]
+MERCHANTS = {
+    "Groceries": ["Supermarket", "Farmers market", "Corner store"],
+    "Rent": ["Monthly rent"],
+    "Dining": ["Coffee shop", "Pizza place", "Sushi bar", "Lunch downtown"],
+    "Transport": ["Gas station", "Train ticket", "Taxi ride", "Parking"],
+    "Utilities": ["Electric bill", "Water bill", "Internet provider", "Phone plan"],
+    "Entertainment": ["Cinema tickets", "Concert", "Streaming service", "Bookstore"],
+    "Health": ["Pharmacy", "Gym membership", "Dentist"],
+    "Salary": ["Payroll"],
+    "Freelance": ["Freelance invoice", "Consulting"],
+}
+
+# Fixture keys: table, id column
+FIXTURE_TABLES = {
+    "transaction": ("transactions", "transaction_id"),
+    "account": ("user_accounts", "account_id"),
+    "budget": ("budgets", "budget_id"),
+    "recurring": ("recurring_transactions", "recurring_id"),
+    "bill": ("bill_reminders", "bill_id"),
+    "goal": ("savings_goals", "goal_id"),
+    "debt": ("debts", "debt_id"),
+    "notification": ("notifications", "notification_id"),
+}
+
+
+def email(prefix, n):
+    return f"{prefix}{n}@example.com"
+
+
+def _categories(cursor):
+    """Global ``{name: (category_id, type)}``, creating the benchmark ones if missing."""
+    wanted = [(name, "expense") for name in EXPENSE_CATEGORIES] + [(name, "income") for name in INCOME_CATEGORIES]
+    cursor.execute("SELECT category_id, category_name, category_type FROM categories WHERE user_id IS NULL")
+    found = {row.category_name: (row.category_id, row.category_type) for row in cursor.fetchall()}
+    missing = [row for row in wanted if row[0] not in found]
+    if missing:
+        cursor.executemany("INSERT INTO categories (category_name, category_type) VALUES (?, ?)", missing)
+        return _categories(cursor)
+    return {name: found[name] for name, _ in wanted}
+
+
+def _users(cursor, prefix, users):
+    password_hash = generate_password_hash(PASSWORD)
+    cursor.executemany(
+        "INSERT INTO users (full_name, email, password_hash, recovery_hint, created_at) VALUES (?, ?, ?, ?, ?)",
+        [(f"Bench User {n}", email(prefix, n), password_hash, RECOVERY_HINT, datetime.now())
+         for n in range(1, users + 1)],
+    )
+    cursor.execute("SELECT user_id, email FROM users WHERE email LIKE ?", f"{prefix}%@example.com")
+    by_email = {row.email: row.user_id for row in cursor.fetchall()}
+    return [by_email[email(prefix, n)] for n in range(1, users + 1)]
+
+
+def _transactions(cursor, user_id, accounts, categories, count, today, rng):
+    first_day = today - timedelta(days=HISTORY_DAYS)
+    names = list(categories)
+    weights = [1 if categories[name][1] == "expense" else 0.15 for name in names]
+    rows = []
+    for n in range(count):
+        name = rng.choices(names, weights)[0]
+        category_id, kind = categories[name]
+        amount = round(rng.uniform(1500, 4000) if kind == "income" else rng.lognormvariate(3.2, 0.9), 2)
+        when = first_day + timedelta(days=n * HISTORY_DAYS // max(count, 1))
+        rows.append((user_id, category_id, amount, kind, when, rng.choice(MERCHANTS[name]), rng.choice(accounts)))
+    # Dates rise with transaction_id, as for entered and imported data
+    cursor.executemany(
+        """
+        INSERT INTO transactions (user_id, category_id, amount, transaction_type,
+                                  transaction_date, description, account_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+        rows,
+    )
+    search.index_inserted(cursor, len(rows))
+    aggregates.record_many(cursor, [(user_id, row[1], row[3], row[4], row[2], 1) for row in rows])
+    balances = defaultdict(float)
+    for row in rows:
+        balances[row[6]] += ledger.signed(row[3], row[2])
+    ledger.post_many(cursor, [(user_id, account_id, round(delta, 2), ledger.TRANSACTION, None)
+                              for account_id, delta in balances.items()])
+
+
+def _disposable(cursor, user_id, account_id, category_id, today):
+    """One throwaway row per table for the delete routes."""
+    cursor.execute(
+        "INSERT INTO user_accounts (user_id, account_name, account_type, current_balance) VALUES (?, 'Disposable', 'bank', 0)",
+        user_id,
+    )
+    cursor.execute(
+        """
+        INSERT INTO transactions (user_id, category_id, amount, transaction_type, transaction_date, description, account_id)
+        VALUES (?, ?, 1, 'expense', ?, 'Disposable', ?)
+        """,
+        user_id, category_id, today, account_id,
+    )
+    search.index_inserted(cursor, 1)
+    aggregates.record_transaction(cursor, user_id, category_id, "expense", today, 1)
+    ledger.post(cursor, user_id, account_id, -1)
+    cursor.execute(
+        "INSERT INTO budgets (user_id, category_id, budget_amount, budget_month) VALUES (?, ?, 1, ?)",
+        user_id, category_id, month_bounds(today + timedelta(days=400))[0],
+    )
+    cursor.execute(
+        """
+        INSERT INTO recurring_transactions (user_id, category_id, account_id, amount, transaction_type,
+                                            frequency, start_date, description, last_generated_date, is_active)
+        VALUES (?, ?, ?, 1, 'expense', 'monthly', ?, 'Disposable', ?, 0)
+        """,
+        user_id, category_id, account_id, today, today,
+    )
+    cursor.execute(
+        "INSERT INTO bill_reminders (user_id, bill_name, amount, due_date) VALUES (?, 'Disposable', 1, ?)",
+        user_id, today + timedelta(days=90),
+    )
+    cursor.execute(
+        "INSERT INTO savings_goals (user_id, goal_name, target_amount, target_date) VALUES (?, 'Disposable', 1, ?)",
+        user_id, today + timedelta(days=90),
+    )
+    cursor.execute(
+        "INSERT INTO debts (user_id, lender_name, total_amount, due_date) VALUES (?, 'Disposable', 1, ?)",
+        user_id, today + timedelta(days=90),
+    )
+    cursor.execute(
+        "INSERT INTO notifications (user_id, notification_type, message) VALUES (?, 'info', 'Disposable')",
+        user_id,
+    )
+
+
+def fixtures(cursor, user_ids):
+    """``{user_id: {"transaction": id, ..., "disposable": {"transaction": id, ...}}}``.
+
+    The regular id is each user's oldest row; the disposable one is the
+    user's newest row named "Disposable", if it still exists.  ``category``
+    is a global expense category.
+    """
+    cursor.execute("SELECT MIN(category_id) AS category_id FROM categories WHERE user_id IS NULL AND category_type = 'expense'")
+    category_id = cursor.fetchone().category_id
+    found = {user_id: {"category": category_id, "disposable": {}} for user_id in user_ids}
+    for key, (table, column) in FIXTURE_TABLES.items():
+        cursor.execute(
+            f"SELECT user_id, MIN({column}) AS first_id FROM {table} "
+            f"WHERE user_id BETWEEN ? AND ? GROUP BY user_id",
+            min(user_ids), max(user_ids),
+        )
+        for row in cursor.fetchall():
+            if row.user_id in found:
+                found[row.user_id][key] = row.first_id
+    marked = {
+        "transaction": "description", "account": "account_name", "recurring": "description",
+        "bill": "bill_name", "goal": "goal_name", "debt": "lender_name", "notification": "message",
+    }
+    for key, (table, column) in FIXTURE_TABLES.items():
+        if key == "budget":
+            where = "budget_amount = 1"
+        else:
+            where = f"{marked[key]} = 'Disposable'"
+        cursor.execute(
+            f"SELECT user_id, MAX({column}) AS last_id FROM {table} "
+            f"WHERE user_id BETWEEN ? AND ? AND {where} GROUP BY user_id",
+            min(user_ids), max(user_ids),
+        )
+        for row in cursor.fetchall():
+            if row.user_id in found:
+                found[row.user_id]["disposable"][key] = row.last_id
+    return found
+
+
+def generate(cursor, users, transactions, rng, prefix="bench", today=None):
+    """Create ``users`` synthetic users; returns their user_ids.  The caller commits."""
+    today = today or date.today()
+    if engine_name() == "mssql":
+        cursor.fast_executemany = True
+    categories = _categories(cursor)
+    expense_ids = [categories[name][0] for name in EXPENSE_CATEGORIES]
+    user_ids = _users(cursor, prefix, users)
+
+    for user_id in user_ids:
+        for name, kind, opening in (("Checking", "bank", 2500), ("Credit Card", "credit", -400)):
+            cursor.execute(
+                "INSERT INTO user_accounts (user_id, account_name, account_type, current_balance) VALUES (?, ?, ?, ?)",
+                user_id, name, kind, opening,
+            )
+        cursor.execute("SELECT account_id, current_balance FROM user_accounts WHERE user_id = ? ORDER BY account_id",
+                       user_id)
+        accounts = cursor.fetchall()
+        for account in accounts:
+            ledger.open_account(cursor, user_id, account.account_id, account.current_balance)
+        account_ids = [account.account_id for account in accounts]
+
+        _transactions(cursor, user_id, account_ids, categories, transactions, today, rng)
+
+        month = month_bounds(today)[0]
+        months = []
+        for _ in range(12):
+            months.append(month)
+            month = month_bounds(month - timedelta(days=1))[0]
+        cursor.executemany(
+            "INSERT INTO budgets (user_id, category_id, budget_amount, budget_month, alert_threshold) VALUES (?, ?, ?, ?, ?)",
+            [(user_id, category_id, rng.choice([100, 200, 400, 800]), start, 90)
+             for start in months for category_id in expense_ids],
+        )
+        rules = [("Rent", "monthly", 1400), ("Groceries", "weekly", 90), ("Utilities", "monthly", 120),
+                 ("Salary", "monthly", 3200), ("Entertainment", "yearly", 150)]
+        cursor.executemany(
+            """
+            INSERT INTO recurring_transactions (user_id, category_id, account_id, amount, transaction_type,
+                                                frequency, start_date, description, last_generated_date, is_active)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 1)
+            """,
+            [(user_id, categories[name][0], account_ids[0], amount, categories[name][1], frequency,
+              today - timedelta(days=365), MERCHANTS[name][0], today) for name, frequency, amount in rules],
+        )
+        cursor.executemany(
+            "INSERT INTO bill_reminders (user_id, bill_name, amount, due_date, status) VALUES (?, ?, ?, ?, ?)",
+            [(user_id, name, amount, today + timedelta(days=offset), "pending")
+             for name, amount, offset in (("Phone plan", 60, 3), ("Internet provider", 80, 9),
+                                          ("Electric bill", 95, 16), ("Insurance", 140, 24), ("Water bill", 40, 45))],
+        )
+        for name, target in (("Emergency fund", 10000), ("Vacation", 3000), ("New laptop", 1800)):
+            cursor.execute(
+                "INSERT INTO savings_goals (user_id, goal_name, target_amount, current_amount, target_date) VALUES (?, ?, ?, 0, ?)",
+                user_id, name, target, today + timedelta(days=rng.randrange(90, 720)),
+            )
+        cursor.execute("SELECT goal_id FROM savings_goals WHERE user_id = ?", user_id)
+        history = [(row.goal_id, round(rng.uniform(20, 300), 2), datetime.now() - timedelta(days=30 * n))
+                   for row in cursor.fetchall() for n in range(6)]
+        cursor.executemany(
+            "INSERT INTO savings_history (goal_id, amount, contribution_date) VALUES (?, ?, ?)", history
+        )
+        cursor.executemany(
+            "UPDATE savings_goals SET current_amount = current_amount + ? WHERE goal_id = ?",
+            [(amount, goal_id) for goal_id, amount, _ in history],
+        )
+        cursor.executemany(
+            "INSERT INTO debts (user_id, lender_name, total_amount, paid_amount, interest_rate, due_date) VALUES (?, ?, ?, ?, ?, ?)",
+            [(user_id, "Car loan", 18000, 6500, 4.9, today + timedelta(days=900)),
+             (user_id, "Student loan", 24000, 9000, 3.1, today + timedelta(days=2400))],
+        )
+        cursor.executemany(
+            "INSERT INTO notifications (user_id, notification_type, message, is_read, created_at) VALUES (?, ?, ?, ?, ?)",
+            [(user_id, "bill_reminder" if n % 2 else "budget_alert", f"Synthetic notification {n}", n % 3 == 0,
+              datetime.now() - timedelta(hours=n)) for n in range(10)],
+        )
+
+    # After every regular row, so each user's disposable rows have the highest ids
+    for user_id in user_ids:
+        cursor.execute("SELECT MIN(account_id) AS account_id FROM user_accounts WHERE user_id = ?", user_id)
+        _disposable(cursor, user_id, cursor.fetchone().account_id, expense_ids[0], today)
+    return user_ids
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--transactions", type=int, default=2000, help="per user")
+    parser.add_argument("--prefix", default="bench", help="email prefix (emails are unique per DB)")
+    parser.add_argument("--db", help="SQLite file to create or extend (default: DB from env vars)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    if args.db:
+        db.configure(DBConfig("sqlite", args.db, None, 1, 1, 30, 300, 3600))
+    with db.get_pool().connection() as conn:
+        if args.db:
+            apply_baseline(conn, "sqlite")
+        migrate(conn, db.get_config().engine, log=lambda msg: None)
+        user_ids = generate(conn.cursor(), args.users, args.transactions, random.Random(args.seed), args.prefix)
+        conn.commit()
+    print(json.dumps({"users": len(user_ids), "first_user_id": user_ids[0], "last_user_id": user_ids[-1],
+                      "transactions_per_user": args.transactions}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""Benchmark the bulk CSV import against a fresh SQLite DB.
+
+Usage:
+  python scripts/bench_import.py                       # 1M rows, 60s target
+  python scripts/bench_import.py --rows 100000 --batch-size 10000
+
+Writes a synthetic CSV (same columns as the CSV export plus Account), then
+times imports.import_transactions on it, including the aggregate and
+balance updates, and exits 1 if it misses ``--target-seconds``.
+"""
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from init_db import apply_baseline, migrate  # noqa: E402
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import db  # noqa: E402
+import imports  # noqa: E402
+from db.config import DBConfig  # noqa: E402
+
+CATEGORIES = ["Food", "Rent", "Travel", "Utilities", "Salary", "Fun"]
+ACCOUNTS = ["Checking", "Savings", "Card"]
+
+
+def write_csv(path, rows, rng):
+    first_day = date(2015, 1, 1)
+    span = (date.today() - first_day).days
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Date", "Type", "Category", "Amount", "Description", "Account"])
+        for n in range(rows):
+            writer.writerow([
+                (first_day + timedelta(days=rng.randrange(span))).isoformat(),
+                "income" if rng.random() < 0.2 else "expense",
+                rng.choice(CATEGORIES),
+                f"{rng.uniform(1, 500):.2f}",
+                f"imported {n}",
+                rng.choice(ACCOUNTS),
+            ])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=imports.IMPORT_BATCH_SIZE)
+    parser.add_argument("--target-seconds", type=float, default=60)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="bench_import_")
+    csv_path = os.path.join(workdir, "import.csv")
+    db_path = os.path.join(workdir, "import.db")
+    write_csv(csv_path, args.rows, random.Random(args.seed))
+
+    db.configure(DBConfig("sqlite", db_path, None, 1, 1, 30, 300, 3600))
+    with db.get_pool().connection() as conn:
+        apply_baseline(conn, "sqlite")
+        migrate(conn, "sqlite", log=lambda msg: None)
+        cursor = conn.cursor()
+        cursor.execute("INSERT INTO users (full_name, email, password_hash) VALUES ('Bench', 'bench@local', 'x')")
+        cursor.executemany(
+            "INSERT INTO categories (category_name, category_type) VALUES (?, 'expense')",
+            [(name,) for name in CATEGORIES],
+        )
+        cursor.executemany(
+            "INSERT INTO user_accounts (user_id, account_name, account_type, current_balance) VALUES (1, ?, 'bank', 0)",
+            [(name,) for name in ACCOUNTS],
+        )
+        conn.commit()
+
+        cursor.execute("SELECT category_id, category_name, category_type FROM categories")
+        categories = cursor.fetchall()
+        cursor.execute("SELECT account_id, account_name FROM user_accounts WHERE user_id = 1")
+        mapper = imports.RowMapper(categories, cursor.fetchall())
+
+        started = time.perf_counter()
+        with open(csv_path, "rb") as f:
+            for progress in imports.import_transactions(
+                cursor, 1, imports.read_csv(f), mapper, batch_size=args.batch_size
+            ):
+                pass
+        conn.commit()
+        elapsed = time.perf_counter() - started
+
+    for name in os.listdir(workdir):
+        os.remove(os.path.join(workdir, name))
+    os.rmdir(workdir)
+
+    result = {
+        "rows": args.rows,
+        "imported": progress["imported"],
+        "failed": progress["failed"],
+        "seconds": round(elapsed, 2),
+        "rows_per_second": round(progress["imported"] / elapsed),
+        "target_seconds": args.target_seconds,
+    }
+    print(json.dumps(result, indent=2))
+    return 0 if elapsed <= args.target_seconds else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
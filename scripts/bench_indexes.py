@@ -0,0 +1,160 @@
+"""Benchmark the covering indexes from migration 0002 on a seeded SQLite DB.
+
+Usage:
+  python scripts/bench_indexes.py                      # 10M transactions
+  python scripts/bench_indexes.py --rows 1000000 --users 500 --db /tmp/bench.db
+
+Seeds the schema up to migration 0001, records the query plan and timing of
+each hot query, applies the remaining migrations and records them again.
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from init_db import apply_baseline, migrate  # noqa: E402
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from db.engines import SQLiteConnection  # noqa: E402
+
+BATCH = 50_000
+FIRST_DAY = date(2015, 1, 1)
+
+# (label, sql, params) -- params use {user} / {category} / {month} / {next_month}
+HOT_QUERIES = [
+    (
+        "transactions: user history newest first",
+        """SELECT transaction_id, amount, transaction_type, transaction_date, description
+           FROM transactions WHERE user_id = ? ORDER BY transaction_date DESC LIMIT 50""",
+        ("{user}",),
+    ),
+    (
+        "dashboard: month expenses",
+        """SELECT SUM(amount) FROM transactions
+           WHERE user_id = ? AND transaction_type = 'expense' AND transaction_date >= ?""",
+        ("{user}", "{month}"),
+    ),
+    (
+        "budgets: spend per category/month",
+        """SELECT SUM(amount) FROM transactions
+           WHERE user_id = ? AND category_id = ? AND transaction_type = 'expense'
+             AND transaction_date >= ? AND transaction_date < ?""",
+        ("{user}", "{category}", "{month}", "{next_month}"),
+    ),
+    (
+        "budgets: lookup by (user, category, month)",
+        """SELECT budget_amount FROM budgets
+           WHERE user_id = ? AND category_id = ? AND budget_month = ?""",
+        ("{user}", "{category}", "{month}"),
+    ),
+]
+
+
+def seed(conn, rows, users, categories, rng):
+    cursor = conn.cursor()
+    cursor.executemany(
+        "INSERT INTO users (full_name, email, password_hash) VALUES (?, ?, 'x')",
+        ((f"User {u}", f"user{u}@bench.local") for u in range(1, users + 1)),
+    )
+    cursor.executemany(
+        "INSERT INTO categories (category_name, category_type) VALUES (?, 'expense')",
+        ((f"Category {c}",) for c in range(1, categories + 1)),
+    )
+    span = (date.today() - FIRST_DAY).days
+
+    def transaction_rows(count):
+        for _ in range(count):
+            kind = "income" if rng.random() < 0.2 else "expense"
+            day = FIRST_DAY + timedelta(days=rng.randrange(span))
+            yield (
+                rng.randint(1, users),
+                rng.randint(1, categories),
+                round(rng.uniform(1, 500), 2),
+                kind,
+                day.isoformat(),
+                "bench",
+                rng.randint(1, users),
+            )
+
+    for start in range(0, rows, BATCH):
+        cursor.executemany(
+            """INSERT INTO transactions (user_id, category_id, amount, transaction_type,
+                                         transaction_date, description, account_id)
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            transaction_rows(min(BATCH, rows - start)),
+        )
+        conn.commit()
+
+    # Two years of monthly budgets per user and category
+    months = [date(y, m, 1) for y in (date.today().year - 1, date.today().year) for m in range(1, 13)]
+    cursor.executemany(
+        """INSERT INTO budgets (user_id, category_id, budget_amount, budget_month)
+           VALUES (?, ?, 1000, ?)""",
+        ((u, c, m.isoformat()) for u in range(1, users + 1) for c in range(1, categories + 1) for m in months),
+    )
+    conn.commit()
+
+
+def measure(conn, user, category, repeat):
+    today = date.today()
+    month = today.replace(day=1)
+    next_month = (month + timedelta(days=32)).replace(day=1)
+    values = {"{user}": user, "{category}": category, "{month}": month.isoformat(), "{next_month}": next_month.isoformat()}
+
+    results = {}
+    for label, sql, params in HOT_QUERIES:
+        bound = tuple(values[p] for p in params)
+        plan = [row[-1] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, bound).fetchall()]
+        start = time.perf_counter()
+        for _ in range(repeat):
+            conn.execute(sql, bound).fetchall()
+        elapsed = (time.perf_counter() - start) / repeat
+        results[label] = {"plan": plan, "ms": round(elapsed * 1000, 3)}
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--users", type=int, default=2_000)
+    parser.add_argument("--categories", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--db", default="bench_indexes.db")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    if os.path.exists(args.db):
+        os.remove(args.db)
+    raw = sqlite3.connect(args.db)
+    conn = SQLiteConnection(raw)
+    rng = random.Random(args.seed)
+
+    apply_baseline(conn, "sqlite")
+    migrate(conn, "sqlite", target=1, log=lambda msg: None)
+
+    print(f"Seeding {args.rows:,} transactions for {args.users:,} users ...", file=sys.stderr)
+    started = time.perf_counter()
+    seed(raw, args.rows, args.users, args.categories, rng)
+    print(f"Seeded in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+    user, category = rng.randint(1, args.users), rng.randint(1, args.categories)
+    before = measure(raw, user, category, args.repeat)
+    migrate(conn, "sqlite", log=lambda msg: print(msg, file=sys.stderr))
+    after = measure(raw, user, category, args.repeat)
+    raw.close()
+
+    report = {
+        label: {"before": before[label], "after": after[label]} for label in before
+    }
+    print(json.dumps({"rows": args.rows, "users": args.users, "queries": report}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""Benchmark recurring-transaction generation on a seeded SQLite DB.
+
+Usage:
+  python scripts/bench_recurring.py                    # 100k rules
+  python scripts/bench_recurring.py --rules 10000 --days-behind 90 --db /tmp/bench.db
+
+Seeds active daily/weekly/monthly/yearly rules that last ran up to
+``--days-behind`` days ago, then times the per-rule loop generate_recurring
+used to run (one occurrence per rule, one INSERT + UPDATE each) against the
+set-based catch-up in db/recurrence.py on copies of the same data.
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from init_db import apply_baseline, migrate  # noqa: E402
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import db  # noqa: E402
+from db import recurrence  # noqa: E402
+from db.config import DBConfig  # noqa: E402
+from db.engines import SQLiteConnection  # noqa: E402
+
+
+def seed(path, rules, users, days_behind, rng):
+    conn = SQLiteConnection(sqlite3.connect(path, detect_types=sqlite3.PARSE_DECLTYPES))
+    apply_baseline(conn, "sqlite")
+    migrate(conn, "sqlite", log=lambda msg: None)
+    cursor = conn.cursor()
+    today = date.today()
+    cursor.executemany(
+        "INSERT INTO user_accounts (user_id, account_name, account_type, current_balance) VALUES (?, 'Main', 'bank', 0)",
+        ((u,) for u in range(1, users + 1)),
+    )
+
+    def rule_rows():
+        for _ in range(rules):
+            start = today - timedelta(days=rng.randrange(days_behind, days_behind + 3 * 365))
+            user = rng.randint(1, users)
+            yield (
+                user,
+                rng.randint(1, 20),
+                user,
+                round(rng.uniform(1, 500), 2),
+                "income" if rng.random() < 0.2 else "expense",
+                rng.choice(recurrence.FREQUENCIES),
+                start,
+                today - timedelta(days=rng.randrange(1, days_behind + 1)),
+            )
+
+    cursor.executemany(
+        """INSERT INTO recurring_transactions (user_id, category_id, account_id, amount, transaction_type,
+                                               frequency, start_date, last_generated_date, is_active)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, 1)""",
+        rule_rows(),
+    )
+    conn.commit()
+    conn.close()
+
+
+def legacy_loop(path, today):
+    """The per-rule loop generate_recurring ran before the set-based engine."""
+    conn = sqlite3.connect(path, detect_types=sqlite3.PARSE_DECLTYPES)
+    conn.row_factory = sqlite3.Row
+    generated = 0
+    for r in conn.execute("SELECT * FROM recurring_transactions WHERE is_active = 1").fetchall():
+        last_date = r["last_generated_date"] or r["start_date"]
+        if r["frequency"] == "daily":
+            next_due = last_date + timedelta(days=1)
+        elif r["frequency"] == "weekly":
+            next_due = last_date + timedelta(weeks=1)
+        elif r["frequency"] == "monthly":
+            next_due = (last_date.replace(day=1) + timedelta(days=32)).replace(day=1)
+        else:
+            next_due = last_date.replace(year=last_date.year + 1)
+        if today >= next_due:
+            conn.execute(
+                """INSERT INTO transactions (user_id, category_id, amount, transaction_type, transaction_date,
+                                             description, account_id, is_recurring_generated)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, 1)""",
+                (r["user_id"], r["category_id"], r["amount"], r["transaction_type"], today,
+                 r["description"], r["account_id"]),
+            )
+            conn.execute(
+                "UPDATE recurring_transactions SET last_generated_date = ? WHERE recurring_id = ?",
+                (today, r["recurring_id"]),
+            )
+            generated += 1
+    conn.commit()
+    conn.close()
+    return generated
+
+
+def set_based(path, today, batch_size):
+    db.configure(DBConfig("sqlite", path, None, 1, 1, 30, 300, 3600))
+    with db.get_pool().connection() as conn:
+        generated = recurrence.generate_due(conn.cursor(), today=today, batch_size=batch_size)
+        conn.commit()
+    db.get_pool().close()
+    return generated
+
+
+def timed(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - started
+    return {"transactions": result, "seconds": round(elapsed, 3), "rows_per_second": round(result / elapsed)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rules", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=5_000)
+    parser.add_argument("--days-behind", type=int, default=30, help="max days since a rule last ran")
+    parser.add_argument("--batch-size", type=int, default=recurrence.RULES_BATCH_SIZE)
+    parser.add_argument("--db", default="bench_recurring.db")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    if os.path.exists(args.db):
+        os.remove(args.db)
+    print(f"Seeding {args.rules:,} recurring rules ...", file=sys.stderr)
+    seed(args.db, args.rules, args.users, args.days_behind, random.Random(args.seed))
+
+    legacy_db = args.db + ".legacy"
+    shutil.copyfile(args.db, legacy_db)
+    today = date.today()
+    legacy = timed(legacy_loop, legacy_db, today)
+    os.remove(legacy_db)
+    first_run = timed(set_based, args.db, today, args.batch_size)
+    rerun = timed(set_based, args.db, today, args.batch_size)
+
+    print(json.dumps({
+        "rules": args.rules,
+        "days_behind": args.days_behind,
+        "legacy_loop": legacy,
+        "set_based": first_run,
+        "set_based_rerun": rerun,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,479 @@
+"""Load-test the app's routes with concurrent HTTP clients.
+
+Usage:
+  python scripts/bench_routes.py                                       # temp SQLite DB, local server
+  python scripts/bench_routes.py --clients 32 --duration 60 --out results.json
+  python scripts/bench_routes.py --url http://127.0.0.1:8000 --users 50  # running server, DB from env vars
+  python scripts/bench_routes.py --compare before.json after.json --tolerance 0.2
+
+Without ``--url`` a fresh SQLite DB is seeded with scripts/bench_data.py and
+``--app`` (default ``my_app:app``) is served in a child process by a threaded
+Werkzeug server, or by uvicorn with ``--server uvicorn`` (``--app
+asgi:application`` benchmarks the ASGI mode).  With ``--url`` the DB the server uses (the usual DB_* env
+vars) is seeded first, unless ``--no-seed`` says it already was.
+
+Each client logs in as one synthetic user and sends a weighted random mix of
+ROUTES until ``--duration`` runs out.  After that, one client per user runs
+the delete routes on that user's "Disposable" rows and logs out, and every
+client registers, logs in as and deletes a throwaway user, so every route in
+the web app is timed.
+
+Results are per route (requests, errors, req/s, mean and p50/p95/p99 in ms)
+and written as JSON with sorted keys, so runs from two commits diff cleanly.
+``--compare`` prints the p95 change per route and exits 1 when any route got
+slower by more than ``--tolerance`` (given ``--min-requests`` samples in both
+runs) or started failing.
+"""
+import argparse
+import http.client
+import importlib
+import json
+import multiprocessing
+import os
+import platform
+import random
+import secrets
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import defaultdict, namedtuple
+from datetime import date, timedelta
+from urllib.parse import urlencode, urlsplit
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import bench_data  # noqa: E402
+from init_db import apply_baseline, migrate  # noqa: E402
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import db  # noqa: E402
+from db.config import DBConfig  # noqa: E402
+
+# name: reported route; path: formatted with the user's fixture ids and
+# "month"; form: None for GET, else a callable(fixture, rng) -> form dict.
+Route = namedtuple("Route", "name method path weight form")
+
+
+def _today(offset=0):
+    return (date.today() + timedelta(days=offset)).isoformat()
+
+
+def _transaction_form(f, rng):
+    return {
+        "category_id": f["category"], "transaction_type": "expense", "amount": f"{rng.uniform(2, 80):.2f}",
+        "transaction_date": _today(-rng.randrange(30)), "description": rng.choice(["Coffee shop", "Supermarket"]),
+        "account_id": f["account"],
+    }
+
+
+def _recurring_form(f, rng):
+    return {
+        "category_id": f["category"], "transaction_type": "expense", "amount": "25.00", "frequency": "monthly",
+        "start_date": _today(), "description": "Streaming service", "account_id": f["account"], "is_active": "1",
+    }
+
+
+ROUTES = [
+    Route("GET /dashboard", "GET", "/dashboard", 10, None),
+    Route("GET /transactions", "GET", "/transactions", 10, None),
+    Route("GET /transactions?keyword", "GET", "/transactions?keyword=coffee", 3, None),
+    Route("GET /transactions.ndjson", "GET", "/transactions.ndjson", 1, None),
+    Route("GET /budgets", "GET", "/budgets", 6, None),
+    Route("GET /budget_trends", "GET", "/budget_trends", 2, None),
+    Route("GET /savings", "GET", "/savings", 3, None),
+    Route("GET /savings_history/<goal_id>", "GET", "/savings_history/{goal}", 1, None),
+    Route("GET /recurring", "GET", "/recurring", 2, None),
+    Route("GET /bills", "GET", "/bills", 3, None),
+    Route("GET /notifications", "GET", "/notifications", 3, None),
+    Route("GET /accounts", "GET", "/accounts", 2, None),
+    Route("GET /debts", "GET", "/debts", 2, None),
+    Route("GET /analysis", "GET", "/analysis", 3, None),
+    Route("GET /profile", "GET", "/profile", 1, None),
+    Route("GET /metrics", "GET", "/metrics", 1, None),
+    Route("GET /", "GET", "/", 1, None),
+    Route("GET /login", "GET", "/login", 1, None),
+    Route("GET /register", "GET", "/register", 1, None),
+    Route("GET /add_transaction", "GET", "/add_transaction", 2, None),
+    Route("GET /edit_transaction/<transaction_id>", "GET", "/edit_transaction/{transaction}", 1, None),
+    Route("GET /edit_budget/<budget_id>", "GET", "/edit_budget/{budget}", 1, None),
+    Route("GET /edit_savings/<goal_id>", "GET", "/edit_savings/{goal}", 1, None),
+    Route("GET /edit_recurring/<recurring_id>", "GET", "/edit_recurring/{recurring}", 1, None),
+    Route("GET /edit_bill/<bill_id>", "GET", "/edit_bill/{bill}", 1, None),
+    Route("GET /edit_account/<account_id>", "GET", "/edit_account/{account}", 1, None),
+    Route("GET /edit_debt/<debt_id>", "GET", "/edit_debt/{debt}", 1, None),
+    Route("GET /generate_recurring", "GET", "/generate_recurring", 1, None),
+    Route("GET /move_to_savings", "GET", "/move_to_savings?month={month}", 1, None),
+    Route("GET /mark_bill_paid/<bill_id>", "GET", "/mark_bill_paid/{bill}", 1, None),
+    Route("GET /mark_notification_read/<notification_id>", "GET", "/mark_notification_read/{notification}", 1, None),
+    Route("GET /api/v1/transactions", "GET", "/api/v1/transactions", 2, None),
+    Route("GET /api/v1/budgets", "GET", "/api/v1/budgets", 1, None),
+    Route("GET /api/v1/savings", "GET", "/api/v1/savings", 1, None),
+    Route("GET /api/v1/recurring", "GET", "/api/v1/recurring", 1, None),
+    Route("GET /api/v1/bills", "GET", "/api/v1/bills", 1, None),
+    Route("GET /api/v1/notifications", "GET", "/api/v1/notifications", 1, None),
+    Route("GET /api/v1/debts", "GET", "/api/v1/debts", 1, None),
+    Route("GET /api/v1/accounts", "GET", "/api/v1/accounts", 1, None),
+    Route("POST /add_transaction", "POST", "/add_transaction", 4, _transaction_form),
+    Route("POST /edit_transaction/<transaction_id>", "POST", "/edit_transaction/{transaction}", 1, _transaction_form),
+    Route("POST /budgets", "POST", "/budgets", 1, lambda f, rng: {
+        "category_id": f["category"], "budget_amount": "300", "budget_month": f["month"],
+        "alert_threshold": "90"}),
+    Route("POST /edit_budget/<budget_id>", "POST", "/edit_budget/{budget}", 1, lambda f, rng: {
+        "budget_amount": str(rng.choice([200, 300, 400])), "alert_threshold": "90"}),
+    Route("POST /savings", "POST", "/savings", 1, lambda f, rng: {
+        "goal_name": "Weekend trip", "target_amount": "800", "target_date": _today(180)}),
+    Route("POST /contribute/<goal_id>", "POST", "/contribute/{goal}", 1, lambda f, rng: {"contribution": "25"}),
+    Route("POST /edit_savings/<goal_id>", "POST", "/edit_savings/{goal}", 1, lambda f, rng: {
+        "goal_name": "Emergency fund", "target_amount": "10000", "target_date": _today(365)}),
+    Route("POST /recurring", "POST", "/recurring", 1, _recurring_form),
+    Route("POST /edit_recurring/<recurring_id>", "POST", "/edit_recurring/{recurring}", 1, _recurring_form),
+    Route("POST /bills", "POST", "/bills", 1, lambda f, rng: {
+        "bill_name": "Insurance", "amount": "140", "due_date": _today(20)}),
+    Route("POST /edit_bill/<bill_id>", "POST", "/edit_bill/{bill}", 1, lambda f, rng: {
+        "bill_name": "Phone plan", "amount": "60", "due_date": _today(3), "status": "pending"}),
+    Route("POST /accounts", "POST", "/accounts", 1, lambda f, rng: {
+        "account_name": "Savings", "account_type": "bank", "current_balance": "100"}),
+    Route("POST /edit_account/<account_id>", "POST", "/edit_account/{account}", 1, lambda f, rng: {
+        "account_name": "Checking", "account_type": "bank", "current_balance": "2500", "currency": "CAD",
+        "is_active": "1"}),
+    Route("POST /debts", "POST", "/debts", 1, lambda f, rng: {
+        "lender_name": "Credit line", "total_amount": "5000", "paid_amount": "0", "due_date": _today(365)}),
+    Route("POST /edit_debt/<debt_id>", "POST", "/edit_debt/{debt}", 1, lambda f, rng: {
+        "lender_name": "Car loan", "total_amount": "18000", "paid_amount": "6500", "interest_rate": "4.9",
+        "due_date": _today(900)}),
+    Route("POST /export_transactions csv", "POST", "/export_transactions", 1, lambda f, rng: {"format": "csv"}),
+    Route("POST /reports", "POST", "/reports", 1, lambda f, rng: {"format": "pdf"}),
+    Route("POST /import_transactions", "POST", "/import_transactions", 1, lambda f, rng: {"account_id": f["account"]}),
+    Route("POST /update_currency", "POST", "/update_currency", 1, lambda f, rng: {"currency": "CAD"}),
+    Route("POST /change_password", "POST", "/change_password", 1, lambda f, rng: {
+        "current_password": bench_data.PASSWORD, "new_password": bench_data.PASSWORD,
+        "confirm_password": bench_data.PASSWORD}),
+    Route("POST /forgot_password", "POST", "/forgot_password", 1, lambda f, rng: {
+        "email": f["email"], "hint": bench_data.RECOVERY_HINT, "new_password": bench_data.PASSWORD}),
+]
+
+# Run once per user on its "Disposable" rows, after the timed mix
+DELETE_ROUTES = [
+    ("GET /delete_transaction/<transaction_id>", "/delete_transaction/{transaction}"),
+    ("GET /delete_budget/<budget_id>", "/delete_budget/{budget}"),
+    ("GET /delete_savings/<goal_id>", "/delete_savings/{goal}"),
+    ("GET /delete_bill/<bill_id>", "/delete_bill/{bill}"),
+    ("GET /delete_debt/<debt_id>", "/delete_debt/{debt}"),
+    ("GET /delete_notification/<notification_id>", "/delete_notification/{notification}"),
+    ("GET /delete_linked_account/<account_id>", "/delete_linked_account/{account}"),
+]
+
+IMPORT_CSV = "Date,Type,Category,Amount,Description\n" + "".join(
+    f"{_today(-n)},expense,Groceries,{10 + n}.50,Imported row {n}\n" for n in range(20)
+)
+
+
+class Client:
+    """One keep-alive HTTP connection with a session cookie; records timings."""
+
+    def __init__(self, base_url, samples):
+        parts = urlsplit(base_url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.conn = http.client.HTTPConnection(self.host, self.port, timeout=60)
+        self.cookie = None
+        self.samples = samples
+
+    def request(self, name, method, path, form=None, files=None):
+        headers = {"Cookie": self.cookie} if self.cookie else {}
+        body = None
+        if files:
+            body, content_type = _multipart(form or {}, files)
+            headers["Content-Type"] = content_type
+        elif form is not None:
+            body = urlencode(form)
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+        started = time.perf_counter()
+        try:
+            self.conn.request(method, path, body=body, headers=headers)
+            response = self.conn.getresponse()
+            payload = response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException):
+            self.conn.close()
+            self.conn = http.client.HTTPConnection(self.host, self.port, timeout=60)
+            payload, status = b"", 0
+            response = None
+        elapsed = (time.perf_counter() - started) * 1000
+        self.samples[name].append((elapsed, status))
+        if response is not None:
+            cookie = response.getheader("Set-Cookie")
+            if cookie:
+                self.cookie = cookie.split(";", 1)[0]
+        return status, payload
+
+    def login(self, email):
+        self.cookie = None
+        self.request("POST /login", "POST", "/login", {"email": email, "password": bench_data.PASSWORD})
+
+    def close(self):
+        self.conn.close()
+
+
+def _multipart(fields, files):
+    boundary = uuid.uuid4().hex
+    lines = []
+    for key, value in fields.items():
+        lines += [f"--{boundary}", f'Content-Disposition: form-data; name="{key}"', "", str(value)]
+    for key, (filename, content) in files.items():
+        lines += [f"--{boundary}", f'Content-Disposition: form-data; name="{key}"; filename="{filename}"',
+                  "Content-Type: text/csv", "", content]
+    lines += [f"--{boundary}--", ""]
+    return "\r\n".join(lines).encode(), f"multipart/form-data; boundary={boundary}"
+
+
+def run_client(index, base_url, user, deadline, owns_disposables, seed, samples):
+    rng = random.Random(seed + index)
+    fixture = dict(user["fixture"], email=user["email"], month=date.today().strftime("%Y-%m"))
+    client = Client(base_url, samples)
+    client.login(user["email"])
+    weights = [route.weight for route in ROUTES]
+    while time.monotonic() < deadline:
+        route = rng.choices(ROUTES, weights)[0]
+        path = route.path.format(**fixture)
+        if route.form is None:
+            client.request(route.name, "GET", path)
+            continue
+        files = {"file": ("bench.csv", IMPORT_CSV)} if route.path == "/import_transactions" else None
+        status, payload = client.request(route.name, "POST", path, route.form(fixture, rng), files)
+        if route.path == "/reports" and status == 202:
+            job = json.loads(payload)
+            status, payload = client.request("GET /reports/<job_id>", "GET", job["status_url"])
+            if status == 200 and json.loads(payload).get("download_url"):
+                client.request("GET /reports/<job_id>/download", "GET", json.loads(payload)["download_url"])
+
+    if owns_disposables:
+        disposable = user["fixture"]["disposable"]
+        for name, path in DELETE_ROUTES:
+            key = path.rsplit("{", 1)[1].rstrip("}")
+            if key in disposable:
+                client.request(name, "GET", path.format(**disposable))
+        client.request("GET /logout", "GET", "/logout")
+
+    # A throwaway user exercises register -> login -> delete_account
+    email = f"throwaway-{uuid.uuid4().hex[:12]}@example.com"
+    client.cookie = None
+    client.request("POST /register", "POST", "/register", {
+        "name": "Throwaway", "email": email, "password": bench_data.PASSWORD,
+        "recovery_hint": bench_data.RECOVERY_HINT})
+    client.login(email)
+    client.request("POST /delete_account", "POST", "/delete_account", {})
+    client.close()
+
+
+def _serve(app_spec, port, env, server="werkzeug"):
+    # Child process: a threaded Werkzeug server (WSGI) or uvicorn (ASGI) for the app under test
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    os.environ.update(env)
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    module, _, attr = app_spec.partition(":")
+    app = getattr(importlib.import_module(module), attr or "app")
+    if server == "uvicorn":
+        import uvicorn
+
+        uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning", access_log=False,
+                    backlog=4096, timeout_keep_alive=60)
+        return
+
+    class KeepAliveHandler(WSGIRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_request(self, *args, **kwargs):
+            pass
+
+    make_server("127.0.0.1", port, app, threaded=True, request_handler=KeepAliveHandler).serve_forever()
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise SystemExit(f"server on port {port} did not start within {timeout}s")
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def summarize(samples, seconds):
+    routes = {}
+    for name, timings in samples.items():
+        if not timings:
+            continue
+        latencies = [elapsed for elapsed, _ in timings]
+        statuses = defaultdict(int)
+        for _, status in timings:
+            statuses[str(status)] += 1
+        routes[name] = {
+            "requests": len(timings),
+            "errors": sum(1 for _, status in timings if status == 0 or status >= 400),
+            "requests_per_second": round(len(timings) / seconds, 2),
+            "mean_ms": round(sum(latencies) / len(latencies), 2),
+            **{f"p{pct}_ms": round(percentile(latencies, pct), 2) for pct in (50, 95, 99)},
+            "statuses": dict(statuses),
+        }
+    total = sum(route["requests"] for route in routes.values())
+    return {
+        "requests": total,
+        "errors": sum(route["errors"] for route in routes.values()),
+        "seconds": round(seconds, 2),
+        "requests_per_second": round(total / seconds, 2),
+    }, routes
+
+
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(__file__), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(before_path, after_path, tolerance, min_requests):
+    with open(before_path) as f:
+        before = json.load(f)["routes"]
+    with open(after_path) as f:
+        after = json.load(f)["routes"]
+    regressions = []
+    print(f"{'route':52} {'p95 before':>11} {'p95 after':>10} {'change':>8}")
+    for name in sorted(set(before) | set(after)):
+        old, new = before.get(name), after.get(name)
+        if old is None or new is None:
+            print(f"{name:52} {'-' if old is None else old['p95_ms']:>11} {'-' if new is None else new['p95_ms']:>10}")
+            continue
+        change = (new["p95_ms"] - old["p95_ms"]) / old["p95_ms"] if old["p95_ms"] else 0.0
+        flag = ""
+        sampled = min(old["requests"], new["requests"]) >= min_requests
+        if (sampled and change > tolerance) or (new["errors"] and not old["errors"]):
+            regressions.append(name)
+            flag = "  <-- regression"
+        print(f"{name:52} {old['p95_ms']:>11.2f} {new['p95_ms']:>10.2f} {change:>+8.0%}{flag}")
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30, help="seconds of mixed traffic")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--transactions", type=int, default=2000, help="per user")
+    parser.add_argument("--url", help="benchmark a running server instead of starting one")
+    parser.add_argument("--app", default="my_app:app", help="module:attribute of the app to serve")
+    parser.add_argument("--server", choices=("werkzeug", "uvicorn"), default="werkzeug",
+                        help="werkzeug for WSGI apps, uvicorn for ASGI ones (e.g. --app asgi:application)")
+    parser.add_argument("--no-seed", action="store_true", help="with --url: users from an earlier seeding")
+    parser.add_argument("--prefix", default=None, help="email prefix of the synthetic users")
+    parser.add_argument("--out", help="write the JSON results here as well as to stdout")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"))
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p95 growth for --compare")
+    parser.add_argument("--min-requests", type=int, default=20,
+                        help="--compare ignores p95 changes of routes with fewer samples")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        return compare(*args.compare, args.tolerance, args.min_requests)
+
+    server = None
+    workdir = None
+    prefix = args.prefix or ("bench" if args.no_seed else f"bench-{uuid.uuid4().hex[:6]}-")
+    if args.url:
+        base_url = args.url.rstrip("/")
+        engine = db.get_config().engine
+    else:
+        workdir = tempfile.mkdtemp(prefix="bench_routes_")
+        db_path = os.path.join(workdir, "bench.db")
+        db.configure(DBConfig("sqlite", db_path, None, 1, 1, 30, 300, 3600))
+        engine = "sqlite"
+
+    with db.get_pool().connection() as conn:
+        cursor = conn.cursor()
+        if not args.no_seed:
+            if workdir:
+                apply_baseline(conn, "sqlite")
+            migrate(conn, engine, log=lambda msg: None)
+            bench_data.generate(cursor, args.users, args.transactions, random.Random(args.seed), prefix)
+            conn.commit()
+        cursor.execute("SELECT user_id, email FROM users WHERE email LIKE ? ORDER BY user_id", f"{prefix}%@example.com")
+        users = [{"user_id": row.user_id, "email": row.email} for row in cursor.fetchall()][:args.users]
+        if not users:
+            raise SystemExit(f"no users with email prefix {prefix!r}; seed first or drop --no-seed")
+        found = bench_data.fixtures(cursor, [user["user_id"] for user in users])
+    db.get_pool().close()
+    for user in users:
+        user["fixture"] = found[user["user_id"]]
+
+    if not args.url:
+        port = _free_port()
+        env = {"DB_ENGINE": "sqlite", "DB_PATH": db_path, "DB_POOL_MAX_SIZE": str(max(args.clients, 10)),
+               "COLUMNAR_DIR": os.path.join(workdir, "columnar"), "REPORTS_DIR": os.path.join(workdir, "reports"),
+               "APP_SECRET": secrets.token_urlsafe(32)}
+        server = multiprocessing.Process(target=_serve, args=(args.app, port, env, args.server), daemon=True)
+        server.start()
+        _wait_for(port)
+        base_url = f"http://127.0.0.1:{port}"
+
+    samples = defaultdict(list)
+    per_client = [defaultdict(list) for _ in range(args.clients)]
+    started = time.monotonic()
+    deadline = started + args.duration
+    threads = [
+        threading.Thread(target=run_client, args=(
+            n, base_url, users[n % len(users)], deadline, n < len(users), args.seed, per_client[n]))
+        for n in range(args.clients)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+    for client_samples in per_client:
+        for name, timings in client_samples.items():
+            samples[name].extend(timings)
+
+    if server is not None:
+        server.terminate()
+        server.join()
+
+    totals, routes = summarize(samples, elapsed)
+    result = {
+        "config": {
+            "clients": args.clients, "duration": args.duration, "users": len(users),
+            "transactions_per_user": args.transactions, "app": None if args.url else args.app,
+            "server": None if args.url else args.server, "engine": engine,
+        },
+        "environment": {"commit": _commit(), "python": platform.python_version()},
+        "totals": totals,
+        "routes": routes,
+    }
+    text = json.dumps(result, indent=2, sort_keys=True)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    print(text)
+    return 1 if totals["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""Benchmark keyword search on a seeded SQLite DB.
+
+Usage:
+  python scripts/bench_search.py                       # 1M transactions for one user
+  python scripts/bench_search.py --rows 100000 --repeat 50 --db /tmp/search.db
+
+Seeds one user with ``--rows`` transactions (plus a tenth as many spread over
+other users) with descriptions drawn from a small merchant vocabulary and
+dates that rise with transaction_id, as entered and imported data does, then
+times db.search.ranked (the /transactions keyword search) for single term,
+prefix, multi-term and filtered searches.  Prints p50/p95/p99 per query and
+exits 1 if any ranked p99 misses ``--target-ms``.  The date-ordered keyword
+listing (/api/v1/transactions, exports) is timed too, for comparison only:
+it has to collect every match before sorting by date.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from init_db import apply_baseline, migrate  # noqa: E402
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import db  # noqa: E402
+from db import search  # noqa: E402
+from db.config import DBConfig  # noqa: E402
+from db.queries import NEWEST_FIRST, TRANSACTION_COLUMNS, transaction_filters  # noqa: E402
+
+BATCH = 50_000
+FIRST_DAY = date(2015, 1, 1)
+MERCHANTS = [
+    "Coffee shop", "Corner cafe", "Grocery store", "Supermarket", "Gas station", "Pharmacy",
+    "Bookstore", "Cinema tickets", "Pizza place", "Sushi bar", "Train ticket", "Taxi ride",
+    "Electric bill", "Water bill", "Internet provider", "Phone plan", "Gym membership",
+    "Hardware store", "Pet supplies", "Salary", "Freelance invoice", "Refund",
+]
+QUALIFIERS = ["downtown", "airport", "online", "weekend", "monthly", "annual", "team", "family", "", ""]
+
+# (label, args) -- every query is for user 1
+QUERIES = [
+    ("single term", {"keyword": "coffee"}),
+    ("prefix", {"keyword": "sup"}),
+    ("multi-term", {"keyword": "coffee shop downtown"}),
+    ("multi-term prefix", {"keyword": "gro sto"}),
+    ("rare term", {"keyword": "invoice airport"}),
+    ("term + type", {"keyword": "refund", "type": "income"}),
+    ("term + date range", {"keyword": "coffee", "from": "2023-01-01", "to": "2023-03-31"}),
+]
+
+
+def description(rng):
+    return f"{rng.choice(MERCHANTS)} {rng.choice(QUALIFIERS)} #{rng.randrange(10_000)}".replace("  ", " ")
+
+
+def seed(cursor, rows, other_users, rng):
+    span = (date.today() - FIRST_DAY).days
+    cursor.executemany(
+        "INSERT INTO users (full_name, email, password_hash) VALUES (?, ?, 'x')",
+        [(f"Bench {n}", f"bench{n}@local") for n in range(1, other_users + 2)],
+    )
+    total = rows + rows // 10
+    for start in range(0, total, BATCH):
+        batch = [
+            (
+                1 if n < rows else rng.randint(2, other_users + 1),
+                round(rng.uniform(1, 500), 2),
+                "income" if rng.random() < 0.2 else "expense",
+                (FIRST_DAY + timedelta(days=min(span, n * span // total + rng.randrange(3)))).isoformat(),
+                description(rng),
+            )
+            for n in range(start, min(start + BATCH, total))
+        ]
+        cursor.executemany(
+            "INSERT INTO transactions (user_id, amount, transaction_type, transaction_date, description) VALUES (?, ?, ?, ?, ?)",
+            batch,
+        )
+        search.index_inserted(cursor, len(batch))
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def time_query(run, repeat):
+    run()  # warm the page cache
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        samples.append((time.perf_counter() - started) * 1000)
+    return {f"p{pct}_ms": round(percentile(samples, pct), 2) for pct in (50, 95, 99)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=100, help="other users sharing the table")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--target-ms", type=float, default=50)
+    parser.add_argument("--db", help="reuse (or create) this DB instead of a temporary one")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    db_path = args.db or os.path.join(tempfile.mkdtemp(prefix="bench_search_"), "search.db")
+    fresh = not os.path.exists(db_path)
+    db.configure(DBConfig("sqlite", db_path, None, 1, 2, 30, 300, 3600))
+    with db.get_pool().connection() as conn:
+        cursor = conn.cursor()
+        if fresh:
+            apply_baseline(conn, "sqlite")
+            migrate(conn, "sqlite", log=lambda msg: None)
+            seed(cursor, args.rows, args.users, random.Random(args.seed))
+            conn.commit()
+
+        def ranked(query):
+            return lambda: search.ranked(cursor, 1, query, args.page_size)
+
+        def listing(query):
+            where, params = transaction_filters(1, query)
+            sql = f"{TRANSACTION_COLUMNS.format(top='')} {where} {NEWEST_FIRST} LIMIT {args.page_size}"
+
+            def run():
+                cursor.execute(sql, *params)
+                return cursor.fetchall()
+            return run
+
+        results = {}
+        for label, query in QUERIES:
+            results[f"ranked: {label}"] = time_query(ranked(query), args.repeat)
+            results[f"listing: {label}"] = time_query(listing(query), args.repeat)
+
+    if not args.db:
+        os.remove(db_path)
+        os.rmdir(os.path.dirname(db_path))
+
+    worst = max(timing["p99_ms"] for label, timing in results.items() if label.startswith("ranked"))
+    print(json.dumps({"rows": args.rows, "target_ms": args.target_ms, "worst_p99_ms": worst, "queries": results}, indent=2))
+    return 0 if worst <= args.target_ms else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
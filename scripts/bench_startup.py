@@ -0,0 +1,149 @@
+"""Measure how long importing the app takes, and fail when it regresses.
+
+Usage:
+  python scripts/bench_startup.py                          # import my_app 5 times, 400ms budget
+  python scripts/bench_startup.py --runs 10 --budget-ms 300 --out startup.json
+  python scripts/bench_startup.py --module asgi            # the ASGI entry point instead
+  python scripts/bench_startup.py --compare before.json after.json --tolerance 0.2
+
+Each run imports ``--module`` in a fresh ``python -X importtime`` process
+from the repo root (DB_ENGINE defaults to an in-memory SQLite DB, as in CI)
+and reads the module's cumulative import time from the ``-X importtime``
+report.  The result has the median over the runs and the module's direct
+imports ranked by their cumulative time in the median run, which is where to
+look when the number grows.
+
+Exits 1 when the median is over ``--budget-ms``, or when any of DEFERRED was
+imported: those modules are only needed by the export, analysis, report and
+driver paths, which import them on first use.  ``--compare`` exits 1 when
+the median got slower by more than ``--tolerance``.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Heavy modules that must not be imported at startup
+DEFERRED = ["numpy", "pyodbc", "aioodbc", "aiosqlite", "fpdf", "matplotlib", "redis"]
+
+
+def parse_importtime(stderr):
+    """``[(name, depth, self_us, cumulative_us), ...]`` from an ``-X importtime`` report."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        stripped = name.lstrip(" ")
+        entries.append((stripped, (len(name) - len(stripped) - 1) // 2, int(self_us), int(cumulative_us)))
+    return entries
+
+
+def direct_imports(entries, module):
+    """``{name: cumulative_us}`` of the modules ``module`` imported itself."""
+    # Entries are listed as each import finishes, so a module's children
+    # are the depth-1 entries just before it
+    index = max(i for i, (name, depth, _, _) in enumerate(entries) if name == module and depth == 0)
+    children = {}
+    for name, depth, _, cumulative_us in reversed(entries[:index]):
+        if depth == 0:
+            break
+        if depth == 1:
+            children[name] = cumulative_us
+    return children
+
+
+def measure(module, env=None):
+    """Import ``module`` in a fresh interpreter; returns the parsed report."""
+    run_env = dict(os.environ, **(env or {}))
+    run_env.setdefault("DB_ENGINE", "sqlite")
+    run_env.setdefault("DB_PATH", ":memory:")
+    run_env.setdefault("APP_SECRET", "bench-startup")
+    run_env["PYTHONPATH"] = os.pathsep.join(filter(None, [ROOT, run_env.get("PYTHONPATH")]))
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          capture_output=True, text=True, cwd=ROOT, env=run_env)
+    if proc.returncode:
+        raise SystemExit(f"importing {module} failed:\n{proc.stderr[-2000:]}")
+    return parse_importtime(proc.stderr)
+
+
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=ROOT, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(before_path, after_path, tolerance):
+    with open(before_path) as f:
+        before = json.load(f)["median_ms"]
+    with open(after_path) as f:
+        after = json.load(f)["median_ms"]
+    change = (after - before) / before if before else 0.0
+    regressed = change > tolerance
+    print(f"median before {before:.1f}ms, after {after:.1f}ms ({change:+.0%})"
+          + ("  <-- regression" if regressed else ""))
+    return 1 if regressed else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="my_app")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=400, help="fail above this median import time")
+    parser.add_argument("--top", type=int, default=10, help="direct imports to list")
+    parser.add_argument("--out", help="write the JSON results here as well as to stdout")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"))
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed median growth for --compare")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        return compare(*args.compare, args.tolerance)
+
+    runs = []
+    for _ in range(args.runs):
+        entries = measure(args.module)
+        total = next(cum for name, depth, _, cum in reversed(entries) if name == args.module and depth == 0)
+        runs.append((total, entries))
+    runs.sort(key=lambda run: run[0])
+    _, entries = runs[len(runs) // 2]
+    imported = {name for name, _, _, _ in entries}
+    deferred = sorted(name for name in DEFERRED if name in imported)
+    heaviest = sorted(direct_imports(entries, args.module).items(), key=lambda item: -item[1])[:args.top]
+
+    result = {
+        "module": args.module,
+        "runs_ms": [round(total / 1000, 1) for total, _ in runs],
+        "median_ms": round(statistics.median(total for total, _ in runs) / 1000, 1),
+        "budget_ms": args.budget_ms,
+        "modules_imported": len(imported),
+        "deferred_imported": deferred,
+        "heaviest_imports_ms": [[name, round(us / 1000, 1)] for name, us in heaviest],
+        "environment": {"commit": _commit(), "python": platform.python_version()},
+    }
+    text = json.dumps(result, indent=2, sort_keys=True)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    print(text)
+
+    failed = False
+    if result["median_ms"] > args.budget_ms:
+        print(f"{args.module}: median import {result['median_ms']}ms is over the {args.budget_ms:g}ms budget",
+              file=sys.stderr)
+        failed = True
+    if deferred:
+        print(f"{args.module}: imports {', '.join(deferred)} at startup; import them where they are used",
+              file=sys.stderr)
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
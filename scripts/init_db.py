@@ -1,46 +1,146 @@
-"""Initialize database using `db/schema.sql` for SQL Server.
+"""Initialize the database and apply versioned migrations.
 
 Usage:
-  python scripts/init_db.py
+  python scripts/init_db.py             # baseline schema + all pending migrations
+  python scripts/init_db.py --status    # list applied / pending migrations
+  python scripts/init_db.py --target 2  # migrate up to (and including) version 2
 
-Reads DB connection from env vars (see README or .env.example).
+Reads DB connection from env vars (see README or .env.example).  The baseline
+is `db/schema.sql` for SQL Server and `db/schema_sqlite.sql` for SQLite;
+migrations live in `db/migrations/<engine>/NNNN_name.sql` and each one is
+recorded in the `schema_migrations` table once applied.  A SQL Server
+migration whose first line is `-- migrate: no-transaction` runs in autocommit
+mode (needed for full-text DDL), so it must be safe to re-run.
 """
+import argparse
 import os
-from dotenv import load_dotenv
-import pyodbc
-
-load_dotenv()
-
-def main():
-    conn_str = os.getenv('DB_CONNECTION')
-    if not conn_str:
-        driver = os.getenv('DB_DRIVER', '{ODBC Driver 17 for SQL Server}')
-        server = os.getenv('DB_SERVER')
-        database = os.getenv('DB_DATABASE')
-        trusted = os.getenv('DB_TRUSTED', 'yes').lower() in ('yes','true','1')
-        if trusted:
-            conn_str = f"DRIVER={driver};SERVER={server};DATABASE={database};Trusted_Connection=yes;"
-        else:
-            user = os.getenv('DB_USER')
-            password = os.getenv('DB_PASSWORD')
-            conn_str = f"DRIVER={driver};SERVER={server};DATABASE={database};UID={user};PWD={password}"
-
-    if not conn_str:
-        print('No DB connection configured in environment.')
-        return
+import re
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from db.config import load_config  # noqa: E402
+from db.engines import connector_for  # noqa: E402
+
+DB_DIR = os.path.join(os.path.dirname(__file__), "..", "db")
+BASELINES = {"mssql": "schema.sql", "sqlite": "schema_sqlite.sql"}
+MIGRATION_RE = re.compile(r"^(\d{4})_(\w+)\.sql$")
+NO_TRANSACTION = "-- migrate: no-transaction"
+
+MIGRATIONS_TABLE = {
+    "mssql": """
+        IF OBJECT_ID(N'[dbo].[schema_migrations]', N'U') IS NULL
+            CREATE TABLE schema_migrations (
+                version INT PRIMARY KEY,
+                name NVARCHAR(255) NOT NULL,
+                applied_at DATETIME NOT NULL DEFAULT GETDATE()
+            );
+    """,
+    "sqlite": """
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        );
+    """,
+}
+
+
+def _read(path):
+    with open(path, "r", encoding="utf-8") as fh:
+        return fh.read()
+
+
+def run_script(conn, engine, sql):
+    """Run a multi-statement script in the current transaction."""
+    if engine == "sqlite":
+        # sqlite3 only runs one statement per execute(); executescript()
+        # autocommits, so open the transaction explicitly.
+        conn.executescript("BEGIN;\n" + sql)
+    else:
+        conn.cursor().execute(sql)
+
+
+def discover_migrations(engine):
+    """Return [(version, name, path)] for the engine, sorted by version."""
+    folder = os.path.join(DB_DIR, "migrations", engine)
+    found = []
+    for filename in sorted(os.listdir(folder)):
+        match = MIGRATION_RE.match(filename)
+        if match:
+            found.append((int(match.group(1)), match.group(2), os.path.join(folder, filename)))
+    versions = [version for version, _, _ in found]
+    if len(versions) != len(set(versions)):
+        raise RuntimeError(f"Duplicate migration versions in {folder}")
+    return found
 
-    sql_path = os.path.join(os.path.dirname(__file__), '..', 'db', 'schema.sql')
-    with open(sql_path, 'r', encoding='utf-8') as fh:
-        sql = fh.read()
 
-    conn = pyodbc.connect(conn_str)
+def applied_versions(conn):
     cursor = conn.cursor()
+    cursor.execute("SELECT version FROM schema_migrations")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def apply_baseline(conn, engine):
+    run_script(conn, engine, _read(os.path.join(DB_DIR, BASELINES[engine])))
+    run_script(conn, engine, MIGRATIONS_TABLE[engine])
+    conn.commit()
+
+
+def migrate(conn, engine, target=None, log=print):
+    """Apply pending migrations up to ``target``; returns the versions applied."""
+    done = applied_versions(conn)
+    applied = []
+    for version, name, path in discover_migrations(engine):
+        if version in done or (target is not None and version > target):
+            continue
+        log(f"Applying {version:04d}_{name} ...")
+        sql = _read(path)
+        autocommit = engine == "mssql" and sql.startswith(NO_TRANSACTION)
+        try:
+            if autocommit:
+                conn.autocommit = True
+            run_script(conn, engine, sql)
+            conn.cursor().execute(
+                "INSERT INTO schema_migrations (version, name) VALUES (?, ?)", version, name
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            if autocommit:
+                conn.autocommit = False
+        applied.append(version)
+    return applied
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--status", action="store_true", help="show migration status and exit")
+    parser.add_argument("--target", type=int, help="highest migration version to apply")
+    args = parser.parse_args(argv)
+
+    config = load_config()
+    if config.engine == "mssql" and not config.conn_str:
+        print("No DB connection configured in environment.")
+        return
+
+    conn = connector_for(config)()
     try:
-        cursor.execute(sql)
-        conn.commit()
-        print('Schema applied successfully.')
+        apply_baseline(conn, config.engine)
+        if args.status:
+            done = applied_versions(conn)
+            for version, name, _ in discover_migrations(config.engine):
+                state = "applied" if version in done else "pending"
+                print(f"{version:04d}_{name}: {state}")
+            return
+
+        applied = migrate(conn, config.engine, target=args.target)
+        print(f"Schema applied successfully ({len(applied)} migration(s) run).")
     finally:
         conn.close()
 
-if __name__ == '__main__':
+
+if __name__ == "__main__":
     main()
@@ -0,0 +1,46 @@
+"""Verify or rebuild `monthly_category_totals` from the raw transactions.
+
+Usage:
+  python scripts/rebuild_aggregates.py              # report drift only
+  python scripts/rebuild_aggregates.py --rebuild    # recompute, then re-verify
+  python scripts/rebuild_aggregates.py --user 42    # limit to one user
+
+Exits with status 1 when drift remains.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import db  # noqa: E402
+from db import aggregates  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rebuild", action="store_true", help="recompute the aggregate table")
+    parser.add_argument("--user", type=int, help="only check/rebuild this user_id")
+    args = parser.parse_args(argv)
+
+    conn = db.connect()
+    try:
+        cursor = conn.cursor()
+        if args.rebuild:
+            aggregates.rebuild(cursor, args.user)
+            conn.commit()
+            print("Aggregates rebuilt.")
+
+        drift = aggregates.find_drift(cursor, args.user)
+    finally:
+        conn.close()
+
+    for (user_id, category_id, month, kind), stored, expected in drift:
+        print(f"user={user_id} category={category_id} month={month:%Y-%m} type={kind}: "
+              f"stored={stored} expected={expected}")
+    print(f"{len(drift)} drifted row(s).")
+    return 1 if drift else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+"""Reconcile `user_accounts.current_balance` against the balance ledger.
+
+Usage:
+  python scripts/reconcile_balances.py              # report drift only
+  python scripts/reconcile_balances.py --rebuild    # re-snapshot from the ledger, then re-verify
+  python scripts/reconcile_balances.py --user 42    # limit to one user
+
+Exits with status 1 when drift remains.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import db  # noqa: E402
+from db import ledger  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rebuild", action="store_true",
+                        help="recompute snapshots and current_balance from the ledger")
+    parser.add_argument("--user", type=int, help="only check/rebuild this user_id")
+    args = parser.parse_args(argv)
+
+    conn = db.connect()
+    try:
+        cursor = conn.cursor()
+        if args.rebuild:
+            ledger.rebuild(cursor, args.user)
+            conn.commit()
+            print("Balances rebuilt from the ledger.")
+
+        drift = ledger.find_drift(cursor, args.user)
+    finally:
+        conn.close()
+
+    for account_id, stored, expected in drift:
+        print(f"account={account_id}: current_balance={stored} ledger={expected}")
+    print(f"{len(drift)} drifted account(s).")
+    return 1 if drift else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+"""Session backends, chosen with SESSION_BACKEND.
+
+cookie (default)
+    The session lives in Flask's signed cookie.  It only ever holds the
+    ``user_id`` and a one-off ``alert``, so there is nothing to store or share
+    between nodes; the signature's timestamp enforces the idle timeout.
+    Anyone holding the signing key can log in as any user, so the app
+    refuses to start this backend without a real APP_SECRET.
+db
+    The cookie holds a random session id; the data is a row in
+    ``app_sessions`` (db/session_store.py), shared by every node using the
+    database.  Sessions can be revoked server-side, and the id changes
+    whenever the logged-in user does.
+
+Either way a session is written back only when it changed, or when more
+than half of ``SESSION_IDLE_TIMEOUT`` has passed since it was last written,
+so the timeout slides without a write on every request.
+"""
+
+import os
+import secrets
+import time
+
+from flask.sessions import SecureCookieSession, SecureCookieSessionInterface, SessionInterface
+from itsdangerous import BadSignature
+
+import db
+from db import session_store
+
+SESSION_BACKEND = os.getenv("SESSION_BACKEND", "cookie")
+# Seconds without a request before a session expires
+SESSION_IDLE_TIMEOUT = int(os.getenv("SESSION_IDLE_TIMEOUT", "86400"))
+# Seconds between the web app's sweeps of expired DB sessions (one batch each)
+SESSION_SWEEP_INTERVAL = float(os.getenv("SESSION_SWEEP_INTERVAL", "300"))
+# Keys that are public (old defaults and the .env.example placeholder)
+KNOWN_SECRETS = {"super-secret-key", "replace-with-strong-secret"}
+
+
+class Session(SecureCookieSession):
+    # Set when the session should be rewritten to push its expiry back
+    refresh_due = False
+
+
+def _refresh_due(written_at, now, timeout):
+    return now - written_at > timeout / 2
+
+
+class CookieSessionInterface(SecureCookieSessionInterface):
+    session_class = Session
+
+    def __init__(self, idle_timeout=SESSION_IDLE_TIMEOUT):
+        self.idle_timeout = idle_timeout
+
+    def open_session(self, app, request):
+        serializer = self.get_signing_serializer(app)
+        if serializer is None:
+            return None
+        value = request.cookies.get(self.get_cookie_name(app))
+        if not value:
+            return self.session_class()
+        try:
+            data, signed_at = serializer.loads(value, max_age=self.idle_timeout, return_timestamp=True)
+        except BadSignature:
+            return self.session_class()
+        session = self.session_class(data)
+        session.refresh_due = _refresh_due(signed_at.timestamp(), time.time(), self.idle_timeout)
+        return session
+
+    def should_set_cookie(self, app, session):
+        return session.modified or session.refresh_due
+
+
+class DBSession(Session):
+    def __init__(self, initial=None, session_id=None):
+        super().__init__(initial)
+        self.session_id = session_id
+        self.loaded_user = dict.get(self, "user_id")
+
+
+class DBSessionInterface(SessionInterface):
+    session_class = DBSession
+
+    def __init__(self, idle_timeout=SESSION_IDLE_TIMEOUT, sweep_interval=SESSION_SWEEP_INTERVAL):
+        self.idle_timeout = idle_timeout
+        self.sweep_interval = sweep_interval
+        self._next_sweep = 0.0
+
+    def open_session(self, app, request):
+        session_id = request.cookies.get(self.get_cookie_name(app))
+        if not session_id:
+            return self.session_class()
+        now = time.time()
+        with db.get_pool().connection() as conn:
+            found = session_store.load(conn.cursor(), session_id, now)
+        if found is None:
+            return self.session_class()
+        data, expires_at = found
+        session = self.session_class(data, session_id)
+        session.refresh_due = _refresh_due(expires_at - self.idle_timeout, now, self.idle_timeout)
+        return session
+
+    def save_session(self, app, session, response):
+        if session.accessed:
+            response.vary.add("Cookie")
+        old_id, new_id = session.session_id, session.session_id
+        if not (session.modified or session.refresh_due) or (not session and old_id is None):
+            return
+        now = time.time()
+        with db.get_pool().connection() as conn:
+            cursor = conn.cursor()
+            if not session:
+                if old_id is not None:
+                    session_store.delete(cursor, old_id)
+            elif session.modified:
+                if old_id is None or session.get("user_id") != session.loaded_user:
+                    # A new id on login/logout, so a planted id can't be logged into
+                    new_id = secrets.token_urlsafe(32)
+                    if old_id is not None:
+                        session_store.delete(cursor, old_id)
+                session_store.save(cursor, new_id, dict(session), now + self.idle_timeout)
+            else:
+                session_store.touch(cursor, old_id, now + self.idle_timeout)
+            if now >= self._next_sweep:
+                self._next_sweep = now + self.sweep_interval
+                session_store.sweep(cursor, now)
+            conn.commit()
+
+        if not session:
+            if old_id is not None:
+                response.delete_cookie(
+                    self.get_cookie_name(app), domain=self.get_cookie_domain(app), path=self.get_cookie_path(app),
+                    secure=self.get_cookie_secure(app), httponly=self.get_cookie_httponly(app),
+                    samesite=self.get_cookie_samesite(app),
+                )
+        elif new_id != old_id:
+            response.set_cookie(
+                self.get_cookie_name(app), new_id, expires=self.get_expiration_time(app, session),
+                domain=self.get_cookie_domain(app), path=self.get_cookie_path(app),
+                secure=self.get_cookie_secure(app), httponly=self.get_cookie_httponly(app),
+                samesite=self.get_cookie_samesite(app),
+            )
+
+
+BACKENDS = {
+    "cookie": CookieSessionInterface,
+    "db": DBSessionInterface,
+}
+
+
+def init_app(app, backend=None):
+    """Install the SESSION_BACKEND (or ``backend``) session interface on ``app``."""
+    name = backend or SESSION_BACKEND
+    try:
+        interface = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unsupported SESSION_BACKEND: {name!r}") from None
+    if name == "cookie" and (not app.secret_key or app.secret_key in KNOWN_SECRETS):
+        raise ValueError("SESSION_BACKEND=cookie signs sessions with APP_SECRET; set it to a random secret")
+    app.session_interface = interface()
+    return app.session_interface
@@ -0,0 +1,49 @@
+from datetime import date
+
+from db import aggregates
+
+
+def _add(cursor, category_id, kind, day, amount):
+    cursor.execute(
+        """INSERT INTO transactions (user_id, category_id, amount, transaction_type, transaction_date)
+           VALUES (1, ?, ?, ?, ?)""",
+        category_id, amount, kind, day,
+    )
+    aggregates.record_transaction(cursor, 1, category_id, kind, day, amount)
+
+
+def _totals(cursor):
+    cursor.execute("SELECT category_id, month, transaction_type, total_amount, txn_count FROM monthly_category_totals")
+    return {(r.category_id, r.month, r.transaction_type): (r.total_amount, r.txn_count) for r in cursor.fetchall()}
+
+
+def test_record_folds_into_month_rows(db_cursor):
+    _add(db_cursor, 3, "expense", "2024-05-02", 10)
+    _add(db_cursor, 3, "expense", "2024-05-30", 5.5)
+    _add(db_cursor, 3, "income", "2024-05-30", 100)
+    _add(db_cursor, None, "expense", "2024-06-01", 7)
+
+    assert _totals(db_cursor) == {
+        (3, date(2024, 5, 1), "expense"): (15.5, 2),
+        (3, date(2024, 5, 1), "income"): (100, 1),
+        (0, date(2024, 6, 1), "expense"): (7, 1),
+    }
+    assert aggregates.find_drift(db_cursor) == []
+
+
+def test_drift_is_reported_and_rebuilt(db_cursor):
+    _add(db_cursor, 3, "expense", "2024-05-02", 10)
+    db_cursor.execute("UPDATE transactions SET amount = 12")
+
+    drift = aggregates.find_drift(db_cursor, user_id=1)
+    assert drift == [((1, 3, date(2024, 5, 1), "expense"), (10.0, 1), (12.0, 1))]
+
+    aggregates.rebuild(db_cursor, user_id=1)
+    assert aggregates.find_drift(db_cursor) == []
+
+
+def test_removing_last_transaction_is_not_drift(db_cursor):
+    _add(db_cursor, 3, "expense", "2024-05-02", 10)
+    db_cursor.execute("DELETE FROM transactions")
+    aggregates.record_transaction(db_cursor, 1, 3, "expense", date(2024, 5, 2), 10, sign=-1)
+    assert aggregates.find_drift(db_cursor) == []
@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+import db  # noqa: E402
+from db import aio, tracing  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def database(migrated_db):
+    conn = db.connect()
+    conn.cursor().executemany(
+        "INSERT INTO transactions (user_id, amount, transaction_type, transaction_date, description) VALUES (?, ?, ?, ?, ?)",
+        [(1, 10, "expense", "2024-05-01", "coffee"), (1, 20, "income", "2024-05-02", "refund"),
+         (2, 30, "expense", "2024-05-03", "rent")],
+    )
+    conn.commit()
+    conn.close()
+
+
+def run(coro):
+    async def main():
+        try:
+            return await coro
+        finally:
+            await aio.close_pool()
+    return asyncio.run(main())
+
+
+def test_rows_keep_attribute_access():
+    rows = run(aio.fetchall("SELECT amount, description FROM transactions WHERE user_id = ? ORDER BY amount", 1))
+    assert [(row.amount, row.description) for row in rows] == [(10, "coffee"), (20, "refund")]
+
+    row = run(aio.fetchone("SELECT SUM(amount) AS total FROM transactions WHERE user_id = ?", 2))
+    assert row.total == 30
+    assert run(aio.fetchone("SELECT amount FROM transactions WHERE user_id = ?", 3)) is None
+
+
+def test_fetch_dicts_matches_fetch_batch_rows():
+    rows = run(aio.fetch_dicts("SELECT transaction_type, SUM(amount) AS total FROM transactions "
+                               "WHERE user_id = ? GROUP BY transaction_type ORDER BY transaction_type", 1))
+    assert rows == [{"transaction_type": "expense", "total": 10}, {"transaction_type": "income", "total": 20}]
+
+
+def test_gathered_queries_use_separate_connections_and_are_traced():
+    async def main():
+        token = tracing.start("dashboard")
+        try:
+            results = await asyncio.gather(*(
+                aio.fetchall("SELECT amount FROM transactions WHERE user_id = ?", user_id) for user_id in (1, 2, 3)
+            ))
+            idle = len(aio.get_pool()._idle)
+        finally:
+            summary = tracing.finish(token)
+        return results, idle, summary
+
+    results, idle, summary = run(main())
+    assert [len(rows) for rows in results] == [2, 1, 0]
+    assert idle == 3
+    assert summary["queries"] == 3
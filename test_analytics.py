@@ -0,0 +1,48 @@
+import math
+from datetime import date
+
+import numpy as np
+
+import analytics
+from analytics import EXPENSE, INCOME, Columns
+
+
+def columns(rows):
+    amount, type_code, day, category_id = zip(*rows)
+    return Columns(np.array(amount, float), np.array(type_code, np.int8),
+                   np.array(day, "datetime64[D]"), np.array(category_id, np.int64))
+
+
+def test_summarize_monthly_series_and_breakdown():
+    figures = analytics.summarize(columns([
+        (1000, INCOME, date(2024, 1, 5), 0),
+        (100, EXPENSE, date(2024, 1, 9), 7),
+        (50, EXPENSE, date(2024, 1, 20), 8),
+        (300, EXPENSE, date(2024, 3, 2), 7),
+        (200, INCOME, date(2024, 3, 31), 0),
+    ]), today=date(2024, 4, 10))
+
+    assert figures["months"] == ["2024-01", "2024-02", "2024-03", "2024-04"]
+    assert figures["income"] == [1000, 0, 200, 0]
+    assert figures["expenses"] == [150, 0, 300, 0]
+    assert figures["net"] == [850, 0, -100, 0]
+    assert figures["rolling_expenses"] == [150, 75, 150, 100]
+    assert figures["expense_delta"] == [0, -150, 300, -300]
+    assert figures["expense_delta_pct"] == [None, -100, None, -100]
+    assert figures["category_expenses"] == [(7, 400), (8, 50)]
+    assert (figures["total_income"], figures["total_expenses"]) == (1200, 450)
+
+
+def test_summarize_without_transactions():
+    figures = analytics.summarize(analytics.Columns(*(np.empty(0, t) for t in (float, np.int8, "datetime64[D]", np.int64))),
+                                  today=date(2024, 4, 10))
+    assert figures["months"] == ["2024-04"]
+    assert figures["expenses"] == [0] and figures["category_expenses"] == []
+
+
+def test_rolling_mean_and_month_over_month():
+    assert analytics.rolling_mean([2, 4, 6, 8], window=2).tolist() == [2, 3, 5, 7]
+    delta, percent = analytics.month_over_month([10, 15, 0, 5])
+    assert delta.tolist() == [0, 5, -15, 5]
+    assert math.isnan(percent[0]) and percent[1] == 50 and percent[2] == -100 and math.isnan(percent[3])
+
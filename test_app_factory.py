@@ -0,0 +1,81 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import sessions
+import views
+from db.config import DBConfig
+from my_app import create_app
+
+
+@pytest.fixture
+def db_config(tmp_path):
+    return DBConfig("sqlite", str(tmp_path / "factory.db"), None, 1, 2, 1, 300, 3600)
+
+
+def mounted(app):
+    return {rule.endpoint.partition(".")[0] for rule in app.url_map.iter_rules() if rule.endpoint != "static"}
+
+
+def test_web_nodes_mount_every_blueprint(db_config):
+    app = create_app("web", db_config)
+    assert mounted(app) == set(views.BLUEPRINTS) - {"api"} | {"api_v1"}
+    assert app.config["APP_ROLE"] == "web"
+
+
+def test_reporting_nodes_only_serve_the_read_pages(db_config):
+    client = create_app("reporting", db_config).test_client()
+    assert mounted(client.application) == {"dashboard", "analysis", "export", "ops"}
+    assert client.get("/transactions").status_code == 404
+    assert client.get("/login").status_code == 404
+    assert client.get("/metrics").status_code == 200
+    assert client.get("/dashboard").status_code == 302
+
+    # PDF reports write report_jobs, so they are handed to the web nodes
+    with client.session_transaction() as session:
+        session["user_id"] = 1
+    response = client.post("/export_transactions", data={"format": "pdf"})
+    assert (response.status_code, response.headers["Location"]) == (307, "/reports")
+    assert client.post("/reports", data={"format": "pdf"}).status_code == 404
+
+
+def test_web_nodes_queue_pdf_reports(migrated_db):
+    client = create_app("web", migrated_db).test_client()
+    with client.session_transaction() as session:
+        session["user_id"] = 1
+    response = client.post("/export_transactions", data={"format": "pdf", "type": "expense"}, follow_redirects=True)
+    assert response.status_code == 202
+    status = client.get(response.json["status_url"])
+    assert status.json["status"] == "queued" and status.json["download_url"] is None
+
+
+@pytest.mark.parametrize("secret", [None, "", "super-secret-key"])
+def test_cookie_sessions_need_a_real_secret(db_config, monkeypatch, secret):
+    monkeypatch.setattr("my_app.load_dotenv", lambda: None)
+    if secret is None:
+        monkeypatch.delenv("APP_SECRET", raising=False)
+    else:
+        monkeypatch.setenv("APP_SECRET", secret)
+    with pytest.raises(ValueError, match="APP_SECRET"):
+        create_app("web", db_config)
+
+    # DB sessions are not signed with it
+    monkeypatch.setattr(sessions, "SESSION_BACKEND", "db")
+    assert isinstance(create_app("web", db_config).session_interface, sessions.DBSessionInterface)
+
+
+def test_reporting_nodes_do_not_import_the_write_paths():
+    env = dict(os.environ, APP_ROLE="reporting", DB_ENGINE="sqlite", DB_PATH=":memory:")
+    proc = subprocess.run([sys.executable, "-c", "import sys, my_app; print(' '.join(sys.modules))"],
+                          capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)),
+                          env=env, check=True)
+    imported = set(proc.stdout.split())
+    assert "views.dashboard" in imported
+    assert not imported & {"views.transactions", "views.accounts", "views.reports", "reports", "imports", "api"}
+
+
+def test_unknown_roles_are_rejected(db_config):
+    with pytest.raises(ValueError):
+        create_app("batch", db_config)
@@ -0,0 +1,86 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+pytest.importorskip("a2wsgi")
+pytest.importorskip("aiosqlite")
+
+import asgi  # noqa: E402
+import db  # noqa: E402
+import views.transactions  # noqa: E402
+from db import aio  # noqa: E402
+
+
+def call(url, cookie=None):
+    """One GET through ``asgi.application``; returns ``(status, headers, body)``."""
+    path, _, query = url.partition("?")
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": query.encode(),
+        "root_path": "", "client": ("127.0.0.1", 50000), "server": ("testserver", 80),
+        "headers": [(b"host", b"testserver")] + ([(b"cookie", cookie.encode())] if cookie else []),
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    async def main():
+        try:
+            await asgi.application(scope, receive, send)
+        finally:
+            await aio.close_pool()
+
+    asyncio.run(main())
+    start, body = messages
+    return start["status"], dict(start["headers"]), body["body"]
+
+
+@pytest.fixture
+def logged_in(migrated_db):
+    conn = db.connect()
+    conn.cursor().executemany(
+        "INSERT INTO transactions (user_id, amount, transaction_type, transaction_date, description) VALUES (?, ?, ?, ?, ?)",
+        [(1, 10, "expense", "2024-05-01", "coffee"), (1, 20, "income", "2024-05-02", "refund"),
+         (2, 30, "expense", "2024-05-03", "rent")],
+    )
+    conn.commit()
+    conn.close()
+    app = asgi.app
+    cookie = app.session_interface.get_signing_serializer(app).dumps({"user_id": 1})
+    return f"{app.config['SESSION_COOKIE_NAME']}={cookie}"
+
+
+def test_async_pages_redirect_without_a_session(migrated_db):
+    status, _, _ = call("/transactions")
+    assert status == 302
+
+
+def test_async_page_end_to_end_keeps_blocking_steps_off_the_loop(logged_in, monkeypatch):
+    interface = asgi.app.session_interface
+    threads = []
+
+    def recorded(method):
+        def wrapper(*args):
+            threads.append(threading.current_thread())
+            return method(*args)
+        return wrapper
+
+    monkeypatch.setattr(interface, "open_session", recorded(interface.open_session))
+    monkeypatch.setattr(interface, "save_session", recorded(interface.save_session))
+    monkeypatch.setattr(views.transactions, "render_template", lambda name, **page: json.dumps({
+        "descriptions": [row.description for row in page["transactions"]], "next_cursor": page["next_cursor"],
+    }))
+
+    status, headers, body = call("/transactions?page_size=1", logged_in)
+    assert status == 200
+    page = json.loads(body)
+    assert page["descriptions"] == ["refund"] and page["next_cursor"]
+    # The SQL trace started by a before_request hook saw the view's queries
+    assert b"1 queries" in headers[b"server-timing"]
+    assert len(threads) == 2 and threading.main_thread() not in threads
@@ -0,0 +1,39 @@
+import time
+
+import pytest
+
+from cache import TTLCache, make_cache
+
+
+def test_entries_expire_after_ttl():
+    cache = TTLCache(ttl=0.01)
+    cache.set("k", 1)
+    assert cache.get("k") == 1
+    time.sleep(0.02)
+    assert cache.get("k") is None
+    assert cache.stats() == {"entries": 0, "hits": 1, "misses": 1}
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(ttl=60, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+
+def test_get_or_set_computes_once():
+    cache = TTLCache(ttl=60)
+    calls = []
+    for _ in range(3):
+        cache.get_or_set("k", lambda: calls.append(1) or "v")
+    assert calls == [1]
+
+
+def test_make_cache_defaults_to_in_process(monkeypatch):
+    monkeypatch.delenv("CACHE_URL", raising=False)
+    assert isinstance(make_cache("lookups", ttl=5), TTLCache)
+    with pytest.raises(ValueError):
+        make_cache("lookups", url="memcached://localhost")
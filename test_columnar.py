@@ -0,0 +1,94 @@
+import os
+from datetime import date
+
+import numpy as np
+import pytest
+
+import columnar
+from db import aggregates
+
+TODAY = date(2024, 3, 15)
+
+
+@pytest.fixture
+def cursor(db_cursor):
+    add(db_cursor, [
+        (7, 10.0, "expense", date(2024, 1, 5), "coffee"),
+        (8, 500.0, "income", date(2024, 1, 31), "pay"),
+        (7, 20.0, "expense", date(2024, 2, 10), "lunch"),
+        (7, 5.0, "expense", date(2024, 3, 1), "live"),
+    ])
+    return db_cursor
+
+
+def add(cursor, rows):
+    cursor.executemany(
+        "INSERT INTO transactions (user_id, category_id, amount, transaction_type, transaction_date, description) "
+        "VALUES (1, ?, ?, ?, ?, ?)",
+        rows,
+    )
+    aggregates.record_many(cursor, [(1, c, kind, when, amount, 1) for c, amount, kind, when, _ in rows])
+
+
+def snapshot_dirs(store):
+    return sorted(os.listdir(os.path.join(store.root, "1")))
+
+
+def test_closed_months_are_memory_mapped_and_current_month_is_live(cursor, tmp_path):
+    store = columnar.MonthStore(str(tmp_path / "store"))
+    months = store.months(cursor, 1, today=TODAY)
+
+    assert [month for month, _ in months] == [date(2024, 1, 1), date(2024, 2, 1), date(2024, 3, 1)]
+    assert isinstance(months[0][1].amount, np.memmap)
+    assert not isinstance(months[2][1].amount, np.memmap)
+    assert months[0][1].description.tolist() == ["coffee", "pay"]
+    assert [name[:7] for name in snapshot_dirs(store)] == ["2024-01", "2024-02"]
+
+    # A write into a closed month changes its fingerprint; only that month is rebuilt
+    before = snapshot_dirs(store)
+    add(cursor, [(7, 1.0, "expense", date(2024, 2, 11), "late")])
+    months = store.months(cursor, 1, today=TODAY)
+    after = snapshot_dirs(store)
+    assert after[0] == before[0] and after[1] != before[1]
+    assert months[1][1].amount.tolist() == [20.0, 1.0]
+
+    # So does an edit that leaves the month's totals as they were
+    before = snapshot_dirs(store)
+    cursor.execute("UPDATE transactions SET description = 'espresso', transaction_date = '2024-01-06' "
+                   "WHERE description = 'coffee'")
+    aggregates.record_many(cursor, [
+        (1, 7, "expense", date(2024, 1, 5), 10.0, -1), (1, 7, "expense", date(2024, 1, 6), 10.0, 1),
+    ])
+    months = columnar.MonthStore(store.root).months(cursor, 1, today=TODAY)
+    after = snapshot_dirs(store)
+    assert after[0] != before[0] and after[1] == before[1]
+    assert months[0][1].description.tolist() == ["espresso", "pay"]
+    assert aggregates.find_drift(cursor) == []
+
+    store.drop_user(1)
+    assert not os.path.exists(os.path.join(store.root, "1"))
+
+
+def test_export_rows_match_sql_order_and_filters(cursor, tmp_path):
+    months = columnar.MonthStore(str(tmp_path / "store")).months(cursor, 1, today=TODAY)
+    names = {7: "Food", 8: "Salary"}
+
+    rows = [row for batch in columnar.iter_export_rows(months, names, {}, batch_size=2) for row in batch]
+    assert [(r[0], r[4]) for r in rows] == [
+        (date(2024, 3, 1), "live"), (date(2024, 2, 10), "lunch"),
+        (date(2024, 1, 31), "pay"), (date(2024, 1, 5), "coffee"),
+    ]
+    assert rows[2] == (date(2024, 1, 31), "income", "Salary", 500.0, "pay")
+
+    filters = {"type": "expense", "from": "2024-01-01", "to": "2024-02-10"}
+    rows = [row for batch in columnar.iter_export_rows(months, names, filters, batch_size=10) for row in batch]
+    assert [r[4] for r in rows] == ["lunch", "coffee"]
+    # Categories the user cannot see are left out, like the SQL inner join
+    rows = [row for batch in columnar.iter_export_rows(months, {7: "Food"}, {}, batch_size=10) for row in batch]
+    assert "pay" not in [r[4] for r in rows]
+
+
+def test_export_supported():
+    assert columnar.export_supported({"type": "income", "from": "2024-01-01", "to": "2024-02-01"})
+    assert not columnar.export_supported({"keyword": "coffee"})
+    assert not columnar.export_supported({"from": "last week", "to": "2024-02-01"})
@@ -0,0 +1,48 @@
+from datetime import date
+
+import pytest
+
+from db import aggregates, versions
+from db.batch import fetch_batch
+from views.dashboard import cached_dashboard_snapshot, dashboard_queries, dashboard_snapshot
+from views.shared import dashboard_cache, get_cursor
+
+MAY = date(2024, 5, 1)
+
+
+@pytest.fixture
+def seeded(migrated_db):
+    dashboard_cache.clear()
+    with get_cursor() as cursor:
+        cursor.execute("INSERT INTO categories (category_id, user_id, category_name, category_type) "
+                       "VALUES (7, 1, 'Food', 'expense')")
+        aggregates.record_many(cursor, [
+            (1, 7, "expense", date(2024, 4, 30), 5, 1),
+            (1, 7, "expense", date(2024, 5, 3), 10, 1),
+            (1, None, "income", date(2024, 5, 9), 100, 1),
+            # Post-dated into next month
+            (1, 7, "expense", date(2024, 6, 1), 40, 1),
+        ])
+    yield
+    dashboard_cache.clear()
+
+
+def test_month_totals_cover_only_that_month(seeded):
+    with get_cursor() as cursor:
+        snapshot = dashboard_snapshot(MAY, fetch_batch(cursor, dashboard_queries(1, MAY)))
+    assert (snapshot["total_income"], snapshot["total_expenses"]) == (100, 10)
+    assert (snapshot["chart_labels"], snapshot["chart_values"]) == (["Food"], [10.0])
+
+
+def test_snapshot_goes_stale_when_another_process_writes(seeded):
+    tag, snapshot = cached_dashboard_snapshot(1, MAY)
+    assert snapshot is None
+    dashboard_cache.set(1, (tag, {"total_income": 100}))
+    assert cached_dashboard_snapshot(1, MAY) == (tag, {"total_income": 100})
+
+    # e.g. the scheduler posting a bill, which never touches this process's cache
+    with get_cursor() as cursor:
+        versions.bump(cursor, 1, versions.BILLS)
+    new_tag, snapshot = cached_dashboard_snapshot(1, MAY)
+    assert snapshot is None and new_tag != tag
+    assert cached_dashboard_snapshot(1, date(2024, 6, 1))[1] is None
@@ -0,0 +1,125 @@
+import threading
+import time
+
+import pytest
+
+from db.config import DBConfig, load_config
+from db.engines import connector_for
+from db.pool import ConnectionPool, PoolTimeout
+
+
+def _sqlite_pool(tmp_path, **kwargs):
+    config = DBConfig(
+        engine="sqlite",
+        sqlite_path=str(tmp_path / "pool.db"),
+        conn_str=None,
+        pool_min_size=1,
+        pool_max_size=2,
+        pool_timeout=1,
+        pool_max_idle=300,
+        pool_max_lifetime=3600,
+    )
+    return ConnectionPool(connector_for(config), **kwargs)
+
+
+def test_connections_are_reused(tmp_path):
+    pool = _sqlite_pool(tmp_path, max_size=2)
+    with pool.connection() as conn:
+        first = conn._entry.conn
+    with pool.connection() as conn:
+        assert conn._entry.conn is first
+    assert pool.stats()["created"] == 1
+    assert pool.stats()["checkouts"] == 2
+
+
+def test_sqlite_cursor_accepts_pyodbc_style_params(tmp_path):
+    pool = _sqlite_pool(tmp_path)
+    with pool.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("CREATE TABLE t (a INTEGER, b TEXT)")
+        cursor.execute("INSERT INTO t (a, b) VALUES (?, ?)", 1, "x")
+        cursor.execute("INSERT INTO t (a, b) VALUES (?, ?)", (2, "y"))
+        row = cursor.execute("SELECT a, b FROM t WHERE a = ?", 2).fetchone()
+        assert row.b == "y"
+
+
+def test_uncommitted_work_is_rolled_back_on_release(tmp_path):
+    pool = _sqlite_pool(tmp_path)
+    with pool.connection() as conn:
+        conn.cursor().execute("CREATE TABLE t (a INTEGER)")
+        conn.commit()
+        conn.cursor().execute("INSERT INTO t (a) VALUES (1)")
+    with pool.connection() as conn:
+        assert conn.cursor().execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+
+
+def test_idle_connections_are_recycled(tmp_path):
+    pool = _sqlite_pool(tmp_path, max_idle=0.01)
+    with pool.connection():
+        pass
+    time.sleep(0.02)
+    with pool.connection():
+        pass
+    stats = pool.stats()
+    assert stats["recycled"] == 1
+    assert stats["created"] == 2
+    assert stats["size"] == 1
+
+
+def test_broken_connection_fails_health_check(tmp_path):
+    pool = _sqlite_pool(tmp_path)
+    with pool.connection() as conn:
+        raw = conn._entry.conn
+    raw.close()
+    with pool.connection() as conn:
+        assert conn._entry.conn is not raw
+    assert pool.stats()["failed_health_checks"] == 1
+
+
+def test_checkout_times_out_when_exhausted(tmp_path):
+    pool = _sqlite_pool(tmp_path, max_size=1, timeout=0.05)
+    with pool.connection():
+        with pytest.raises(PoolTimeout):
+            pool.acquire()
+    assert pool.stats()["timeouts"] == 1
+
+
+def test_waiters_get_released_connections(tmp_path):
+    pool = _sqlite_pool(tmp_path, max_size=1, timeout=2)
+    entry = pool.acquire()
+    acquired = []
+
+    def worker():
+        acquired.append(pool.acquire())
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    time.sleep(0.05)
+    pool.release(entry)
+    thread.join(1)
+
+    assert acquired and acquired[0] is entry
+    assert pool.stats()["waits"] == 1
+
+
+def test_warm_opens_min_size(tmp_path):
+    pool = _sqlite_pool(tmp_path, min_size=2, max_size=3)
+    pool.warm()
+    assert pool.stats()["idle"] == 2
+
+
+def test_in_memory_sqlite_keeps_one_connection_forever(monkeypatch):
+    monkeypatch.setenv("DB_ENGINE", "sqlite")
+    monkeypatch.setenv("DB_PATH", ":memory:")
+    monkeypatch.setenv("DB_POOL_MAX_IDLE", "0.01")
+    config = load_config()
+    assert config.pool_max_size == 1
+    pool = ConnectionPool(connector_for(config), max_size=1, max_idle=config.pool_max_idle,
+                          max_lifetime=config.pool_max_lifetime)
+    with pool.connection() as conn:
+        conn.cursor().execute("CREATE TABLE kept (id INTEGER)")
+        conn.commit()
+    time.sleep(0.02)
+    with pool.connection() as conn:
+        conn.cursor().execute("SELECT COUNT(*) FROM kept")
+    assert pool.stats()["recycled"] == 0
@@ -0,0 +1,27 @@
+import sqlite3
+from datetime import date
+
+from db.dialect import in_month, month_bounds, month_label
+
+
+def test_month_bounds_accepts_strings_and_dates():
+    assert month_bounds("2024-02") == (date(2024, 2, 1), date(2024, 3, 1))
+    assert month_bounds("2024-02-17") == (date(2024, 2, 1), date(2024, 3, 1))
+    assert month_bounds(date(2023, 12, 31)) == (date(2023, 12, 1), date(2024, 1, 1))
+
+
+def test_in_month_is_half_open_on_sqlite():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE t (d DATE, m DATE)")
+    conn.executemany(
+        "INSERT INTO t VALUES (?, '2024-01-01')",
+        [("2023-12-31",), ("2024-01-01",), ("2024-01-31 23:59:00",), ("2024-02-01",)],
+    )
+    rows = conn.execute(f"SELECT d FROM t WHERE {in_month('d', 'm', 'sqlite')} ORDER BY d").fetchall()
+    assert [r[0] for r in rows] == ["2024-01-01", "2024-01-31 23:59:00"]
+
+
+def test_month_label_per_engine():
+    assert month_label("b.budget_month", "mssql") == "CONVERT(char(7), b.budget_month, 126)"
+    conn = sqlite3.connect(":memory:")
+    assert conn.execute(f"SELECT {month_label('?', 'sqlite')}", ("2024-03-01",)).fetchone()[0] == "2024-03"
@@ -0,0 +1,30 @@
+import gzip
+import sqlite3
+
+from exports import gzip_chunks, iter_csv
+
+
+def _cursor(rows):
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE t (d TEXT, amount REAL, description TEXT)")
+    conn.executemany("INSERT INTO t VALUES (?, ?, ?)", rows)
+    return conn.execute("SELECT d, amount, description FROM t ORDER BY rowid")
+
+
+def test_iter_csv_streams_in_batches():
+    rows = [("2024-01-%02d" % (i + 1), float(i), "note, with comma") for i in range(5)]
+    chunks = list(iter_csv(_cursor(rows), ["Date", "Amount", "Description"], batch_size=2))
+
+    # header + first batch, second batch, last batch
+    assert len(chunks) == 3
+    lines = b"".join(chunks).decode().splitlines()
+    assert lines[0] == "Date,Amount,Description"
+    assert lines[1] == '2024-01-01,0.0,"note, with comma"'
+    assert len(lines) == 6
+
+
+def test_gzip_chunks_round_trip():
+    rows = [("2024-01-01", 1.5, "x")] * 100
+    plain = b"".join(iter_csv(_cursor(rows), ["Date", "Amount", "Description"]))
+    compressed = b"".join(gzip_chunks(iter_csv(_cursor(rows), ["Date", "Amount", "Description"], batch_size=7)))
+    assert gzip.decompress(compressed) == plain
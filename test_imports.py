@@ -0,0 +1,92 @@
+import io
+import json
+from collections import namedtuple
+from datetime import date
+
+import pytest
+
+import imports
+from db import aggregates, ledger, search
+from db.engines import connect_sqlite
+from my_app import create_app
+
+Category = namedtuple("Category", "category_id category_name category_type")
+Account = namedtuple("Account", "account_id account_name")
+
+CSV = b"""\xef\xbb\xbfDate,Type,Category,Amount,Description,Account
+2024-05-01,expense,Food,12.50,lunch,
+2024-05-02,income,,"1,000",pay,Savings
+2024-05-03,expense,Food,oops,x,
+2024-05-04,expense,Nope,1,x,
+"""
+
+OFX = b"""OFXHEADER:100
+<OFX><BANKTRANLIST>
+<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20240510120000<TRNAMT>-20.00<NAME>Shop</STMTTRN>
+<STMTTRN>
+<TRNTYPE>CREDIT
+<DTPOSTED>20240511
+<TRNAMT>5.5
+<NAME>Refund
+<MEMO>refund memo
+</STMTTRN>
+</BANKTRANLIST></OFX>"""
+
+
+def test_read_ofx_handles_sgml_and_split_chunks():
+    records = [record for _, record in imports.read_ofx(io.BytesIO(OFX), chunk_size=16)]
+    assert records == [
+        {"date": "20240510", "type": "expense", "amount": "20.00", "description": "Shop"},
+        {"date": "20240511", "type": "income", "amount": "5.5", "description": "refund memo"},
+    ]
+
+
+@pytest.fixture
+def cursor(db_cursor):
+    db_cursor.executemany(
+        "INSERT INTO user_accounts (user_id, account_name, account_type, current_balance) VALUES (1, ?, 'bank', 100)",
+        [("Checking",), ("Savings",)],
+    )
+    ledger.open_account(db_cursor, 1, 1, 100)
+    ledger.open_account(db_cursor, 1, 2, 100)
+    return db_cursor
+
+
+def test_import_maps_validates_and_batches(cursor):
+    mapper = imports.RowMapper(
+        [Category(7, "Food", "expense")], [Account(1, "Checking"), Account(2, "Savings")], default_account_id=1
+    )
+    progress = list(imports.import_transactions(cursor, 1, imports.read_csv(io.BytesIO(CSV)), mapper, batch_size=1))
+
+    assert [p["imported"] for p in progress] == [1, 2, 2]
+    assert progress[-1]["done"] and progress[-1]["failed"] == 2
+    assert [e["line"] for e in progress[-1]["errors"]] == [4, 5]
+
+    cursor.execute("SELECT category_id, amount, transaction_date, account_id FROM transactions ORDER BY transaction_id")
+    assert [tuple(r) for r in cursor.fetchall()] == [(7, 12.5, date(2024, 5, 1), 1), (None, 1000.0, date(2024, 5, 2), 2)]
+    assert ledger.balances(cursor, 1) == {1: 87.5, 2: 1100}
+    assert aggregates.find_drift(cursor) == []
+    rows, _ = search.ranked(cursor, 1, {"keyword": "pa"}, 10)
+    assert [row.description for row in rows] == ["pay"]
+
+
+def test_unknown_default_account_is_rejected():
+    with pytest.raises(imports.RecordError):
+        imports.RowMapper([], [Account(1, "Checking")], default_account_id=2)
+
+
+def test_import_route_reports_done_after_committing(migrated_db):
+    client = create_app("web", migrated_db).test_client()
+    with client.session_transaction() as session:
+        session["user_id"] = 1
+    response = client.post("/import_transactions", buffered=False,
+                           data={"file": (io.BytesIO(b"Date,Type,Amount\n2024-05-01,expense,3\n"), "in.csv")})
+    for line in response.response:
+        if json.loads(line).get("done"):
+            # Seen from another connection, so only once the import committed
+            conn = connect_sqlite(migrated_db)
+            assert conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0] == 1
+            conn.close()
+            break
+    else:
+        pytest.fail("no done line")
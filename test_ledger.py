@@ -0,0 +1,150 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import db
+from db import ledger, versions
+from db.engines import connect_sqlite
+from my_app import create_app
+
+
+def utc_now():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+@pytest.fixture
+def cursor(db_cursor):
+    db_cursor.execute("INSERT INTO users (full_name, email, password_hash) VALUES ('A', 'a@x', 'h')")
+    db_cursor.execute(
+        "INSERT INTO user_accounts (user_id, account_name, account_type, current_balance) VALUES (1, 'Main', 'bank', 100)"
+    )
+    ledger.open_account(db_cursor, 1, 1, 100)
+    return db_cursor
+
+
+def test_balance_is_snapshot_plus_entries(cursor):
+    ledger.post_many(cursor, [
+        (1, 1, ledger.signed("income", 50), ledger.TRANSACTION, None),
+        (1, 1, ledger.signed("expense", 30), ledger.TRANSACTION, None),
+        (1, None, 999, ledger.TRANSACTION, None),  # no account: skipped
+    ])
+    assert ledger.balance(cursor, 1) == 120
+    assert ledger.balances(cursor, 1) == {1: 120}
+    assert ledger.total_balance(cursor, 1) == 120
+    # current_balance only moves when a snapshot is taken
+    assert ledger.find_drift(cursor) == []
+
+
+def test_checkpoint_snapshots_busy_accounts_and_mirrors_current_balance(cursor):
+    ledger.post(cursor, 1, 1, 25)
+    assert ledger.checkpoint(cursor, min_entries=2) == 0
+    ledger.post(cursor, 1, 1, -5)
+    assert ledger.checkpoint(cursor, min_entries=2) == 1
+
+    cursor.execute("SELECT current_balance FROM user_accounts WHERE account_id = 1")
+    assert cursor.fetchone().current_balance == 120
+    cursor.execute("SELECT COUNT(*) AS n FROM account_balance_snapshots WHERE account_id = 1")
+    assert cursor.fetchone().n == 2
+    assert ledger.balance(cursor, 1) == 120
+    assert ledger.find_drift(cursor) == []
+
+
+def test_balance_as_of(cursor):
+    before = utc_now() - timedelta(days=1)
+    ledger.post(cursor, 1, 1, 40)
+    ledger.checkpoint(cursor, min_entries=1)
+    ledger.post(cursor, 1, 1, 10)
+
+    assert ledger.balance(cursor, 1, as_of=before) == 0
+    assert ledger.balance(cursor, 1, as_of=utc_now() + timedelta(minutes=5)) == 150
+
+
+def test_entries_are_stamped_in_utc(cursor, monkeypatch):
+    # A server clock well away from UTC must not move point-in-time balances
+    monkeypatch.setenv("TZ", "Etc/GMT+10")
+    time.tzset()
+    try:
+        ledger.post(cursor, 1, 1, 40)
+        assert ledger.balance(cursor, 1, as_of=utc_now() - timedelta(hours=1)) == 0
+        assert ledger.balance(cursor, 1, as_of=utc_now() + timedelta(minutes=1)) == 140
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+
+def test_find_drift_and_rebuild(cursor):
+    ledger.post(cursor, 1, 1, 40)
+    ledger.checkpoint(cursor, min_entries=1)
+    cursor.execute("UPDATE user_accounts SET current_balance = 7 WHERE account_id = 1")
+    assert ledger.find_drift(cursor) == [(1, 7.0, 140.0)]
+    assert ledger.find_drift(cursor, user_id=2) == []
+
+    ledger.rebuild(cursor, user_id=1)
+    assert ledger.find_drift(cursor) == []
+    assert ledger.balance(cursor, 1) == 140
+
+
+def test_checkpoint_waits_for_open_ledger_writes(cursor):
+    # An import still inside its transaction when the checkpoint starts
+    cursor.connection.commit()
+    ledger.post(cursor, 1, 1, 30)
+
+    checkpointer = connect_sqlite(db.get_config())
+    done = threading.Event()
+
+    def run():
+        ledger.checkpoint(checkpointer.cursor(), min_entries=1)
+        checkpointer.commit()
+        done.set()
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    assert not done.wait(0.3)
+    ledger.post(cursor, 1, 1, 5)
+    cursor.connection.commit()
+    thread.join()
+    checkpointer.close()
+
+    cursor.execute("SELECT current_balance FROM user_accounts WHERE account_id = 1")
+    assert cursor.fetchone().current_balance == 135
+    assert ledger.find_drift(cursor) == []
+    assert ledger.checkpoint(cursor, min_entries=1) == 0
+
+
+@pytest.fixture
+def client(cursor, migrated_db):
+    cursor.execute("INSERT INTO categories (category_name, category_type, user_id) VALUES ('Food', 'expense', 1)")
+    cursor.connection.commit()
+    client = create_app("web", migrated_db).test_client()
+    with client.session_transaction() as session:
+        session["user_id"] = 1
+    return client
+
+
+def ledger_total(cursor):
+    cursor.execute("SELECT SUM(amount) AS total FROM account_ledger WHERE account_id = 1")
+    return cursor.fetchone().total
+
+
+def test_transaction_routes_post_to_the_ledger(client, cursor):
+    form = {"category_id": 1, "transaction_type": "expense", "amount": 100,
+            "transaction_date": "2024-05-01", "account_id": 1}
+    client.post("/add_transaction", data=form)
+    assert ledger_total(cursor) == 0
+
+    client.post("/edit_transaction/1", data=dict(form, amount=150))
+    assert ledger_total(cursor) == -50
+
+    client.get("/delete_transaction/1")
+    assert ledger_total(cursor) == 100
+
+
+def test_editing_a_missing_transaction_changes_nothing(client, cursor):
+    tables = (versions.TRANSACTIONS, versions.ACCOUNTS)
+    before = versions.get_versions(cursor, 1, tables)
+    client.post("/edit_transaction/99", data={"category_id": 1, "transaction_type": "expense", "amount": 5,
+                                              "transaction_date": "2024-05-01", "account_id": 1})
+    assert versions.get_versions(cursor, 1, tables) == before
+    assert ledger_total(cursor) == 100
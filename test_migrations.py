@@ -0,0 +1,45 @@
+from db.config import DBConfig
+from db.engines import connector_for
+from scripts.init_db import apply_baseline, applied_versions, discover_migrations, migrate
+
+
+def _connect(tmp_path):
+    config = DBConfig("sqlite", str(tmp_path / "migrate.db"), None, 1, 1, 1, 300, 3600)
+    return connector_for(config)()
+
+
+def test_migrations_apply_once(tmp_path):
+    conn = _connect(tmp_path)
+    apply_baseline(conn, "sqlite")
+    first = migrate(conn, "sqlite", log=lambda msg: None)
+    assert first == [version for version, _, _ in discover_migrations("sqlite")]
+
+    apply_baseline(conn, "sqlite")
+    assert migrate(conn, "sqlite", log=lambda msg: None) == []
+    assert applied_versions(conn) == set(first)
+
+
+def test_migrate_stops_at_target(tmp_path):
+    conn = _connect(tmp_path)
+    apply_baseline(conn, "sqlite")
+    assert migrate(conn, "sqlite", target=1, log=lambda msg: None) == [1]
+
+
+def test_hot_queries_use_covering_indexes(tmp_path):
+    conn = _connect(tmp_path)
+    apply_baseline(conn, "sqlite")
+    migrate(conn, "sqlite", log=lambda msg: None)
+
+    cursor = conn.cursor()
+    plan = cursor.execute(
+        """EXPLAIN QUERY PLAN SELECT budget_amount FROM budgets
+           WHERE user_id = ? AND category_id = ? AND budget_month = ?""",
+        1, 1, "2024-01-01",
+    ).fetchall()
+    assert "ix_budgets_user_category_month" in plan[0][-1]
+
+
+def test_every_migration_exists_for_both_engines():
+    mssql = [(v, n) for v, n, _ in discover_migrations("mssql")]
+    sqlite = [(v, n) for v, n, _ in discover_migrations("sqlite")]
+    assert mssql == sqlite
@@ -0,0 +1,93 @@
+from collections import namedtuple
+from datetime import date, datetime
+
+import pytest
+
+from db import aggregates, ledger, recurrence
+
+
+def test_occurrences_anchor_on_start_date():
+    assert recurrence.occurrences("monthly", date(2024, 1, 31), None, date(2024, 4, 30)) == [
+        date(2024, 1, 31), date(2024, 2, 29), date(2024, 3, 31), date(2024, 4, 30),
+    ]
+    assert recurrence.occurrences("weekly", date(2024, 1, 1), date(2024, 1, 10), date(2024, 1, 29)) == [
+        date(2024, 1, 15), date(2024, 1, 22), date(2024, 1, 29),
+    ]
+    assert recurrence.occurrences("yearly", date(2020, 2, 29), date(2021, 2, 28), date(2024, 3, 1)) == [
+        date(2022, 2, 28), date(2023, 2, 28), date(2024, 2, 29),
+    ]
+    assert recurrence.occurrences("daily", date(2024, 1, 1), date(2024, 1, 5), date(2024, 1, 5)) == []
+    assert recurrence.occurrences("hourly", date(2024, 1, 1), None, date(2024, 1, 5)) == []
+
+
+@pytest.fixture
+def cursor(db_cursor):
+    db_cursor.execute("INSERT INTO user_accounts (user_id, account_name, account_type, current_balance) VALUES (1, 'Main', 'bank', 100)")
+    ledger.open_account(db_cursor, 1, 1, 100)
+    db_cursor.executemany(
+        """INSERT INTO recurring_transactions (user_id, category_id, account_id, amount, transaction_type,
+                                               frequency, start_date, end_date, last_generated_date)
+           VALUES (1, 1, 1, ?, ?, ?, ?, ?, ?)""",
+        [
+            (10, "expense", "weekly", "2024-01-01", None, None),
+            (500, "income", "monthly", "2023-11-15", "2024-02-01", "2023-12-15"),
+        ],
+    )
+    return db_cursor
+
+
+def test_generate_due_catches_up_once(cursor):
+    assert recurrence.generate_due(cursor, today=date(2024, 1, 22)) == 4 + 1
+    assert recurrence.generate_due(cursor, today=date(2024, 1, 22)) == 0
+
+    cursor.execute("SELECT recurring_id, transaction_date FROM transactions ORDER BY recurring_id, transaction_date")
+    assert [(r.recurring_id, r.transaction_date) for r in cursor.fetchall()] == [
+        (1, date(2024, 1, 1)), (1, date(2024, 1, 8)), (1, date(2024, 1, 15)), (1, date(2024, 1, 22)),
+        (2, date(2024, 1, 15)),
+    ]
+    assert ledger.balance(cursor, 1) == 100 - 40 + 500
+    assert aggregates.find_drift(cursor) == []
+
+    # The monthly rule ended on 2024-02-01, so only the weekly one continues
+    assert recurrence.generate_due(cursor, today=date(2024, 3, 1)) == 5
+
+
+def test_generate_due_skips_rows_posted_by_an_interrupted_run(cursor):
+    cursor.execute(
+        """INSERT INTO transactions (user_id, category_id, amount, transaction_type, transaction_date,
+                                     account_id, recurring_id, is_recurring_generated)
+           VALUES (1, 1, 10, 'expense', '2024-01-08', 1, 1, 1)"""
+    )
+    assert recurrence.generate_due(cursor, today=date(2024, 1, 8), user_id=1) == 1
+    cursor.execute("SELECT last_generated_date FROM recurring_transactions WHERE recurring_id = 1")
+    assert cursor.fetchone().last_generated_date == date(2024, 1, 8)
+
+
+class DatetimeTransactionDates:
+    """A cursor that reads transaction_date back as a datetime, as pyodbc does
+    for SQL Server's DATETIME column."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        if not rows or "transaction_date" not in rows[0].keys():
+            return rows
+        Row = namedtuple("Row", rows[0].keys())
+        return [Row(**dict(row, transaction_date=datetime.combine(row["transaction_date"], datetime.min.time())))
+                for row in rows]
+
+
+def test_generate_due_skips_posted_rows_read_back_as_datetimes(cursor):
+    cursor.execute(
+        """INSERT INTO transactions (user_id, category_id, amount, transaction_type, transaction_date,
+                                     account_id, recurring_id, is_recurring_generated)
+           VALUES (1, 1, 10, 'expense', '2024-01-08', 1, 1, 1)"""
+    )
+    assert recurrence.generate_due(DatetimeTransactionDates(cursor), today=date(2024, 1, 8), user_id=1) == 1
+    cursor.execute("SELECT COUNT(*) AS n FROM transactions WHERE recurring_id = 1")
+    assert cursor.fetchone().n == 2
@@ -0,0 +1,47 @@
+from datetime import date
+
+import pytest
+
+from db import reminders
+
+
+@pytest.fixture
+def cursor(db_cursor):
+    db_cursor.executemany(
+        "INSERT INTO bill_reminders (user_id, bill_name, amount, due_date, status) VALUES (?, ?, 10, ?, ?)",
+        [
+            (1, "Rent", "2024-03-11", "pending"),
+            (1, "Phone", "2024-03-20", "pending"),
+            (2, "Water", "2024-03-10", "pending"),
+            (3, "Power", "2024-03-12", "paid"),
+        ],
+    )
+    return db_cursor
+
+
+def _messages(cursor):
+    cursor.execute("SELECT user_id, message FROM notifications ORDER BY related_entity_id")
+    return [(row.user_id, row.message) for row in cursor.fetchall()]
+
+
+def test_reminds_each_due_bill_once(cursor):
+    assert reminders.notify_upcoming_bills(cursor, today=date(2024, 3, 10)) == {1, 2}
+    assert _messages(cursor) == [(1, "Bill 'Rent' is due on 2024-03-11"), (2, "Bill 'Water' is due on 2024-03-10")]
+    assert reminders.notify_upcoming_bills(cursor, today=date(2024, 3, 10)) == set()
+
+    # A wider window picks up the later bill, still without repeating the others
+    assert reminders.notify_upcoming_bills(cursor, today=date(2024, 3, 10), lookahead_days=10) == {1}
+    assert len(_messages(cursor)) == 3
+
+
+def test_limits_to_user_or_range(cursor):
+    assert reminders.notify_upcoming_bills(cursor, today=date(2024, 3, 10), user_id=2) == {2}
+    assert reminders.notify_upcoming_bills(cursor, today=date(2024, 3, 10), users=(1, 1)) == {1}
+
+
+def test_duplicate_entity_notifications_are_rejected(cursor):
+    insert = """INSERT INTO notifications (user_id, notification_type, message, related_entity_type, related_entity_id)
+                VALUES (1, 'bill_reminder', 'x', 'bill', 1)"""
+    cursor.execute(insert)
+    with pytest.raises(Exception):
+        cursor.execute(insert)
@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+import db
+import reports
+from db import versions
+
+
+@pytest.fixture
+def conn(migrated_db):
+    conn = db.connect()
+    cursor = conn.cursor()
+    cursor.execute("INSERT INTO categories (category_name, category_type) VALUES ('Food', 'expense')")
+    cursor.executemany(
+        """INSERT INTO transactions (user_id, category_id, amount, transaction_type, transaction_date, description)
+           VALUES (1, 1, ?, 'expense', ?, 'lunch')""",
+        [(12.5, "2024-05-01"), (7.25, "2024-05-02")],
+    )
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+def test_same_request_reuses_job_until_data_changes(conn):
+    cursor = conn.cursor()
+    first = reports.enqueue(cursor, 1, {"type": "expense"})
+    assert reports.enqueue(cursor, 1, {"type": "expense", "after": "x"}) == first
+    assert reports.enqueue(cursor, 1, {"type": "income"}) != first
+
+    cursor.execute(
+        """INSERT INTO transactions (user_id, category_id, amount, transaction_type, transaction_date)
+           VALUES (1, 1, 3, 'expense', '2024-05-03')"""
+    )
+    versions.bump(cursor, 1, versions.TRANSACTIONS)
+    assert reports.enqueue(cursor, 1, {"type": "expense"}) != first
+    # Another user's writes leave the report alone
+    second = reports.enqueue(cursor, 1, {"type": "expense"})
+    versions.bump(cursor, 2, versions.TRANSACTIONS)
+    assert reports.enqueue(cursor, 1, {"type": "expense"}) == second
+
+
+def test_jobs_are_claimed_in_order_and_stale_ones_again(conn):
+    cursor = conn.cursor()
+    first = reports.enqueue(cursor, 1, {"type": "expense"})
+    second = reports.enqueue(cursor, 1, {"type": "income"})
+    now = datetime.now()
+    assert reports.claim_next(cursor, now=now).job_id == first
+    assert reports.claim_next(cursor, now=now).job_id == second
+    assert reports.claim_next(cursor, now=now) is None
+
+    # The first job's worker never finished it
+    later = now + timedelta(seconds=reports.REPORT_JOB_TIMEOUT + 1)
+    assert reports.enqueue(cursor, 1, {"type": "expense"}, now=now) == first
+    assert reports.enqueue(cursor, 1, {"type": "expense"}, now=later) not in (first, second)
+    assert reports.claim_next(cursor, now=later).job_id == first
+
+
+def test_worker_renders_claimed_jobs(conn, tmp_path):
+    cursor = conn.cursor()
+    job_id = reports.enqueue(cursor, 1, {"type": "expense"})
+    conn.commit()
+    conn.close()
+
+    reports.work(reports_dir=str(tmp_path / "out"), once=True)
+
+    conn = db.connect()
+    cursor = conn.cursor()
+    job = reports.get_job(cursor, 1, job_id)
+    assert job.status == reports.DONE
+    with open(job.file_path, "rb") as pdf:
+        assert pdf.read(4) == b"%PDF"
+    assert reports.get_job(cursor, 2, job_id) is None
+    # A finished report is served again rather than re-rendered
+    assert reports.enqueue(cursor, 1, {"type": "expense"}) == job_id
+    assert reports.claim_next(cursor) is None
@@ -0,0 +1,66 @@
+from datetime import date
+
+import pytest
+
+import scheduler
+
+TODAY = date(2024, 3, 10)
+
+
+@pytest.fixture
+def cursor(db_cursor):
+    for user in range(1, 11):
+        db_cursor.execute("INSERT INTO users (full_name, email, password_hash) VALUES ('u', ?, 'x')", f"u{user}@x")
+        db_cursor.execute(
+            """INSERT INTO recurring_transactions (user_id, category_id, amount, transaction_type, frequency,
+                                                   start_date, last_generated_date)
+               VALUES (?, 1, 5, 'expense', 'daily', '2024-01-01', '2024-03-08')""",
+            user,
+        )
+        db_cursor.execute(
+            "INSERT INTO bill_reminders (user_id, bill_name, amount, due_date) VALUES (?, 'Rent', 900, '2024-03-12')",
+            user,
+        )
+    db_cursor.connection.commit()
+    return db_cursor
+
+
+def _count(cursor, table):
+    cursor.execute(f"SELECT COUNT(*) AS n FROM {table}")
+    return cursor.fetchone().n
+
+
+def test_shards_cover_every_user(cursor):
+    ranges = [scheduler.shard_range(cursor, shard, 3) for shard in range(3)]
+    assert ranges == [(1, 4), (5, 8), (9, 10)]
+    totals = [scheduler.run_shard(shard, 3, today=TODAY, batch_users=2) for shard in range(3)]
+    assert sum(generated for generated, _ in totals) == 20
+    assert sum(notified for _, notified in totals) == 10
+    # A second pass is a no-op
+    assert scheduler.run_shard(0, 3, today=TODAY) == (0, 0)
+
+
+def test_crashed_run_resumes_from_checkpoint(cursor, monkeypatch):
+    real_batch = scheduler.run_batch
+    calls = []
+
+    def crash_on_third(*args):
+        calls.append(args)
+        if len(calls) == 3:
+            raise RuntimeError("worker died")
+        return real_batch(*args)
+
+    monkeypatch.setattr(scheduler, "run_batch", crash_on_third)
+    with pytest.raises(RuntimeError):
+        scheduler.run_shard(0, 1, today=TODAY, batch_users=3)
+    monkeypatch.setattr(scheduler, "run_batch", real_batch)
+
+    cursor.execute("SELECT next_user_id, finished_at FROM scheduler_checkpoints WHERE shard = '0/1'")
+    checkpoint = cursor.fetchone()
+    assert (checkpoint.next_user_id, checkpoint.finished_at) == (7, None)
+    assert _count(cursor, "notifications") == 6
+
+    # Resumes with the original run date even though the clock moved on
+    scheduler.run_shard(0, 1, today=date(2024, 3, 11), batch_users=3)
+    assert _count(cursor, "notifications") == 10
+    assert _count(cursor, "transactions") == 20
@@ -0,0 +1,119 @@
+
+import pytest
+
+from db import search
+from db.queries import TRANSACTION_COLUMNS, transaction_filters
+
+
+@pytest.fixture
+def cursor(db_cursor):
+    db_cursor.executemany(
+        "INSERT INTO transactions (user_id, amount, transaction_type, transaction_date, description) VALUES (?, ?, ?, ?, ?)",
+        [
+            (1, 4, "expense", "2024-05-01", "Coffee shop downtown near the office"),
+            (1, 9, "expense", "2024-05-02", "coffee beans"),
+            (1, 500, "income", "2024-05-03", "Coffee shop refund"),
+            (1, 7, "expense", "2024-05-04", None),
+            (2, 3, "expense", "2024-05-05", "coffee shop"),
+        ],
+    )
+    search.index_inserted(db_cursor, 5)
+    db_cursor.connection.commit()
+    return db_cursor
+
+
+def descriptions(cursor, keyword, **filters):
+    where, params = transaction_filters(1, dict(filters, keyword=keyword))
+    cursor.execute(TRANSACTION_COLUMNS.format(top="") + where + " ORDER BY t.transaction_id", *params)
+    return [row.description for row in cursor.fetchall()]
+
+
+def test_prefix_and_multi_term_filters_are_per_user(cursor):
+    assert descriptions(cursor, "cof") == [
+        "Coffee shop downtown near the office", "coffee beans", "Coffee shop refund",
+    ]
+    assert descriptions(cursor, "coffee SHO") == ["Coffee shop downtown near the office", "Coffee shop refund"]
+    assert descriptions(cursor, "coffee sho", type="income") == ["Coffee shop refund"]
+    assert descriptions(cursor, "tea") == []
+
+
+def ranked_descriptions(cursor, args, n):
+    rows, next_cursor = search.ranked(cursor, 1, args, n)
+    return [row.description for row in rows], next_cursor
+
+
+def all_pages(cursor, args, n):
+    pages, after = [], None
+    while True:
+        page, after = ranked_descriptions(cursor, dict(args, after=after), n)
+        pages.append(page)
+        if after is None:
+            return pages
+
+
+def test_ranked_orders_by_relevance_and_keeps_filters(cursor):
+    # The shorter description is the closer match
+    assert ranked_descriptions(cursor, {"keyword": "coffee shop"}, 10) == (
+        ["Coffee shop refund", "Coffee shop downtown near the office"], None,
+    )
+    rows, _ = ranked_descriptions(cursor, {"keyword": "coffee", "from": "2024-05-02", "to": "2024-05-02"}, 10)
+    assert rows == ["coffee beans"]
+
+
+def test_ranked_pages_through_every_match(cursor, monkeypatch):
+    cursor.executemany(
+        "INSERT INTO transactions (user_id, amount, transaction_type, transaction_date, description) VALUES (?, ?, ?, ?, ?)",
+        [(1, day, "expense", f"2024-04-{day:02d}", f"coffee {'x ' * (day % 3)}{day}") for day in range(1, 11)],
+    )
+    search.index_inserted(cursor, 10)
+    assert all_pages(cursor, {"keyword": "coffee"}, 4) == [
+        ["coffee beans", "coffee 9", "coffee 6", "coffee 3"],
+        ["Coffee shop refund", "coffee x 10", "coffee x 7", "coffee x 4"],
+        ["coffee x 1", "coffee x x 8", "coffee x x 5", "coffee x x 2"],
+        ["Coffee shop downtown near the office"],
+    ]
+
+    # Only the newest 6 matches are ranked; the older ones follow by date
+    monkeypatch.setattr(search, "SEARCH_RANK_WINDOW", 6)
+    pages = all_pages(cursor, {"keyword": "coffee"}, 4)
+    assert pages == [
+        ["coffee 9", "coffee 6", "coffee x 10", "coffee x 7"],
+        ["coffee x x 8", "coffee x x 5", "Coffee shop refund", "coffee beans"],
+        ["Coffee shop downtown near the office", "coffee x 4", "coffee 3", "coffee x x 2"],
+        ["coffee x 1"],
+    ]
+    assert sorted(sum(pages, [])) == sorted(sum(all_pages(cursor, {"keyword": "coffee"}, 100), []))
+
+    with pytest.raises(ValueError):
+        search.ranked(cursor, 1, {"keyword": "coffee", "after": "2024-05-01~3"}, 4)
+
+
+def test_index_follows_updates_and_deletes(cursor):
+    search.unindex_rows(cursor, [(2, 1, "coffee beans"), (3, 1, "Coffee shop refund"), (4, 1, None)])
+    cursor.execute("UPDATE transactions SET description = 'green tea' WHERE transaction_id = 2")
+    cursor.execute("DELETE FROM transactions WHERE transaction_id = 3")
+    cursor.execute("UPDATE transactions SET description = 'teapot' WHERE transaction_id = 4")
+    search.index_rows(cursor, [(2, 1, "green tea"), (4, 1, "teapot")])
+    assert descriptions(cursor, "coffee") == ["Coffee shop downtown near the office"]
+    assert descriptions(cursor, "tea") == ["green tea", "teapot"]
+
+
+def test_unindex_user(cursor):
+    search.unindex_user(cursor, 1)
+    cursor.execute("DELETE FROM transactions WHERE user_id = 1")
+    assert descriptions(cursor, "coffee") == []
+    cursor.execute("SELECT rowid FROM transactions_fts WHERE transactions_fts MATCH ?", search.match_expression(2, ["coffee"]))
+    assert [row.rowid for row in cursor.fetchall()] == [5]
+
+
+def test_like_fallback(cursor, monkeypatch):
+    monkeypatch.setattr(search, "SEARCH_BACKEND", "like")
+    assert descriptions(cursor, "ee sh") == ["Coffee shop downtown near the office", "Coffee shop refund"]
+    assert ranked_descriptions(cursor, {"keyword": "beans"}, 10) == (["coffee beans"], None)
+    assert all_pages(cursor, {"keyword": "ee sh"}, 1) == [["Coffee shop refund"], ["Coffee shop downtown near the office"]]
+
+
+def test_match_expression():
+    assert search.match_expression(5, ["cof", "sho"], engine="sqlite") == 'owner : u5 AND description : ("cof"* AND "sho"*)'
+    assert search.match_expression(5, ["cof", "sho"], engine="mssql") == '"cof*" AND "sho*"'
+    assert search.terms("Café -- 'shop'!") == ["café", "shop"]
@@ -0,0 +1,113 @@
+import time
+
+import pytest
+from flask import Flask, session
+
+import db
+import scheduler
+import sessions
+from db import session_store
+
+TIMEOUT = 1000
+
+
+def make_app(interface):
+    app = Flask(__name__)
+    app.secret_key = "test"
+    app.session_interface = interface
+
+    @app.route("/login/<int:user_id>")
+    def login(user_id):
+        session["user_id"] = user_id
+        return ""
+
+    @app.route("/page")
+    def page():
+        return str(session.get("user_id"))
+
+    @app.route("/logout")
+    def logout():
+        session.clear()
+        return ""
+
+    return app
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [time.time()]
+    monkeypatch.setattr(sessions.time, "time", lambda: now[0])
+    return now
+
+
+def stored(session_id):
+    with db.get_pool().connection() as conn:
+        return session_store.load(conn.cursor(), session_id, time.time())
+
+
+def test_cookie_sessions_are_rewritten_only_when_changed_or_half_expired(clock):
+    client = make_app(sessions.CookieSessionInterface(TIMEOUT)).test_client()
+    assert "Set-Cookie" in client.get("/login/7").headers
+
+    response = client.get("/page")
+    assert response.text == "7"
+    assert "Set-Cookie" not in response.headers
+
+    clock[0] += 600
+    response = client.get("/page")
+    assert response.text == "7"
+    assert "Set-Cookie" in response.headers
+
+
+def test_cookie_sessions_expire_after_the_idle_timeout(clock):
+    client = make_app(sessions.CookieSessionInterface(TIMEOUT)).test_client()
+    client.get("/login/7")
+    clock[0] += TIMEOUT + 1
+    assert client.get("/page").text == "None"
+
+
+def test_db_sessions_write_on_change_and_rotate_ids(migrated_db, clock):
+    client = make_app(sessions.DBSessionInterface(TIMEOUT)).test_client()
+    client.get("/login/7")
+    first = client.get_cookie("session").value
+    assert stored(first)[0] == {"user_id": 7}
+
+    response = client.get("/page")
+    assert response.text == "7"
+    assert "Set-Cookie" not in response.headers
+    assert stored(first)[1] == int(clock[0] + TIMEOUT)
+
+    # Near expiry: the row's expiry moves, the cookie stays
+    clock[0] += 600
+    assert "Set-Cookie" not in client.get("/page").headers
+    assert stored(first)[1] == int(clock[0] + TIMEOUT)
+
+    client.get("/login/8")
+    second = client.get_cookie("session").value
+    assert second != first
+    assert stored(first) is None
+    assert stored(second)[0] == {"user_id": 8}
+
+    client.get("/logout")
+    assert stored(second) is None
+    assert client.get_cookie("session") is None
+
+
+def test_expired_db_sessions_are_ignored_and_swept_in_batches(migrated_db, clock):
+    client = make_app(sessions.DBSessionInterface(TIMEOUT)).test_client()
+    client.get("/login/7")
+    clock[0] += TIMEOUT + 1
+    assert client.get("/page").text == "None"
+
+    with db.get_pool().connection() as conn:
+        cursor = conn.cursor()
+        cursor.executemany(
+            "INSERT INTO app_sessions (session_id, data, expires_at) VALUES (?, '{}', ?)",
+            [(f"s{n}", 100 if n < 5 else 10**12) for n in range(8)],
+        )
+        conn.commit()
+    assert scheduler.sweep_sessions(now=clock[0], batch=2) == 6
+    with db.get_pool().connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) AS n FROM app_sessions")
+        assert cursor.fetchone().n == 3
@@ -0,0 +1,23 @@
+from scripts import bench_startup
+
+REPORT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _json
+import time:       300 |        420 | json
+import time:        50 |         50 |     fast
+import time:       100 |        150 |   flask
+import time:        80 |         80 |   sessions
+import time:      1000 |       1650 | my_app
+"""
+
+
+def test_importtime_report_is_parsed_into_direct_imports():
+    entries = bench_startup.parse_importtime(REPORT)
+    assert entries[2] == ("fast", 2, 50, 50)
+    assert bench_startup.direct_imports(entries, "my_app") == {"flask": 150, "sessions": 80}
+
+
+def test_app_startup_does_not_import_deferred_modules():
+    imported = {name for name, _, _, _ in bench_startup.measure("my_app")}
+    assert "my_app" in imported
+    assert not imported & set(bench_startup.DEFERRED)
@@ -0,0 +1,98 @@
+import logging
+
+import pytest
+
+import db
+from db import tracing
+
+
+@pytest.fixture
+def conn(migrated_db):
+    conn = db.connect()
+    conn.cursor().executemany(
+        "INSERT INTO transactions (user_id, amount, transaction_type, transaction_date, description) VALUES (?, ?, ?, ?, ?)",
+        [(1, n, "expense", "2024-05-01", f"row {n}") for n in range(10)],
+    )
+    conn.commit()
+    conn.close()
+    tracing.stats.reset()
+    with db.get_pool().connection() as pooled:
+        yield pooled
+
+
+def test_cursors_are_only_traced_inside_a_request(conn):
+    assert not isinstance(conn.cursor(), tracing.TracingCursor)
+    token = tracing.start("dashboard")
+    try:
+        assert isinstance(conn.cursor(), tracing.TracingCursor)
+    finally:
+        tracing.finish(token)
+
+
+def test_statements_are_redacted_and_rows_counted(conn):
+    token = tracing.start("transactions")
+    cursor = conn.cursor()
+    cursor.execute("SELECT amount FROM transactions WHERE user_id = ? AND description <> 'secret'   LIMIT 50", 1)
+    assert len(cursor.fetchall()) == 10
+    cursor.execute("UPDATE transactions SET amount = ? WHERE amount < 3", 99)
+    cursor.execute("SELECT amount FROM transactions WHERE user_id = ?", 1)
+    assert cursor.fetchone() is not None
+    assert len(list(cursor)) == 9
+    statements = tracing.current().statements
+    summary = tracing.finish(token)
+
+    assert [statement.sql for statement in statements] == [
+        "SELECT amount FROM transactions WHERE user_id = ? AND description <> ? LIMIT ?",
+        "UPDATE transactions SET amount = ? WHERE amount < ?",
+        "SELECT amount FROM transactions WHERE user_id = ?",
+    ]
+    assert [statement.rows for statement in statements] == [10, 3, 10]
+    assert summary["route"] == "transactions"
+    assert summary["queries"] == 3
+    assert summary["n_plus_one"] == []
+
+
+def test_repeated_statements_are_reported_as_n_plus_one(conn, caplog):
+    token = tracing.start("budgets")
+    cursor = conn.cursor()
+    cursor.execute("SELECT COUNT(*) FROM transactions")
+    for n in range(tracing.N_PLUS_ONE_THRESHOLD):
+        cursor.execute("SELECT description FROM transactions WHERE amount = ?", n)
+        cursor.fetchone()
+    with caplog.at_level(logging.WARNING, logger="sql"):
+        summary = tracing.finish(token)
+
+    assert summary["n_plus_one"] == [
+        {"sql": "SELECT description FROM transactions WHERE amount = ?", "count": tracing.N_PLUS_ONE_THRESHOLD}
+    ]
+    assert "route=budgets" in caplog.text
+    (repeated,) = tracing.top_statements(1, order="count")
+    assert repeated["per_request"] == tracing.N_PLUS_ONE_THRESHOLD
+    assert repeated["n_plus_one_requests"] == 1
+
+
+def test_slow_statements_are_logged_without_parameters(conn, caplog, monkeypatch):
+    monkeypatch.setattr(tracing, "SLOW_QUERY_MS", 0)
+    token = tracing.start("analysis")
+    conn.cursor().execute("SELECT * FROM transactions WHERE description = ?", "private note")
+    with caplog.at_level(logging.WARNING, logger="sql.slow"):
+        tracing.finish(token)
+
+    assert "route=analysis SELECT * FROM transactions WHERE description = ?" in caplog.text
+    assert "private note" not in caplog.text
+
+
+def test_top_statements_aggregate_across_requests(conn):
+    for route in ("dashboard", "dashboard", "transactions"):
+        token = tracing.start(route)
+        cursor = conn.cursor()
+        cursor.execute("SELECT * FROM transactions WHERE user_id = ?", 1)
+        cursor.fetchall()
+        tracing.finish(token)
+
+    top = tracing.top_statements(10, order="count")
+    assert [(item["route"], item["count"], item["rows"]) for item in top] == [
+        ("dashboard", 2, 20), ("transactions", 1, 10),
+    ]
+    assert [item["route"] for item in tracing.top_statements(10, route="transactions")] == ["transactions"]
+    assert tracing.stats.requests == {"dashboard": 2, "transactions": 1}
@@ -0,0 +1,13 @@
+from db import versions
+
+
+def test_bump_is_per_user_and_table(db_cursor):
+    tables = (versions.TRANSACTIONS, versions.BILLS)
+    assert versions.get_versions(db_cursor, 1, tables) == {versions.TRANSACTIONS: 0, versions.BILLS: 0}
+
+    versions.bump(db_cursor, 1, versions.TRANSACTIONS, versions.ACCOUNTS)
+    versions.bump(db_cursor, 1, versions.TRANSACTIONS)
+    versions.bump_many(db_cursor, [1, 2, 2], versions.BILLS)
+
+    assert versions.get_versions(db_cursor, 1, tables) == {versions.TRANSACTIONS: 2, versions.BILLS: 1}
+    assert versions.get_versions(db_cursor, 2, tables) == {versions.TRANSACTIONS: 0, versions.BILLS: 1}
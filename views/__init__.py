@@ -0,0 +1,46 @@
+"""The web app's route blueprints, and which of them each kind of node mounts.
+
+Blueprints are named ``module:attribute`` and only imported when a role
+mounts them, so a reporting node never loads the write paths' modules.
+"""
+
+import importlib
+
+BLUEPRINTS = {
+    "auth": "views.auth:bp",
+    "transactions": "views.transactions:bp",
+    "export": "views.export:bp",
+    "reports": "views.reports:bp",
+    "budgets": "views.budgets:bp",
+    "savings": "views.savings:bp",
+    "recurring": "views.recurring:bp",
+    "bills": "views.bills:bp",
+    "notifications": "views.notifications:bp",
+    "dashboard": "views.dashboard:bp",
+    "accounts": "views.accounts:bp",
+    "debts": "views.debts:bp",
+    "analysis": "views.analysis:bp",
+    "api": "api:api",
+    "ops": "views.ops:bp",
+}
+
+# APP_ROLE -> the blueprints its app serves
+ROLES = {
+    "web": list(BLUEPRINTS),
+    # Pages that never write to the database, so DB_* can be a read replica;
+    # /login, PDF reports and every other write stay on the web nodes
+    "reporting": ["dashboard", "analysis", "export", "ops"],
+}
+
+
+def load(name):
+    module, attribute = BLUEPRINTS[name].split(":")
+    return getattr(importlib.import_module(module), attribute)
+
+
+def blueprints_for(role):
+    try:
+        names = ROLES[role]
+    except KeyError:
+        raise ValueError(f"Unsupported APP_ROLE: {role!r}") from None
+    return [load(name) for name in names]
@@ -0,0 +1,224 @@
+"""User profile, password/currency settings, account deletion and linked accounts."""
+
+from flask import Blueprint, redirect, render_template, request, session
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from db import ledger, search, versions
+from db.dialect import returning
+from helpers import login_required
+from views.shared import get_cursor, invalidate_user_cache, invalidate_user_lookups, month_store
+
+bp = Blueprint("accounts", __name__)
+
+
+##-------------User Profile Module-----------------------
+##------------------------------------------------------
+
+##---------User Profile route------------------------
+
+@bp.route('/profile', methods=['GET', 'POST'])
+def profile():
+    user_id = session.get('user_id')
+    if not user_id:
+        return redirect('/login')
+
+    with get_cursor() as cursor:
+        cursor.execute("SELECT full_name, email, currency, created_at FROM users WHERE user_id = ?", (user_id,))
+        user = cursor.fetchone()
+
+        cursor.execute("""
+            SELECT TOP 1 created_at FROM user_sessions 
+            WHERE user_id = ? ORDER BY created_at DESC
+        """, (user_id,))
+        last_login = cursor.fetchone()
+
+        cursor.execute("SELECT COUNT(*) FROM transactions WHERE user_id = ?", (user_id,))
+        transaction_count = cursor.fetchone()[0]
+
+        cursor.execute("SELECT COUNT(*) FROM budgets WHERE user_id = ?", (user_id,))
+        budget_count = cursor.fetchone()[0]
+
+        cursor.execute("SELECT COUNT(*) FROM savings_goals WHERE user_id = ?", (user_id,))
+        savings_count = cursor.fetchone()[0]
+
+        cursor.execute("SELECT COUNT(*) FROM user_accounts WHERE user_id = ?", (user_id,))
+        account_count = cursor.fetchone()[0]
+
+    return render_template('profile.html', user=user, last_login=last_login,
+                           transaction_count=transaction_count,
+                           budget_count=budget_count,
+                           savings_count=savings_count,
+                           account_count=account_count)
+
+##-----------------Change Password route--------------------
+@bp.route('/change_password', methods=['POST'])
+def change_password():
+    user_id = session.get('user_id')
+    if not user_id:
+        return redirect('/login')
+
+    current_pw = request.form['current_password']
+    new_pw = request.form['new_password']
+    confirm_pw = request.form['confirm_password']
+
+    if new_pw != confirm_pw:
+        return "Passwords do not match"
+
+    with get_cursor() as cursor:
+        cursor.execute("SELECT password_hash FROM users WHERE user_id = ?", (user_id,))
+        pw_hash = cursor.fetchone()[0]
+
+        if not check_password_hash(pw_hash, current_pw):
+            return "Incorrect current password"
+
+        new_hash = generate_password_hash(new_pw)
+        cursor.execute("UPDATE users SET password_hash = ? WHERE user_id = ?", (new_hash, user_id))
+
+    return redirect('/profile')
+
+##--------------------Delete account route---------------
+
+@bp.route('/delete_account', methods=['POST'])
+def delete_account():
+    user_id = session.get('user_id')
+    if user_id:
+        with get_cursor() as cursor:
+            cursor.execute("DELETE FROM notifications WHERE user_id = ?", (user_id,))
+            cursor.execute("DELETE FROM savings_history WHERE goal_id IN (SELECT goal_id FROM savings_goals WHERE user_id = ?)", (user_id,))
+            cursor.execute("DELETE FROM savings_goals WHERE user_id = ?", (user_id,))
+            cursor.execute("DELETE FROM recurring_transactions WHERE user_id = ?", (user_id,))
+            cursor.execute("DELETE FROM bill_reminders WHERE user_id = ?", (user_id,))
+            search.unindex_user(cursor, user_id)
+            cursor.execute("DELETE FROM transactions WHERE user_id = ?", (user_id,))
+            cursor.execute("DELETE FROM monthly_category_totals WHERE user_id = ?", (user_id,))
+            cursor.execute("DELETE FROM budgets WHERE user_id = ?", (user_id,))
+            cursor.execute("DELETE FROM account_balance_snapshots WHERE account_id IN (SELECT account_id FROM user_accounts WHERE user_id = ?)", (user_id,))
+            cursor.execute("DELETE FROM account_ledger WHERE user_id = ?", (user_id,))
+            cursor.execute("DELETE FROM user_accounts WHERE user_id = ?", (user_id,))
+            cursor.execute("DELETE FROM user_sessions WHERE user_id = ?", (user_id,))
+            cursor.execute("DELETE FROM user_table_versions WHERE user_id = ?", (user_id,))
+            # Finally delete the user
+            cursor.execute("DELETE FROM users WHERE user_id = ?", (user_id,))
+        invalidate_user_cache(user_id)
+        invalidate_user_lookups(user_id)
+        month_store.drop_user(user_id)
+        session.clear()
+    return redirect('/register')
+
+## ------------------linked accounts-----------------
+@bp.route('/accounts', methods=['GET', 'POST'])
+def accounts():
+    user_id = session.get('user_id')
+    if not user_id:
+        return redirect('/login')
+
+    with get_cursor() as cursor:
+        if request.method == 'POST':
+            name = request.form['account_name']
+            acc_type = request.form['account_type']
+            balance_raw = request.form.get('current_balance')
+            if not balance_raw:
+                return "Missing balance input", 400
+            balance = float(balance_raw)
+
+
+            output, returning_clause = returning("account_id")
+            cursor.execute(f"""
+                INSERT INTO user_accounts (user_id, account_name, account_type, current_balance)
+                {output}
+                VALUES (?, ?, ?, ?) {returning_clause}""", (user_id, name, acc_type, balance))
+            ledger.open_account(cursor, user_id, cursor.fetchone().account_id, balance)
+            versions.bump(cursor, user_id, versions.ACCOUNTS)
+            invalidate_user_cache(user_id)
+            invalidate_user_lookups(user_id)
+            return redirect('/accounts')
+
+        cursor.execute(f"""
+            SELECT a.account_id, a.account_name, a.account_type, b.balance AS current_balance
+            FROM user_accounts a
+            JOIN ({ledger.balances_sql()}) b ON b.account_id = a.account_id
+            ORDER BY a.account_id
+        """, (user_id,))
+        accounts = cursor.fetchall()
+
+    return render_template('accounts.html', accounts=accounts)
+
+##----edit linked accounts-------------------------
+@bp.route('/edit_account/<int:account_id>', methods=['GET', 'POST'])
+@login_required
+def edit_account(account_id):
+    user_id = session['user_id']
+    with get_cursor() as cursor:
+        if request.method == "POST":
+            name = request.form['account_name']
+            acc_type = request.form['account_type']
+            balance = float(request.form['current_balance'])
+            currency = request.form.get('currency', 'CAD')
+            is_active = int(request.form['is_active'])
+
+            cursor.execute("""
+                UPDATE user_accounts 
+                SET account_name = ?, account_type = ?, currency = ?, is_active = ?
+                WHERE account_id = ? AND user_id = ?
+            """, name, acc_type, currency, is_active, account_id, user_id)
+
+            # A new balance is posted as an adjustment for the difference
+            if cursor.rowcount:
+                ledger.post(cursor, user_id, account_id,
+                            round(balance - float(ledger.balance(cursor, account_id)), 2), ledger.ADJUSTMENT)
+
+            versions.bump(cursor, user_id, versions.ACCOUNTS)
+            invalidate_user_cache(user_id)
+            invalidate_user_lookups(user_id)
+            return redirect("/accounts")
+
+        cursor.execute(f"""
+            SELECT a.account_id, a.user_id, a.account_name, a.account_type, a.currency, a.is_active,
+                   b.balance AS current_balance
+            FROM user_accounts a
+            JOIN ({ledger.balances_sql("a.account_id = ?")}) b ON b.account_id = a.account_id
+            WHERE a.user_id = ?
+        """, account_id, user_id)
+        acc = cursor.fetchone()
+
+    return render_template("edit_account.html", acc=acc)
+
+##------delete linked account----------------
+
+@bp.route('/delete_linked_account/<int:account_id>')
+@login_required
+def delete_linked_account(account_id):
+    user_id = session['user_id']
+    with get_cursor() as cursor:
+        # Check if transactions exist
+        cursor.execute("""
+            SELECT COUNT(*) FROM transactions WHERE account_id = ? AND user_id = ?
+        """, account_id, user_id)
+        count = cursor.fetchone()[0]
+        if count > 0:
+            session["alert"] = "⚠️ Cannot delete account with linked transactions."
+            return redirect("/accounts")
+
+        cursor.execute("""
+            DELETE FROM user_accounts WHERE account_id = ? AND user_id = ?
+        """, account_id, user_id)
+        if cursor.rowcount:
+            cursor.execute("DELETE FROM account_balance_snapshots WHERE account_id = ?", account_id)
+            cursor.execute("DELETE FROM account_ledger WHERE account_id = ?", account_id)
+        versions.bump(cursor, user_id, versions.ACCOUNTS)
+
+    invalidate_user_cache(user_id)
+    invalidate_user_lookups(user_id)
+    return redirect("/accounts")
+
+
+@bp.route("/update_currency", methods=["POST"])
+@login_required
+def update_currency():
+    user_id = session["user_id"]
+    new_currency = request.form.get("currency")
+
+    with get_cursor() as cursor:
+        cursor.execute("UPDATE users SET currency = ? WHERE user_id = ?", new_currency, user_id)
+
+    return redirect("/profile")
@@ -0,0 +1,103 @@
+"""/analysis: charts from the columnar month store plus the latest transactions."""
+
+from datetime import date, datetime
+
+from flask import Blueprint, redirect, render_template, session
+
+import analytics
+import columnar
+from db import versions
+from db.dialect import limit, month_bounds, top
+from db.queries import NEWEST_FIRST
+from helpers import login_required
+from views.shared import analytics_cache, get_cursor, get_user_categories, month_store
+
+bp = Blueprint("analysis", __name__)
+
+
+ANALYSIS_RECENT_ROWS = 20
+
+def load_analytics(cursor, user_id):
+    # Reuse the cached figures while the user's transactions are unchanged
+    tag = (versions.get_versions(cursor, user_id, (versions.TRANSACTIONS,))[versions.TRANSACTIONS], date.today())
+    cached = analytics_cache.get(user_id)
+    if cached is not None and cached[0] == tag:
+        return cached[1]
+    months = month_store.months(cursor, user_id)
+    figures = analytics.summarize(columnar.as_columns(columnar.concat(month for _, month in months)))
+    analytics_cache.set(user_id, (tag, figures))
+    return figures
+
+def analysis_recent_sql():
+    # Latest transactions for the table under the charts
+    return f"""
+        SELECT {top(ANALYSIS_RECENT_ROWS)}t.amount, t.transaction_type, t.transaction_date, t.description, t.category_id
+        FROM transactions t
+        WHERE t.user_id = ?
+        {NEWEST_FIRST} {limit(ANALYSIS_RECENT_ROWS)}
+    """
+
+# Total budget and expenses for the current month
+MONTH_BUDGET_SQL = """
+    SELECT
+        SUM(b.budget_amount) AS total_budget,
+        SUM(COALESCE(m.total_amount, 0)) AS total_expenses
+    FROM budgets b
+    LEFT JOIN monthly_category_totals m
+        ON m.user_id = b.user_id AND m.category_id = b.category_id
+        AND m.month = b.budget_month AND m.transaction_type = 'expense'
+    WHERE b.user_id = ? AND b.budget_month = ?
+"""
+
+@bp.route("/analysis")
+@login_required
+def analysis():
+    user_id = session["user_id"]
+    alert = session.pop("alert", None)
+    month_start, _ = month_bounds(datetime.now())
+
+    with get_cursor() as cursor:
+        figures = load_analytics(cursor, user_id)
+        cursor.execute(analysis_recent_sql(), user_id)
+        transactions = cursor.fetchall()
+        cursor.execute(MONTH_BUDGET_SQL, user_id, month_start)
+        budget = cursor.fetchone()
+
+    return render_analysis(figures, transactions, budget, get_user_categories(user_id), alert)
+
+def render_analysis(figures, transactions, budget, categories, alert):
+    total_budget = budget.total_budget or 0
+    total_expenses = budget.total_expenses or 0
+    total_income = figures["total_income"]
+    budget_used_percentage = round((total_expenses / total_budget) * 100, 1) if total_budget > 0 else 0
+    remaining_budget = total_budget - total_expenses if total_budget > 0 else 0
+
+    # Expense breakdown by category (uncategorised rows have no name to show)
+    names = {c.category_id: c.category_name for c in categories}
+    category_data = [(names[category_id], total) for category_id, total in figures["category_expenses"]
+                     if category_id in names]
+
+    if not category_data:
+        session["alert"] = "No category-wise expense data available."
+        return redirect("/transactions")
+
+    chart_labels = [name for name, _ in category_data]
+    chart_values = [total for _, total in category_data]
+
+    return render_template(
+        "analysis.html",
+        transactions=transactions,
+        total_expenses=total_expenses,
+        total_income=total_income,
+        remaining_budget=remaining_budget,
+        budget_used_percentage=budget_used_percentage,
+        chart_labels=chart_labels,
+        chart_values=chart_values,
+        monthly_labels=figures["months"],
+        monthly_income=figures["income"],
+        monthly_expenses=figures["expenses"],
+        rolling_expenses=figures["rolling_expenses"],
+        expense_delta=figures["expense_delta"],
+        expense_delta_pct=figures["expense_delta_pct"],
+        alert=alert
+    )
@@ -0,0 +1,103 @@
+"""Welcome page, registration, login/logout and password reset."""
+
+from flask import Blueprint, redirect, render_template, request, session
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from views.shared import get_cursor
+
+bp = Blueprint("auth", __name__)
+
+
+@bp.route("/")
+def home():
+    return render_template("welcome.html")
+
+
+@bp.route("/register", methods=["GET", "POST"])
+def register():
+    if request.method == "POST":
+        name = request.form.get("name")
+        email = request.form.get("email")
+        password = request.form.get("password")
+
+        if not name or not email or not password:
+            return render_template("welcome.html", alert="All fields are required.")
+
+        hashed_pw = generate_password_hash(password)
+
+        with get_cursor() as cursor:
+            cursor.execute("SELECT * FROM users WHERE email = ?", email)
+            if cursor.fetchone():
+                return render_template("welcome.html", alert="Email already exists.")
+
+            recovery_hint = request.form.get("recovery_hint")
+
+            if not name or not email or not password or not recovery_hint:
+                return render_template("welcome.html", alert="All fields are required.")
+            
+            cursor.execute(
+                "INSERT INTO users (full_name, email, password_hash, recovery_hint) VALUES (?, ?, ?, ?)",
+                name, email, hashed_pw, recovery_hint
+            )
+
+            cursor.execute("SELECT user_id FROM users WHERE email = ?", email)
+            user_id = cursor.fetchone().user_id
+
+            cursor.execute("""
+                INSERT INTO user_accounts (user_id, account_name, account_type, current_balance)
+                VALUES (?, 'Default Account', 'General', 0)
+            """, user_id)
+
+        session["alert"] = "🎉 Registration successful! Please log in."
+        return redirect("/login")
+    return render_template("welcome.html")
+
+@bp.route("/login", methods=["GET", "POST"])
+def login():
+    alert = session.pop("alert", None)
+    if request.method == "POST":
+        session.clear()
+        email = request.form.get("email")
+        password = request.form.get("password")
+
+        with get_cursor() as cursor:
+            cursor.execute("SELECT user_id, password_hash FROM users WHERE email = ?", email)
+            row = cursor.fetchone()
+
+            if not row or not check_password_hash(row.password_hash, password):
+                return render_template("welcome.html", alert="Invalid email or password.")
+
+            session["user_id"] = row.user_id
+        return redirect("/transactions")
+
+    return render_template("welcome.html", alert=alert)
+
+@bp.route("/logout")
+def logout():
+    session.clear()
+    return redirect("/")
+
+
+@bp.route("/forgot_password", methods=["POST"])
+def forgot_password():
+    email = request.form.get("email")
+    hint = request.form.get("hint")
+    new_pw = request.form.get("new_password")
+
+    if not email or not hint or not new_pw:
+        return render_template("welcome.html", alert="All fields are required.")
+
+    hashed_pw = generate_password_hash(new_pw)
+
+    with get_cursor() as cursor:
+        cursor.execute("SELECT recovery_hint FROM users WHERE email = ?", email)
+        row = cursor.fetchone()
+
+        if not row:
+            return render_template("welcome.html", alert="User not found.")
+        if row.recovery_hint.strip().lower() != hint.strip().lower():
+            return render_template("welcome.html", alert="Incorrect recovery hint.")
+
+        cursor.execute("UPDATE users SET password_hash = ? WHERE email = ?", hashed_pw, email)
+
+    return render_template("welcome.html", alert="Password reset successful. Please log in.")
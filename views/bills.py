@@ -0,0 +1,114 @@
+"""Bill reminders."""
+
+from datetime import datetime
+
+from flask import Blueprint, current_app, redirect, render_template, request, session
+
+from db import reminders, versions
+from helpers import login_required
+from views.shared import get_cursor, invalidate_user_cache
+
+bp = Blueprint("bills", __name__)
+
+
+## -----------Bill remainder module---------------
+##--------------------------------------------------
+
+## ----View and add remainders------------
+@bp.route("/bills", methods=["GET", "POST"])
+@login_required
+def bills():
+    user_id = session["user_id"]
+    notify_upcoming_bills(user_id)
+    with get_cursor() as cursor:
+
+        if request.method == "POST":
+            bill_name = request.form.get("bill_name")
+            amount = float(request.form.get("amount"))
+            due_date = request.form.get("due_date")
+            if due_date:
+                due_date = datetime.strptime(due_date, "%Y-%m-%d").strftime("%Y-%m-%d")
+
+            cursor.execute("""
+                INSERT INTO bill_reminders (user_id, bill_name, amount, due_date)
+                VALUES (?, ?, ?, ?)
+            """, user_id, bill_name, amount, due_date)
+            versions.bump(cursor, user_id, versions.BILLS)
+            invalidate_user_cache(user_id)
+
+        cursor.execute("""
+            SELECT * FROM bill_reminders
+            WHERE user_id = ?
+            ORDER BY due_date ASC
+        """, user_id)
+        bills = cursor.fetchall()
+
+    return render_template("bills.html", bills=bills)
+
+## -----------mark bills as paid-----------------
+@bp.route("/mark_bill_paid/<int:bill_id>")
+@login_required
+def mark_bill_paid(bill_id):
+    user_id = session["user_id"]
+    with get_cursor() as cursor:
+        cursor.execute("""
+            UPDATE bill_reminders SET status = 'paid'
+            WHERE bill_id = ? AND user_id = ?
+        """, bill_id, user_id)
+        versions.bump(cursor, user_id, versions.BILLS)
+    invalidate_user_cache(user_id)
+    return redirect("/bills")
+
+## ---------- Edit bill remainder------------
+@bp.route("/edit_bill/<int:bill_id>", methods=["GET", "POST"])
+@login_required
+def edit_bill(bill_id):
+    user_id = session["user_id"]
+    with get_cursor() as cursor:
+
+        if request.method == "POST":
+            bill_name = request.form.get("bill_name")
+            amount = float(request.form.get("amount"))
+            due_date = request.form.get("due_date")
+            status = request.form.get("status")
+
+            cursor.execute("""
+                UPDATE bill_reminders
+                SET bill_name = ?, amount = ?, due_date = ?, status = ?
+                WHERE bill_id = ? AND user_id = ?
+            """, bill_name, amount, due_date, status, bill_id, user_id)
+            versions.bump(cursor, user_id, versions.BILLS)
+            invalidate_user_cache(user_id)
+            return redirect("/bills")
+
+        # Fetch bill details
+        cursor.execute("""
+            SELECT * FROM bill_reminders
+            WHERE bill_id = ? AND user_id = ?
+        """, bill_id, user_id)
+        bill = cursor.fetchone()
+        
+    return render_template("edit_bill.html", bill=bill)
+
+## ------------ delete bill remainder------------
+@bp.route("/delete_bill/<int:bill_id>")
+@login_required
+def delete_bill(bill_id):
+    user_id = session["user_id"]
+    with get_cursor() as cursor:
+        cursor.execute("""
+            DELETE FROM bill_reminders
+            WHERE bill_id = ? AND user_id = ?
+        """, bill_id, user_id)
+        versions.bump(cursor, user_id, versions.BILLS)
+    invalidate_user_cache(user_id)
+    return redirect("/bills")
+
+##-----------helper for notification-----------
+def notify_upcoming_bills(user_id):
+    # Only needed when scheduler.py is not running the reminders for everyone
+    if current_app.config["SCHEDULER_ENABLED"]:
+        return
+    with get_cursor() as cursor:
+        if reminders.notify_upcoming_bills(cursor, user_id=user_id):
+            invalidate_user_cache(user_id)
@@ -0,0 +1,187 @@
+"""Monthly budgets, budget trends and moving leftover budget to savings."""
+
+from datetime import datetime
+
+from flask import Blueprint, redirect, render_template, request, session
+
+from db import versions
+from db.dialect import month_label
+from helpers import login_required
+from views.shared import get_cursor, get_user_categories, invalidate_user_cache
+
+bp = Blueprint("budgets", __name__)
+
+
+##--------------Budget Module--------------
+
+##--------------Budget route----------------
+BUDGETS_SQL = """
+    SELECT b.budget_id, b.budget_month, b.budget_amount, b.alert_threshold, c.category_name,
+           m.total_amount AS total_spent
+    FROM budgets b
+    JOIN categories c ON b.category_id = c.category_id
+    LEFT JOIN monthly_category_totals m
+        ON m.user_id = b.user_id AND m.category_id = b.category_id
+        AND m.month = b.budget_month AND m.transaction_type = 'expense'
+    WHERE b.user_id = ?
+    ORDER BY b.budget_month DESC
+"""
+
+def budget_months_sql():
+    # Budget months for the move-to-savings dropdown
+    return f"""
+        SELECT DISTINCT {month_label("budget_month")} AS month
+        FROM budgets
+        WHERE user_id = ?
+        ORDER BY month DESC
+    """
+
+@bp.route("/budgets", methods=["GET", "POST"])
+@login_required
+def budgets():
+    user_id = session["user_id"]
+    with get_cursor() as cursor:
+
+        if request.method == "POST":
+            category_id = int(request.form.get("category_id"))
+            budget_amount = float(request.form.get("budget_amount"))
+            budget_month = request.form.get("budget_month")
+            threshold = int(request.form.get("alert_threshold") or 90)
+
+            # Format date to first of month
+            month_start = datetime.strptime(budget_month, "%Y-%m").replace(day=1).strftime('%Y-%m-%d')
+
+            # Check if budget exists
+            cursor.execute("""
+                SELECT budget_id FROM budgets
+                WHERE user_id = ? AND category_id = ? AND budget_month = ?
+            """, user_id, category_id, month_start)
+            existing = cursor.fetchone()
+
+            if existing:
+                cursor.execute("""
+                    UPDATE budgets SET budget_amount = ?, alert_threshold = ?
+                    WHERE budget_id = ?
+                """, budget_amount, threshold, existing.budget_id)
+            else:
+                cursor.execute("""
+                    INSERT INTO budgets (user_id, category_id, budget_amount, budget_month, alert_threshold)
+                    VALUES (?, ?, ?, ?, ?)
+                """, user_id, category_id, budget_amount, month_start, threshold)
+            versions.bump(cursor, user_id, versions.BUDGETS)
+
+    
+      # Get user's budgets
+        cursor.execute(BUDGETS_SQL, user_id)
+        budgets = cursor.fetchall()
+
+        cursor.execute(budget_months_sql(), user_id)
+        available_months = [row.month for row in cursor.fetchall()]
+
+    categories = get_user_categories(user_id, category_type="expense")
+
+    return render_template("budgets.html", budgets=budgets, categories=categories, available_months=available_months)
+
+##-----------Editing the Budget-----------------------
+@bp.route("/edit_budget/<int:budget_id>", methods=["GET", "POST"])
+@login_required
+def edit_budget(budget_id):
+    user_id = session["user_id"]
+    with get_cursor() as cursor:
+
+        if request.method == "POST":
+            budget_amount = float(request.form.get("budget_amount"))
+            threshold = int(request.form.get("alert_threshold"))
+
+            cursor.execute("""
+                UPDATE budgets SET budget_amount = ?, alert_threshold = ?
+                WHERE budget_id = ? AND user_id = ?
+            """, budget_amount, threshold, budget_id, user_id)
+            versions.bump(cursor, user_id, versions.BUDGETS)
+
+        
+            return redirect("/budgets")
+
+        cursor.execute("""
+            SELECT b.*, c.category_name FROM budgets b
+            JOIN categories c ON b.category_id = c.category_id
+            WHERE b.budget_id = ? AND b.user_id = ?
+        """, budget_id, user_id)
+        budget = cursor.fetchone()
+
+    return render_template("edit_budget.html", budget=budget)
+
+##-----------Deleting the budget------------
+
+@bp.route("/delete_budget/<int:budget_id>")
+@login_required
+def delete_budget(budget_id):
+    user_id = session["user_id"]
+    with get_cursor() as cursor:
+        cursor.execute("DELETE FROM budgets WHERE budget_id = ? AND user_id = ?", budget_id, user_id)
+        versions.bump(cursor, user_id, versions.BUDGETS)
+    return redirect("/budgets")
+
+## -------- Adding Budget Trend route------------
+@bp.route("/budget_trends")
+@login_required
+def budget_trends():
+    user_id = session["user_id"]
+    with get_cursor() as cursor:
+
+        query = f"""
+        SELECT {month_label("b.budget_month")} AS month, c.category_name,
+               b.budget_amount, m.total_amount AS total_spent
+        FROM budgets b
+        JOIN categories c ON b.category_id = c.category_id
+        LEFT JOIN monthly_category_totals m
+            ON m.user_id = b.user_id AND m.category_id = b.category_id
+            AND m.month = b.budget_month AND m.transaction_type = 'expense'
+        WHERE b.user_id = ?
+        ORDER BY b.budget_month DESC, c.category_name
+        """
+        cursor.execute(query, user_id)
+        trends = cursor.fetchall()
+    return render_template("budget_trends.html", trends=trends)
+
+## ------- Move remaining budget to savings------------
+
+@bp.route("/move_to_savings")
+@login_required
+def move_to_savings():
+    user_id = session["user_id"]
+    month = request.args.get("month")
+    if not month:
+        session["alert"] = "No month selected."
+        return redirect("/budgets")
+
+    with get_cursor() as cursor:
+        budget_month = f"{month}-01"
+
+        cursor.execute("""
+            SELECT b.category_id, b.budget_amount, m.total_amount AS total_spent
+            FROM budgets b
+            LEFT JOIN monthly_category_totals m
+                ON m.user_id = b.user_id AND m.category_id = b.category_id
+                AND m.month = b.budget_month AND m.transaction_type = 'expense'
+            WHERE b.user_id = ? AND b.budget_month = ?
+        """, user_id, budget_month)
+        rows = cursor.fetchall()
+
+        total_moved = 0
+
+        for row in rows:
+            spent = row.total_spent or 0
+            remaining = row.budget_amount - spent
+            if remaining > 0:
+                total_moved += remaining
+                cursor.execute("""
+                    UPDATE savings_goals
+                    SET current_amount = current_amount + ?
+                    WHERE user_id = ? AND target_date >= ?
+                """, remaining, user_id, datetime.today().date())
+        versions.bump(cursor, user_id, versions.SAVINGS)
+
+    session["alert"] = f"${total_moved:.2f} moved to savings for {month}."
+    invalidate_user_cache(user_id)
+    return redirect("/budgets")
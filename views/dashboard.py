@@ -0,0 +1,126 @@
+"""Dashboard: this month's totals, upcoming bills and unread notifications."""
+
+from datetime import datetime
+
+from flask import Blueprint, render_template, session
+
+from db import ledger, versions
+from db.batch import fetch_batch
+from db.dialect import limit, month_bounds, top
+from helpers import login_required
+from views.shared import dashboard_cache, get_cursor
+
+bp = Blueprint("dashboard", __name__)
+
+
+## ------------ Dashboard Module----------------   ----------------------
+##-------------------------------------------------------------------
+
+def dashboard_queries(user_id, month_start):
+    return [
+        # Total account balance (latest snapshots + ledger deltas) and
+        # overall savings goal progress (avg % complete)
+        (f"""
+            SELECT
+                (SELECT SUM(b.balance) FROM ({ledger.balances_sql()}) b) AS total_balance,
+                (SELECT AVG(CAST(current_amount AS FLOAT) / NULLIF(target_amount, 0)) * 100
+                 FROM savings_goals WHERE user_id = ?) AS avg_progress
+        """, [user_id, user_id]),
+        # Total income and expenses this month
+        ("""
+            SELECT transaction_type, SUM(total_amount) AS total
+            FROM monthly_category_totals
+            WHERE user_id = ? AND month = ?
+            GROUP BY transaction_type
+        """, [user_id, month_start]),
+        # Expense by category for pie chart (this month)
+        ("""
+            SELECT c.category_name, SUM(m.total_amount) AS total
+            FROM monthly_category_totals m
+            JOIN categories c ON m.category_id = c.category_id
+            WHERE m.user_id = ? AND m.transaction_type = 'expense' AND m.month = ?
+            GROUP BY c.category_name
+        """, [user_id, month_start]),
+        # Upcoming unpaid bills (top 5)
+        (f"""
+            SELECT {top(5)}* FROM bill_reminders
+            WHERE user_id = ? AND status = 'pending'
+            ORDER BY due_date ASC {limit(5)}
+        """, [user_id]),
+        # Next due recurring transactions (top 3) - Nulls First
+        (f"""
+            SELECT {top(3)}r.*, c.category_name FROM recurring_transactions r
+            JOIN categories c ON r.category_id = c.category_id
+            WHERE r.user_id = ? AND r.is_active = 1
+            ORDER BY
+            CASE WHEN r.last_generated_date IS NULL THEN 0 ELSE 1 END,
+            r.start_date ASC {limit(3)}
+        """, [user_id]),
+        # Unread notifications (top 3)
+        (f"""
+            SELECT {top(3)}* FROM notifications
+            WHERE user_id = ? AND is_read = 0
+            ORDER BY created_at DESC {limit(3)}
+        """, [user_id]),
+    ]
+
+def dashboard_snapshot(month_start, results):
+    # results: one list of dict rows per dashboard_queries() statement
+    summary, totals, category_spending, upcoming_bills, recurring, notifications = results
+    totals = {row["transaction_type"]: row["total"] for row in totals}
+    return {
+        "month_start": month_start,
+        "total_balance": summary[0]["total_balance"] or 0,
+        "total_income": totals.get("income") or 0,
+        "total_expenses": totals.get("expense") or 0,
+        "savings_progress": summary[0]["avg_progress"] or 0,
+        "chart_labels": [row["category_name"] for row in category_spending],
+        "chart_values": [float(row["total"]) for row in category_spending],
+        "upcoming_bills": upcoming_bills,
+        "recurring": recurring,
+        "notifications": notifications,
+    }
+
+def load_dashboard_snapshot(user_id, month_start):
+    # All dashboard lookups go to the DB as one batch (one round trip on mssql)
+    with get_cursor() as cursor:
+        return dashboard_snapshot(month_start, fetch_batch(cursor, dashboard_queries(user_id, month_start)))
+
+# Tables the snapshot reads; a write to any of them, from any process, bumps its tag
+DASHBOARD_TABLES = (versions.TRANSACTIONS, versions.ACCOUNTS, versions.SAVINGS,
+                    versions.BILLS, versions.RECURRING, versions.NOTIFICATIONS)
+
+def cached_dashboard_snapshot(user_id, month_start):
+    # (tag, snapshot); snapshot is None unless the cached one has the current tag
+    with get_cursor() as cursor:
+        found = versions.get_versions(cursor, user_id, DASHBOARD_TABLES)
+    tag = (month_start, *(found[table] for table in DASHBOARD_TABLES))
+    cached = dashboard_cache.get(user_id)
+    if cached is not None and cached[0] == tag:
+        return tag, cached[1]
+    return tag, None
+
+@bp.route("/dashboard")
+@login_required
+def dashboard():
+    user_id = session["user_id"]
+    month_start, _ = month_bounds(datetime.today())
+
+    tag, snapshot = cached_dashboard_snapshot(user_id, month_start)
+    if snapshot is None:
+        snapshot = load_dashboard_snapshot(user_id, month_start)
+        dashboard_cache.set(user_id, (tag, snapshot))
+    return render_dashboard(snapshot)
+
+def render_dashboard(snapshot):
+    return render_template("dashboard.html",
+        total_balance=snapshot["total_balance"],
+        total_income=snapshot["total_income"],
+        total_expenses=snapshot["total_expenses"],
+        savings_progress=snapshot["savings_progress"],
+        chart_labels=snapshot["chart_labels"],
+        chart_values=snapshot["chart_values"],
+        upcoming_bills=snapshot["upcoming_bills"],
+        recurring=snapshot["recurring"],
+        notifications=snapshot["notifications"]
+    )
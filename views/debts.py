@@ -0,0 +1,72 @@
+"""Debt tracking."""
+
+from flask import Blueprint, redirect, render_template, request, session
+
+from db import versions
+from helpers import login_required
+from views.shared import get_cursor
+
+bp = Blueprint("debts", __name__)
+
+
+## ---------------- Debt Management Module ----------------
+
+@bp.route("/debts", methods=["GET", "POST"])
+@login_required
+def debts():
+    user_id = session["user_id"]
+    with get_cursor() as cursor:
+        if request.method == "POST":
+            lender = request.form.get("lender_name")
+            amount = float(request.form.get("total_amount"))
+            paid = float(request.form.get("paid_amount") or 0)
+            interest = request.form.get("interest_rate") or None
+            due_date = request.form.get("due_date")
+
+            cursor.execute("""
+                INSERT INTO debts (user_id, lender_name, total_amount, paid_amount, interest_rate, due_date)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, user_id, lender, amount, paid, interest, due_date)
+            versions.bump(cursor, user_id, versions.DEBTS)
+
+        cursor.execute("""
+            SELECT * FROM debts WHERE user_id = ? ORDER BY due_date
+        """, user_id)
+        debts = cursor.fetchall()
+
+    return render_template("debts.html", debts=debts)
+
+
+@bp.route("/edit_debt/<int:debt_id>", methods=["GET", "POST"])
+@login_required
+def edit_debt(debt_id):
+    user_id = session["user_id"]
+    with get_cursor() as cursor:
+        if request.method == "POST":
+            lender = request.form.get("lender_name")
+            total = float(request.form.get("total_amount"))
+            paid = float(request.form.get("paid_amount"))
+            interest = request.form.get("interest_rate") or None
+            due = request.form.get("due_date")
+
+            cursor.execute("""
+                UPDATE debts
+                SET lender_name = ?, total_amount = ?, paid_amount = ?, interest_rate = ?, due_date = ?
+                WHERE debt_id = ? AND user_id = ?
+            """, lender, total, paid, interest, due, debt_id, user_id)
+            versions.bump(cursor, user_id, versions.DEBTS)
+            return redirect("/debts")
+
+        cursor.execute("SELECT * FROM debts WHERE debt_id = ? AND user_id = ?", debt_id, user_id)
+        debt = cursor.fetchone()
+    return render_template("edit_debt.html", debt=debt)
+
+
+@bp.route("/delete_debt/<int:debt_id>")
+@login_required
+def delete_debt(debt_id):
+    user_id = session["user_id"]
+    with get_cursor() as cursor:
+        cursor.execute("DELETE FROM debts WHERE debt_id = ? AND user_id = ?", debt_id, user_id)
+        versions.bump(cursor, user_id, versions.DEBTS)
+    return redirect("/debts")
@@ -0,0 +1,55 @@
+"""Transaction exports: streamed CSV (from the month store when the filters
+allow); PDF requests are passed on to the reports blueprint (views/reports.py).
+"""
+
+from flask import Blueprint, Response, abort, redirect, request, session, stream_with_context
+
+import columnar
+from db.queries import EXPORT_COLUMNS, NEWEST_FIRST
+from exports import EXPORT_BATCH_SIZE, csv_chunks, gzip_chunks, iter_csv
+from helpers import login_required
+from views.shared import get_cursor, get_user_categories, month_store, request_filters
+
+bp = Blueprint("export", __name__)
+
+
+@bp.route("/export_transactions", methods=["POST"])
+@login_required
+def export_transactions():
+    user_id = session["user_id"]
+    format = request.form.get("format")
+    if format == "pdf":
+        # Queueing a report writes to the database, which only web nodes do;
+        # 307 repeats the POST with its form there
+        return redirect("/reports", code=307)
+    where, params = request_filters(user_id, request.form)
+    query = EXPORT_COLUMNS + where + NEWEST_FIRST
+
+    if format == "csv":
+        compress = request.form.get("gzip") in ("1", "on", "true")
+        header = ["Date", "Type", "Category", "Amount", "Description"]
+        # Filters the month store can apply are served from it; keyword
+        # searches and page cursors still go to SQL
+        from_store = columnar.export_supported(request.form)
+        category_names = {c.category_id: c.category_name for c in get_user_categories(user_id)}
+        filters = request.form.to_dict()
+
+        def generate():
+            with get_cursor() as cursor:
+                if from_store:
+                    months = month_store.months(cursor, user_id)
+                    chunks = csv_chunks(
+                        columnar.iter_export_rows(months, category_names, filters, EXPORT_BATCH_SIZE), header)
+                else:
+                    cursor.execute(query, *params)
+                    chunks = iter_csv(cursor, header)
+                yield from gzip_chunks(chunks) if compress else chunks
+
+        filename = "transactions.csv.gz" if compress else "transactions.csv"
+        return Response(
+            stream_with_context(generate()),
+            mimetype="application/gzip" if compress else "text/csv",
+            headers={"Content-Disposition": f"attachment; filename={filename}"},
+        )
+
+    abort(400, "Unknown export format.")
@@ -0,0 +1,67 @@
+"""Notification center."""
+
+from flask import Blueprint, redirect, render_template, request, session
+
+from db import versions
+from helpers import login_required
+from views.shared import get_cursor, invalidate_user_cache
+
+bp = Blueprint("notifications", __name__)
+
+
+##-------- Notification Center Module--------------
+##--------------------------------------------------
+
+## ------Notifications--------------------------
+def notifications_query(user_id, notif_type=None):
+    if notif_type:
+        return """
+            SELECT * FROM notifications
+            WHERE user_id = ? AND notification_type = ?
+            ORDER BY created_at DESC
+        """, user_id, notif_type
+    return """
+        SELECT * FROM notifications
+        WHERE user_id = ?
+        ORDER BY created_at DESC
+    """, user_id
+
+@bp.route("/notifications")
+@login_required
+def notifications():
+    user_id = session["user_id"]
+    notif_type = request.args.get("type")  # Optional filter
+
+    with get_cursor() as cursor:
+        cursor.execute(*notifications_query(user_id, notif_type))
+        notifications = cursor.fetchall()
+    return render_template("notifications.html", notifications=notifications, selected_type=notif_type)
+
+## ------------------Mark notification as read---------------
+@bp.route("/mark_notification_read/<int:notification_id>")
+@login_required
+def mark_notification_read(notification_id):
+    user_id = session["user_id"]
+    with get_cursor() as cursor:
+        cursor.execute("""
+            UPDATE notifications
+            SET is_read = 1
+            WHERE notification_id = ? AND user_id = ?
+        """, notification_id, user_id)
+        versions.bump(cursor, user_id, versions.NOTIFICATIONS)
+    invalidate_user_cache(user_id)
+    return redirect("/notifications")
+
+##-------Delete notification----------------
+@bp.route("/delete_notification/<int:notification_id>")
+@login_required
+def delete_notification(notification_id):
+    user_id = session["user_id"]
+    with get_cursor() as cursor:
+        cursor.execute("""
+            DELETE FROM notifications
+            WHERE notification_id = ? AND user_id = ?
+        """, notification_id, user_id)
+        versions.bump(cursor, user_id, versions.NOTIFICATIONS)
+    invalidate_user_cache(user_id)
+    return redirect("/notifications")
@@ -0,0 +1,41 @@
+"""Operational endpoints: /metrics and the SQL trace summary at /debug/sql."""
+
+import os
+
+from flask import Blueprint, abort, jsonify, request
+
+import db
+from db import tracing
+from views.shared import analytics_cache, dashboard_cache, global_categories_cache, lookup_cache
+
+bp = Blueprint("ops", __name__)
+
+
+## -------------Metrics--------------------
+@bp.route("/metrics")
+def metrics():
+    return jsonify(
+        db_pool=db.get_pool().stats(),
+        caches={
+            "dashboard": dashboard_cache.stats(),
+            "global_categories": global_categories_cache.stats(),
+            "lookups": lookup_cache.stats(),
+            "analytics": analytics_cache.stats(),
+        },
+    )
+
+# Heaviest statements since startup; SQL_DEBUG_ENDPOINT=1 enables it (internal use only).
+@bp.route("/debug/sql")
+def debug_sql():
+    if os.getenv("SQL_DEBUG_ENDPOINT", "0").lower() not in ("1", "true", "yes"):
+        abort(404)
+    order = request.args.get("order", "total_ms")
+    if order not in ("total_ms", "mean_ms", "max_ms", "count", "per_request"):
+        abort(400, "Unknown order.")
+    limit_n = min(max(request.args.get("limit", 20, type=int), 1), 200)
+    return jsonify(
+        order=order,
+        slow_query_ms=tracing.SLOW_QUERY_MS,
+        requests=dict(tracing.stats.requests),
+        statements=tracing.top_statements(limit_n, order, request.args.get("route")),
+    )
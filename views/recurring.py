@@ -0,0 +1,110 @@
+"""Recurring transaction rules and generating their due transactions."""
+
+from flask import Blueprint, redirect, render_template, request, session
+
+from db import recurrence, versions
+from helpers import login_required
+from views.shared import get_cursor, get_user_categories_and_accounts, invalidate_user_cache
+
+bp = Blueprint("recurring", __name__)
+
+
+##---------------Recurring transactions Module-------------
+##--------------------------------------------------------
+
+## Add recurring transaction route-------------------
+
+@bp.route("/recurring", methods=["GET", "POST"])
+@login_required
+def recurring():
+    user_id = session["user_id"]
+    with get_cursor() as cursor:
+
+        if request.method == "POST":
+            category_id = int(request.form.get("category_id"))
+            transaction_type = request.form.get("transaction_type")
+            amount = float(request.form.get("amount"))
+            frequency = request.form.get("frequency")
+            start_date = request.form.get("start_date")
+            end_date = request.form.get("end_date") or None
+            description = request.form.get("description")
+            account_id = request.form.get("account_id") or None
+
+            cursor.execute("""
+                INSERT INTO recurring_transactions 
+                (user_id, category_id, account_id, amount, transaction_type, frequency,
+                 start_date, end_date, description, last_generated_date, is_active)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, NULL, 1)
+            """, user_id, category_id, account_id, amount, transaction_type,
+                 frequency, start_date, end_date, description)
+            versions.bump(cursor, user_id, versions.RECURRING)
+            invalidate_user_cache(user_id)
+
+        # View all recurring transactions
+        cursor.execute("""
+            SELECT rt.recurring_id, rt.amount, rt.transaction_type, rt.frequency,
+                   rt.start_date, rt.end_date, rt.last_generated_date, rt.is_active,
+                   c.category_name, a.account_name
+            FROM recurring_transactions rt
+            JOIN categories c ON rt.category_id = c.category_id
+            LEFT JOIN user_accounts a ON rt.account_id = a.account_id
+            WHERE rt.user_id = ?
+            ORDER BY rt.start_date DESC
+        """, user_id)
+        recurs = cursor.fetchall()
+
+    categories, accounts = get_user_categories_and_accounts(user_id)
+    return render_template("recurring.html", recurs=recurs, categories=categories, accounts=accounts)
+
+##----------Auto Generate recurring transactions route--------
+@bp.route("/generate_recurring")
+@login_required
+def generate_recurring():
+    user_id = session["user_id"]
+    with get_cursor() as cursor:
+        # Catches up every missed period since each rule last ran
+        generated = recurrence.generate_due(cursor, user_id=user_id)
+
+    session["alert"] = f"{generated} transaction(s) generated."
+    invalidate_user_cache(user_id)
+    return redirect("/transactions")
+
+##------Edit recurring transactions-----------
+
+@bp.route("/edit_recurring/<int:recurring_id>", methods=["GET", "POST"])
+@login_required
+def edit_recurring(recurring_id):
+    user_id = session["user_id"]
+    with get_cursor() as cursor:
+
+        if request.method == "POST":
+            category_id = int(request.form.get("category_id"))
+            transaction_type = request.form.get("transaction_type")
+            amount = float(request.form.get("amount"))
+            frequency = request.form.get("frequency")
+            start_date = request.form.get("start_date")
+            end_date = request.form.get("end_date") or None
+            description = request.form.get("description")
+            account_id = request.form.get("account_id") or None
+            is_active = int(request.form.get("is_active"))
+
+            cursor.execute("""
+                UPDATE recurring_transactions
+                SET category_id = ?, transaction_type = ?, amount = ?, frequency = ?,
+                    start_date = ?, end_date = ?, description = ?, account_id = ?, is_active = ?
+                WHERE recurring_id = ? AND user_id = ?
+            """, category_id, transaction_type, amount, frequency, start_date,
+                 end_date, description, account_id, is_active, recurring_id, user_id)
+            versions.bump(cursor, user_id, versions.RECURRING)
+            invalidate_user_cache(user_id)
+            return redirect("/recurring")
+
+        # Fetch existing recurring txn
+        cursor.execute("""
+            SELECT * FROM recurring_transactions
+            WHERE recurring_id = ? AND user_id = ?
+        """, recurring_id, user_id)
+        r = cursor.fetchone()
+
+    categories, accounts = get_user_categories_and_accounts(user_id)
+    return render_template("edit_recurring.html", r=r, categories=categories, accounts=accounts)
@@ -0,0 +1,53 @@
+"""PDF reports: queueing them for the reports.py workers, polling and download.
+
+Queueing writes ``report_jobs``, so only web nodes mount this blueprint;
+``/export_transactions`` hands PDF requests over to ``POST /reports``.
+"""
+
+import os
+
+from flask import Blueprint, abort, jsonify, request, send_file, session
+
+import reports
+from helpers import login_required
+from views.shared import get_cursor, request_filters
+
+bp = Blueprint("reports", __name__)
+
+
+@bp.route("/reports", methods=["POST"])
+@login_required
+def create_report():
+    user_id = session["user_id"]
+    request_filters(user_id, request.form)  # 400 on malformed filters
+    # Rendered by the reports.py workers; the client polls the status URL
+    with get_cursor() as cursor:
+        job_id = reports.enqueue(cursor, user_id, request.form)
+    return jsonify(job_id=job_id, status_url=f"/reports/{job_id}"), 202
+
+
+@bp.route("/reports/<int:job_id>")
+@login_required
+def report_status(job_id):
+    with get_cursor() as cursor:
+        job = reports.get_job(cursor, session["user_id"], job_id)
+    if job is None:
+        abort(404)
+    ready = job.status == reports.DONE and bool(job.file_path) and os.path.exists(job.file_path)
+    return jsonify(
+        job_id=job.job_id,
+        status=job.status,
+        error=job.error,
+        download_url=f"/reports/{job_id}/download" if ready else None,
+    )
+
+
+@bp.route("/reports/<int:job_id>/download")
+@login_required
+def download_report(job_id):
+    with get_cursor() as cursor:
+        job = reports.get_job(cursor, session["user_id"], job_id)
+    if job is None or job.status != reports.DONE or not job.file_path or not os.path.exists(job.file_path):
+        abort(404)
+    return send_file(os.path.abspath(job.file_path), mimetype="application/pdf",
+                     as_attachment=True, download_name="transactions.pdf")
@@ -0,0 +1,114 @@
+"""Helpers shared by the view blueprints.
+
+Pooled cursors, the per-user caches (and their invalidation) and the
+category/account lookups behind the form dropdowns.  Several blueprints use
+each of these, and /metrics reports the caches, so they live here rather
+than in any one of them.
+"""
+
+import os
+from collections import namedtuple
+from contextlib import contextmanager
+
+from flask import abort, g, has_request_context
+
+import columnar
+import db
+from cache import TTLCache, make_cache
+from db.queries import transaction_filters
+
+
+## -------------DB connection--------------------
+
+def get_connection():
+    # Pooled connection; conn.close() returns it to the pool
+    return db.connect()
+
+@contextmanager
+def get_cursor():
+    with db.get_pool().connection() as conn:
+        cursor = conn.cursor()
+        yield cursor
+        conn.commit()
+
+
+## -------------Caches--------------------
+
+# Per-user dashboard snapshots, tagged with the versions of the tables they
+# read (views.dashboard); write routes also call invalidate_user_cache().
+# Set CACHE_URL=redis://... to share caches between worker processes.
+dashboard_cache = make_cache("dashboard", ttl=float(os.getenv("DASHBOARD_CACHE_TTL", "60")))
+
+# Form dropdown data. Global categories (user_id IS NULL) are the same for
+# everyone and only change with a deploy, so each process keeps one copy.
+LOOKUP_CACHE_TTL = float(os.getenv("LOOKUP_CACHE_TTL", "300"))
+global_categories_cache = TTLCache(ttl=float(os.getenv("GLOBAL_CATEGORIES_CACHE_TTL", "3600")), max_entries=1)
+lookup_cache = make_cache("lookups", ttl=LOOKUP_CACHE_TTL)
+
+# Per-user /analysis figures, tagged with the user's transactions version so a
+# write from any process (imports, the scheduler) makes the entry stale.
+analytics_cache = make_cache("analytics", ttl=float(os.getenv("ANALYTICS_CACHE_TTL", "600")))
+
+# Closed months of each user's transactions as memory-mapped column files
+# (COLUMNAR_DIR); analysis and CSV exports read them instead of SQL rows.
+month_store = columnar.MonthStore()
+
+Category = namedtuple("Category", "category_id category_name category_type")
+Account = namedtuple("Account", "account_id account_name")
+
+def invalidate_user_cache(user_id):
+    # Inside a request the write may not be committed yet, so drop the
+    # entry again once the request is done to avoid re-caching stale rows.
+    dashboard_cache.delete(user_id)
+    analytics_cache.delete(user_id)
+    if has_request_context():
+        g.setdefault("invalidated_users", set()).add(user_id)
+
+def invalidate_user_lookups(user_id):
+    # Called by the routes that add, rename or remove a user's accounts
+    lookup_cache.delete(("categories", user_id))
+    lookup_cache.delete(("accounts", user_id))
+    if has_request_context():
+        g.setdefault("invalidated_lookups", set()).add(user_id)
+
+def drop_invalidated_caches(exc):
+    # create_app() registers this as a teardown_request hook
+    for user_id in g.pop("invalidated_users", ()):
+        dashboard_cache.delete(user_id)
+    for user_id in g.pop("invalidated_lookups", ()):
+        lookup_cache.delete(("categories", user_id))
+        lookup_cache.delete(("accounts", user_id))
+
+
+## -----------Lookups------------------------
+def _query_categories(where, *params):
+    with get_cursor() as cursor:
+        cursor.execute(f"SELECT category_id, category_name, category_type FROM categories WHERE {where}", *params)
+        return [Category(*row) for row in cursor.fetchall()]
+
+def get_user_categories(user_id, category_type=None):
+    # Global categories plus the user's own, each served from its cache
+    categories = global_categories_cache.get_or_set(
+        "global", lambda: _query_categories("user_id IS NULL"))
+    categories = categories + lookup_cache.get_or_set(
+        ("categories", user_id), lambda: _query_categories("user_id = ?", user_id))
+    if category_type:
+        categories = [c for c in categories if c.category_type == category_type]
+    return categories
+
+def get_user_accounts(user_id):
+    def load():
+        with get_cursor() as cursor:
+            cursor.execute("SELECT account_id, account_name FROM user_accounts WHERE user_id = ?", user_id)
+            return [Account(*row) for row in cursor.fetchall()]
+    return lookup_cache.get_or_set(("accounts", user_id), load)
+
+def get_user_categories_and_accounts(user_id):
+    return get_user_categories(user_id), get_user_accounts(user_id)
+
+
+def request_filters(user_id, args):
+    try:
+        return transaction_filters(user_id, args)
+    except ValueError:
+        abort(400, "Invalid filter or page cursor.")
@@ -0,0 +1,301 @@
+"""Transactions: the paged list, NDJSON stream, add/edit/delete and bulk import."""
+
+import json
+import os
+import tempfile
+
+from flask import (Blueprint, Response, abort, current_app, redirect, render_template, request, session,
+                   stream_with_context)
+from werkzeug.utils import secure_filename
+
+import imports
+from db import aggregates, ledger, search, versions
+from db.dialect import limit, month_bounds, returning, top
+from db.queries import NEWEST_FIRST, TRANSACTION_COLUMNS, encode_page_cursor
+from exports import json_default
+from helpers import login_required
+from views.shared import get_cursor, get_user_categories_and_accounts, invalidate_user_cache, request_filters
+
+bp = Blueprint("transactions", __name__)
+
+## --------------file upload configuration---------------
+ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'pdf'}
+
+@bp.record_once
+def _make_upload_folder(state):
+    # Only apps that mount this blueprint accept receipt uploads
+    os.makedirs(state.app.config["UPLOAD_FOLDER"], exist_ok=True)
+
+def allowed_file(filename):
+    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+
+
+## -------------- Transactions-----------------
+TRANSACTIONS_PAGE_SIZE = int(os.getenv("TRANSACTIONS_PAGE_SIZE", "50"))
+TRANSACTIONS_MAX_PAGE_SIZE = 500
+STREAM_BATCH_SIZE = 1000
+
+def transactions_page_size(args):
+    page_size = min(args.get("page_size", TRANSACTIONS_PAGE_SIZE, type=int), TRANSACTIONS_MAX_PAGE_SIZE)
+    return max(page_size, 1)
+
+def transactions_page_query(where, page_size):
+    # Fetch one extra row to learn whether there is a next page
+    query = TRANSACTION_COLUMNS.format(top=top(page_size + 1)) + where
+    return query + f"{NEWEST_FIRST} {limit(page_size + 1)}"
+
+
+@bp.route("/transactions")
+@login_required
+def transactions():
+    user_id = session["user_id"]
+    page_size = transactions_page_size(request.args)
+
+    if request.args.get("keyword"):
+        # Keyword searches are ordered by relevance, with their own page cursor
+        with get_cursor() as cursor:
+            transactions, next_cursor = ranked_page(cursor, user_id, request.args, page_size)
+        return render_transactions(transactions, page_size, next_cursor)
+
+    where, params = request_filters(user_id, request.args)
+    with get_cursor() as cursor:
+        cursor.execute(transactions_page_query(where, page_size), *params)
+        transactions = cursor.fetchall()
+    return render_transactions(transactions, page_size)
+
+def ranked_page(cursor, user_id, args, page_size):
+    try:
+        return search.ranked(cursor, user_id, args, page_size)
+    except ValueError:
+        abort(400, "Invalid filter or page cursor.")
+
+def render_transactions(transactions, page_size, next_cursor=None):
+    if len(transactions) > page_size:
+        transactions = transactions[:page_size]
+        next_cursor = encode_page_cursor(transactions[-1])
+
+    alert = session.pop("alert", None)
+    return render_template("transactions.html", transactions=transactions, alert=alert,
+                           next_cursor=next_cursor, page_size=page_size)
+
+@bp.route("/transactions.ndjson")
+@login_required
+def transactions_ndjson():
+    # Streams every matching row as one JSON object per line; memory stays
+    # flat because rows are pulled from the cursor in fixed-size batches.
+    user_id = session["user_id"]
+    where, params = request_filters(user_id, request.args)
+    query = TRANSACTION_COLUMNS.format(top="") + where + NEWEST_FIRST
+
+    def generate():
+        with get_cursor() as cursor:
+            cursor.execute(query, *params)
+            columns = [column[0] for column in cursor.description]
+            while True:
+                rows = cursor.fetchmany(STREAM_BATCH_SIZE)
+                if not rows:
+                    break
+                yield "".join(json.dumps(dict(zip(columns, row)), default=json_default) + "\n" for row in rows)
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+@bp.route("/add_transaction", methods=["GET", "POST"])
+@login_required
+def add_transaction():
+    user_id = session["user_id"]
+    
+    if request.method == "POST":
+        with get_cursor() as cursor:
+            category_id = int(request.form.get("category_id"))
+            transaction_type = request.form.get("transaction_type")
+            amount = float(request.form.get("amount"))
+            transaction_date = request.form.get("transaction_date")
+            description = request.form.get("description", "").strip()
+            account_id = request.form.get("account_id")
+
+            if not account_id:
+                session["alert"] = "⚠️ Please select an account."
+                return redirect("/add_transaction")
+
+            account_id = int(account_id)
+
+            if not description:
+                cursor.execute("SELECT category_name FROM categories WHERE category_id = ?", category_id)
+                row = cursor.fetchone()
+                description = row.category_name if row else "General"
+
+
+            # Handle file upload
+            receipt_url = None
+            file = request.files.get("receipt_file")
+            if file and allowed_file(file.filename):
+                filename = secure_filename(file.filename)
+                filepath = os.path.join(current_app.config["UPLOAD_FOLDER"], filename)
+                file.save(filepath)
+                receipt_url = filepath
+
+            # Insert transaction
+            output, returning_clause = returning("transaction_id")
+            query = f"""
+                INSERT INTO transactions (user_id, category_id, amount, transaction_type, transaction_date, description, receipt_url, account_id)
+                {output}
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?) {returning_clause}
+            """
+            cursor.execute(query, user_id, category_id, amount, transaction_type, transaction_date, description, receipt_url, account_id)
+            transaction_id = cursor.fetchone().transaction_id
+            search.index_rows(cursor, [(transaction_id, user_id, description)])
+            aggregates.record_transaction(cursor, user_id, category_id, transaction_type, transaction_date, amount)
+            versions.bump(cursor, user_id, versions.TRANSACTIONS, versions.ACCOUNTS)
+
+            # Balance change goes to the append-only ledger (no account row lock)
+            ledger.post(cursor, user_id, account_id, ledger.signed(transaction_type, amount),
+                        transaction_id=transaction_id)
+
+
+            # Budget Alert Check (if expense)
+            if transaction_type == "expense":
+                month_start, _ = month_bounds(transaction_date)
+                cursor.execute("""
+                    SELECT b.budget_amount, m.total_amount AS total_spent
+                    FROM budgets b
+                    LEFT JOIN monthly_category_totals m
+                        ON m.user_id = b.user_id AND m.category_id = b.category_id
+                        AND m.month = b.budget_month AND m.transaction_type = 'expense'
+                    WHERE b.user_id = ? AND b.category_id = ? AND b.budget_month = ?
+                """, user_id, category_id, month_start)
+                budget = cursor.fetchone()
+
+                if budget and (budget.total_spent or 0) > budget.budget_amount:
+                    session["alert"] = f"Budget exceeded for this category!"
+        invalidate_user_cache(user_id)
+        return redirect("/transactions")
+
+    categories, accounts = get_user_categories_and_accounts(user_id)
+    return render_template("add_transaction.html", categories=categories, accounts=accounts)
+
+@bp.route("/edit_transaction/<int:transaction_id>", methods=["GET", "POST"])
+@login_required
+def edit_transaction(transaction_id):
+    user_id = session["user_id"]
+    if request.method == "POST":
+        category_id = int(request.form.get("category_id"))
+        new_type = request.form.get("transaction_type")
+        new_amount = float(request.form.get("amount"))
+        transaction_date = request.form.get("transaction_date")
+        description = request.form.get("description")
+        receipt_url = request.form.get("receipt_url")
+        new_account_id_raw = request.form.get("account_id")
+        new_account_id = int(new_account_id_raw) if new_account_id_raw else None
+
+
+        with get_cursor() as cursor:
+            cursor.execute("""
+                SELECT amount, transaction_type, account_id, category_id, transaction_date, description
+                FROM transactions 
+                WHERE transaction_id = ? AND user_id = ?
+            """, transaction_id, user_id)
+            old = cursor.fetchone()
+
+            # Reverse the old balance effect and post the new one
+            if old:
+                ledger.post_many(cursor, [
+                    (user_id, old.account_id, -ledger.signed(old.transaction_type, old.amount),
+                     ledger.TRANSACTION, transaction_id),
+                    (user_id, new_account_id, ledger.signed(new_type, new_amount),
+                     ledger.TRANSACTION, transaction_id),
+                ])
+
+            cursor.execute("""
+                UPDATE transactions
+                SET category_id = ?, transaction_type = ?, amount = ?, transaction_date = ?, 
+                    description = ?, receipt_url = ?, account_id = ?
+                WHERE transaction_id = ? AND user_id = ?
+            """, category_id, new_type, new_amount, transaction_date,
+                 description, receipt_url, new_account_id, transaction_id, user_id)
+
+            if old:
+                search.unindex_rows(cursor, [(transaction_id, user_id, old.description)])
+                search.index_rows(cursor, [(transaction_id, user_id, description)])
+                aggregates.record_many(cursor, [
+                    (user_id, old.category_id, old.transaction_type, old.transaction_date, old.amount, -1),
+                    (user_id, category_id, new_type, transaction_date, new_amount, 1),
+                ])
+                versions.bump(cursor, user_id, versions.TRANSACTIONS, versions.ACCOUNTS)
+        invalidate_user_cache(user_id)
+        return redirect("/transactions")
+
+    with get_cursor() as cursor:
+        cursor.execute("SELECT * FROM transactions WHERE transaction_id = ? AND user_id = ?", transaction_id, user_id)
+        transaction = cursor.fetchone()
+    categories, accounts = get_user_categories_and_accounts(user_id)
+    return render_template("edit_transaction.html", transaction=transaction, categories=categories, accounts=accounts)
+
+@bp.route("/delete_transaction/<int:transaction_id>")
+@login_required
+def delete_transaction(transaction_id):
+    user_id = session["user_id"]
+    with get_cursor() as cursor:
+        # Step 1: Fetch transaction info
+        cursor.execute("""
+            SELECT amount, transaction_type, account_id, category_id, transaction_date, description
+            FROM transactions 
+            WHERE transaction_id = ? AND user_id = ?
+        """, transaction_id, user_id)
+        txn = cursor.fetchone()
+
+        # Step 2: Reverse its balance effect in the ledger
+        if txn:
+            ledger.post(cursor, user_id, txn.account_id, -ledger.signed(txn.transaction_type, txn.amount),
+                        transaction_id=transaction_id)
+
+        # Step 3: Delete the transaction
+        cursor.execute("""
+            DELETE FROM transactions 
+            WHERE transaction_id = ? AND user_id = ?
+        """, transaction_id, user_id)
+
+        # Step 4: Keep the monthly totals in step
+        if txn:
+            search.unindex_rows(cursor, [(transaction_id, user_id, txn.description)])
+            aggregates.record_transaction(cursor, user_id, txn.category_id, txn.transaction_type,
+                                          txn.transaction_date, txn.amount, sign=-1)
+            versions.bump(cursor, user_id, versions.TRANSACTIONS, versions.ACCOUNTS)
+
+    invalidate_user_cache(user_id)
+    return redirect("/transactions")
+
+
+@bp.route("/import_transactions", methods=["POST"])
+@login_required
+def import_transactions():
+    user_id = session["user_id"]
+    upload = request.files.get("file")
+    if not upload or not upload.filename:
+        abort(400, "No file uploaded.")
+    default_account_id = request.form.get("account_id", type=int)
+    categories, accounts = get_user_categories_and_accounts(user_id)
+    try:
+        mapper = imports.RowMapper(categories, accounts, default_account_id)
+    except imports.RecordError as exc:
+        abort(400, str(exc))
+
+    # Werkzeug closes request files before a streamed body runs, so keep our own copy
+    spool = tempfile.TemporaryFile()
+    upload.save(spool)
+    spool.seek(0)
+    filename = upload.filename
+
+    # One NDJSON progress line per inserted batch; the "done" line is held back
+    # until the import has committed, so a client never sees it for a rollback
+    def generate():
+        with spool, get_cursor() as cursor:
+            records = imports.read_records(spool, filename)
+            for progress in imports.import_transactions(cursor, user_id, records, mapper):
+                if progress.get("done"):
+                    done = progress
+                else:
+                    yield json.dumps(progress) + "\n"
+        invalidate_user_cache(user_id)
+        yield json.dumps(done) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
@@ -0,0 +1,23 @@
+"""Production WSGI entry point.
+
+  gunicorn -c gunicorn.conf.py wsgi:app
+
+gunicorn.conf.py preloads this module in the master process, so the app,
+its imports and the compiled templates below are shared copy-on-write by
+every worker it forks.  DB connections are not opened here: each worker
+creates its own pool after the fork (see ``post_worker_init``).
+"""
+
+from my_app import app
+
+
+def compile_templates(flask_app):
+    """Compile every template into the Jinja cache; returns how many."""
+    env = flask_app.jinja_env
+    names = env.list_templates(extensions=("html",))
+    for name in names:
+        env.get_template(name)
+    return len(names)
+
+
+compile_templates(app)